@@ -7,7 +7,10 @@ from database.db import get_db
 from database.models import User
 from .schemas import UserCreate, UserLogin, TokenOut
 from .auth import hash_password, verify_password, create_token
+from fastapi.concurrency import run_in_threadpool
 from app.rag import generate_news_response
+from app import summary_jobs
+import config
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -38,7 +41,20 @@ async def summarize_articles(payload: dict = Body(...)):
     user_id = payload.get("user_id", 0)
     query = articles[0].get("title", "") if articles else ""
 
-    response = generate_news_response(articles, user_preferences="", query=query, user_id=user_id)
+    # shares the summary job pool (and its dedup/TTL) instead of blocking the event loop inline
+    job_id = summary_jobs.submit(
+        summary_jobs.job_key("auth_summarize", user_id, query, "", articles),
+        generate_news_response, articles, user_preferences="", query=query, user_id=user_id,
+    )
+    if job_id is None:
+        response = await run_in_threadpool(
+            generate_news_response, articles, user_preferences="", query=query, user_id=user_id
+        )
+    else:
+        job = await summary_jobs.wait_async(job_id, config.SUMMARY_MAX_WAIT)
+        if job is None or job["status"] != summary_jobs.DONE:
+            return {"summaries": {}, "job_id": job_id}
+        response = job["result"]
 
     # Map summaries to links
     summaries = {}
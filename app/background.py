@@ -0,0 +1,55 @@
+# app/background.py
+"""
+Daemon-thread scaffold shared by the ingest, retention, precompute and warm-up workers:
+idempotent start, cooperative stop, and a schedule loop that survives failed passes.
+"""
+from __future__ import annotations
+import threading
+from typing import Callable
+
+class BackgroundWorker:
+    def __init__(self, name: str, fn: Callable[[], object], interval: float | None = None,
+                 run_first: bool = True):
+        """
+        interval=None runs fn once; otherwise fn runs every interval seconds (starting
+        immediately, or after one interval with run_first=False) until stop().
+        """
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.run_first = run_first
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def stopped(self) -> bool:
+        """True once stop() was called; long passes check it between steps."""
+        return self._stop.is_set()
+
+    def _run(self, interval: float | None) -> None:
+        if interval is None:
+            self.fn()
+            return
+        if not self.run_first and self._stop.wait(interval):
+            return
+        while not self._stop.is_set():
+            try:
+                self.fn()
+            except Exception:
+                pass  # keep the schedule; a failed pass is retried next interval
+            self._stop.wait(interval)
+
+    def start(self, interval: float | None = None) -> threading.Thread:
+        """Start the thread (idempotent); interval overrides the configured one."""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval or self.interval,), name=self.name, daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
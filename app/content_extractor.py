@@ -1,5 +1,12 @@
 import requests
-import trafilatura
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+import config
+from app.fulltext_cache import FulltextCache
+from app.utils import normalize_url
 
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -9,17 +16,149 @@ DEFAULT_HEADERS = {
     )
 }
 
+_CACHE = FulltextCache(
+    config.FULLTEXT_CACHE_PATH if config.FULLTEXT_CACHE_ENABLED else None,
+    mem_items=config.FULLTEXT_CACHE_MEM_ITEMS,
+    max_bytes=config.FULLTEXT_CACHE_MAX_BYTES,
+)
+_STATS = {"served_cached": 0, "negative_hits": 0, "revalidated": 0, "downloads": 0}
+
+def fulltext_cache_stats() -> dict:
+    return {**_CACHE.stats(), **_STATS}
+
+def _extract(html: str) -> str:
+    import trafilatura  # loaded on first use; app.warmup preloads it
+    text = trafilatura.extract(
+        html,
+        include_comments=False,
+        include_tables=False,
+        favor_recall=True,
+    )
+    return (text or "").strip()
+
 def fetch_fulltext(url: str, timeout: int = 15) -> str:
-    """Return cleaned article text or '' if extraction fails."""
+    """
+    Return cleaned article text or '' if extraction fails.
+    Cached by normalized URL: fresh entries (and recent failures) are served without
+    any request; older ones are revalidated with ETag/Last-Modified, and a 304 reuses
+    the stored text without re-parsing.
+    """
+    if not config.FULLTEXT_CACHE_ENABLED:
+        try:
+            r = requests.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
+            r.raise_for_status()
+            return _extract(r.text)
+        except Exception:
+            return ""
+
+    key = normalize_url(url)
+    e = _CACHE.get(key)
+    now = time.time()
+    if e is not None:
+        if not e["ok"] and now - e["fetched_at"] < config.FULLTEXT_NEGATIVE_TTL:
+            _STATS["negative_hits"] += 1
+            return ""
+        if e["ok"] and now - e["fetched_at"] < config.FULLTEXT_FRESH_SECONDS:
+            _STATS["served_cached"] += 1
+            return e["text"]
+
+    headers = dict(DEFAULT_HEADERS)
+    if e is not None and e["ok"]:
+        if e.get("etag"):
+            headers["If-None-Match"] = e["etag"]
+        if e.get("last_modified"):
+            headers["If-Modified-Since"] = e["last_modified"]
     try:
-        r = requests.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
+        _STATS["downloads"] += 1
+        r = requests.get(url, headers=headers, timeout=timeout)
+        if r.status_code == 304 and e is not None and e["ok"]:
+            _CACHE.touch(key)
+            _STATS["revalidated"] += 1
+            return e["text"]
         r.raise_for_status()
-        text = trafilatura.extract(
-            r.text,
-            include_comments=False,
-            include_tables=False,
-            favor_recall=True,
-        )
-        return (text or "").strip()
+        text = _extract(r.text)
+        etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+    except Exception:
+        if e is not None and e["ok"]:
+            return e["text"]  # transient failure: keep serving what we had
+        text, etag, last_modified = "", None, None
+    _CACHE.put(key, text, etag, last_modified)
+    return text
+
+def peek_fulltext(url: str) -> str | None:
+    """Cached text for url (fresh or not) without any network request; None if not cached."""
+    if not config.FULLTEXT_CACHE_ENABLED:
+        return None
+    e = _CACHE.get(normalize_url(url))
+    return e["text"] if e is not None and e["ok"] else None
+
+
+# ---------- Parallel fetching with per-domain politeness ----------
+# One pool for the whole process = global concurrency cap; slots per domain are global too,
+# so two concurrent summaries can't double up on the same site.
+_POOL = ThreadPoolExecutor(max_workers=max(1, config.FULLTEXT_MAX_WORKERS), thread_name_prefix="fulltext")
+_DOMAIN_INFLIGHT: Counter = Counter()
+_DOMAIN_LOCK = threading.Lock()
+
+def _domain(url: str) -> str:
+    try:
+        return urlparse(url).netloc.lower()
     except Exception:
         return ""
+
+def _release_domain(domain: str) -> None:
+    with _DOMAIN_LOCK:
+        _DOMAIN_INFLIGHT[domain] -= 1
+        if _DOMAIN_INFLIGHT[domain] <= 0:
+            del _DOMAIN_INFLIGHT[domain]
+
+def fetch_fulltext_many(
+    urls: list[str],
+    *,
+    budget: float | None = None,
+    per_domain: int | None = None,
+    timeout: int = 15,
+) -> dict[str, str]:
+    """
+    Fetch many articles concurrently. Returns {url: text} for the ones that finished
+    within `budget` seconds; callers fall back to the snippet for the rest.
+    Fetches still running at the deadline are left to finish in the background
+    (they warm the cache for next time) instead of blocking the caller.
+    """
+    budget = config.FULLTEXT_BUDGET if budget is None else budget
+    per_domain = config.FULLTEXT_PER_DOMAIN if per_domain is None else per_domain
+    deadline = time.monotonic() + budget
+
+    pending = deque(dict.fromkeys(u for u in urls if u))
+    running: dict = {}
+    out: dict[str, str] = {}
+    while pending or running:
+        # submit everything whose domain has a free slot
+        for _ in range(len(pending)):
+            if len(running) >= config.FULLTEXT_MAX_WORKERS:
+                break
+            url = pending.popleft()
+            dom = _domain(url)
+            with _DOMAIN_LOCK:
+                if _DOMAIN_INFLIGHT[dom] >= per_domain:
+                    pending.append(url)
+                    continue
+                _DOMAIN_INFLIGHT[dom] += 1
+            fut = _POOL.submit(fetch_fulltext, url, timeout)
+            fut.add_done_callback(lambda _f, d=dom: _release_domain(d))
+            running[fut] = url
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if not running:
+            time.sleep(min(0.05, remaining))  # all pending URLs blocked by other requests' domain slots
+            continue
+        done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+        for fut in done:
+            url = running.pop(fut)
+            try:
+                out[url] = fut.result()
+            except Exception:
+                out[url] = ""
+    return out
@@ -1,6 +1,9 @@
 from __future__ import annotations
+import hashlib
 import re
-from typing import Dict, Tuple
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 import config
 
 # lazy global
@@ -18,57 +21,184 @@ BLOCKLIST_VIOLENCE = [
     r"\b(gore|beheading|dismemberment|graphic\s+violence)\b",
 ]
 
+_DETOX_LOCK = threading.Lock()
+
 def _ensure_detox():
     global _DETOX, _DETOX_ERR
     if _DETOX is not None or _DETOX_ERR is not None:
         return
-    try:
-        from detoxify import Detoxify
-        _DETOX = Detoxify('original')
-    except Exception as e:
-        _DETOX_ERR = e
+    with _DETOX_LOCK:  # warm-up thread and first query may race; load once
+        if _DETOX is not None or _DETOX_ERR is not None:
+            return
+        try:
+            from detoxify import Detoxify
+            _DETOX = Detoxify('original')
+        except Exception as e:
+            _DETOX_ERR = e
+
+def load_model() -> bool:
+    """Load Detoxify now instead of on the first query (app.warmup); raises if it cannot load."""
+    _ensure_detox()
+    if _DETOX_ERR is not None:
+        raise _DETOX_ERR
+    _DETOX.predict("warm up")  # first forward pass allocates the inference buffers
+    return True
+
+# One pass over the text: each category is a named group of the combined pattern.
+_BLOCK_RE = re.compile(
+    "|".join(
+        f"(?P<{name}>{'|'.join(f'(?:{p})' for p in pats)})"
+        for name, pats in (("adult", BLOCKLIST_ADULT), ("hate", BLOCKLIST_HATE), ("violence", BLOCKLIST_VIOLENCE))
+    ),
+    re.I,
+)
+_PROFANITY_RE = re.compile(r"\b(?:fuck|shit|asshole|bitch)\b", re.I)
 
 def _regex_block(text: str) -> Dict[str, bool]:
+    enabled = {"adult": config.BLOCK_ADULT, "hate": config.BLOCK_HATE, "violence": config.BLOCK_VIOLENCE}
     flags = {"adult": False, "hate": False, "violence": False}
-    t = text.lower()
-    if config.BLOCK_ADULT:
-        flags["adult"] = any(re.search(p, t) for p in BLOCKLIST_ADULT)
-    if config.BLOCK_HATE:
-        flags["hate"] = any(re.search(p, t) for p in BLOCKLIST_HATE)
-    if config.BLOCK_VIOLENCE:
-        flags["violence"] = any(re.search(p, t) for p in BLOCKLIST_VIOLENCE)
+    wanted = sum(enabled.values())
+    if not wanted:
+        return flags
+    for m in _BLOCK_RE.finditer(text):
+        cat = m.lastgroup
+        if enabled[cat] and not flags[cat]:
+            flags[cat] = True
+            wanted -= 1
+            if not wanted:
+                break
     return flags
 
-def moderate_text(text: str) -> Tuple[bool, Dict[str, float], Dict[str, bool]]:
-    """(is_safe, model_scores, regex_flags)"""
-    if not text.strip():
-        return True, {}, {"adult": False, "hate": False, "violence": False}
+def _model_safe(scores: Dict[str, float]) -> bool:
+    tox = float(scores.get("toxicity", 0.0))
+    severe = float(scores.get("severe_toxicity", 0.0))
+    sexual = float(scores.get("sexual_explicit", 0.0))
+    threat = float(scores.get("threat", 0.0))
+    if tox >= config.TOXICITY_THRESHOLD or severe >= config.TOXICITY_THRESHOLD:
+        return False
+    if config.BLOCK_ADULT and sexual >= 0.5:
+        return False
+    if config.BLOCK_VIOLENCE and threat >= 0.5:
+        return False
+    return True
 
-    flags = _regex_block(text)
-    if any(flags.values()):
-        return False, {}, flags
+# ---------- Detoxify scores, cached by text hash ----------
+# Scores (not verdicts) are cached, so threshold/flag changes apply without re-scoring.
+_SCORES: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+_SCORES_LOCK = threading.Lock()
+_STATS = {"texts": 0, "regex_blocked": 0, "model_blocked": 0, "cache_hits": 0, "scored": 0, "batches": 0}
 
-    if config.SAFETY_ENABLED:
+def _text_key(text: str) -> str:
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+def _detox_scores(texts: List[str]) -> List[Optional[Dict[str, float]]]:
+    """
+    Detoxify scores per text (None if the model is unavailable). Cached texts are not
+    re-scored; the rest go through the model in batches of SAFETY_BATCH_SIZE.
+    """
+    keys = [_text_key(t) for t in texts]
+    found: Dict[str, Dict[str, float]] = {}
+    todo: Dict[str, str] = {}  # key -> text, each distinct text scored once
+    with _SCORES_LOCK:
+        for k, t in zip(keys, texts):
+            sc = _SCORES.get(k)
+            if sc is not None:
+                _SCORES.move_to_end(k)
+                found[k] = sc
+                _STATS["cache_hits"] += 1
+            elif k not in todo:
+                todo[k] = t
+    if todo:
         _ensure_detox()
         if _DETOX is not None:
-            scores = _DETOX.predict(text)
-            tox = float(scores.get("toxicity", 0.0))
-            severe = float(scores.get("severe_toxicity", 0.0))
-            sexual = float(scores.get("sexual_explicit", 0.0))
-            threat = float(scores.get("threat", 0.0))
-            if tox >= config.TOXICITY_THRESHOLD or severe >= config.TOXICITY_THRESHOLD:
-                return False, scores, flags
-            if config.BLOCK_ADULT and sexual >= 0.5:
-                return False, scores, flags
-            if config.BLOCK_VIOLENCE and threat >= 0.5:
-                return False, scores, flags
-            return True, scores, flags
-
-    return True, {}, flags
+            pending = sorted(todo.items(), key=lambda kv: len(kv[1]))  # similar lengths -> less padding
+            size = max(1, config.SAFETY_BATCH_SIZE)
+            for i in range(0, len(pending), size):
+                part = pending[i:i + size]
+                res = _DETOX.predict([t[:config.SAFETY_MAX_CHARS] for _, t in part])  # {label: [score per text]}
+                _STATS["batches"] += 1
+                _STATS["scored"] += len(part)
+                for j, (k, _) in enumerate(part):
+                    found[k] = {label: float(vals[j]) for label, vals in res.items()}
+            with _SCORES_LOCK:
+                for k, _ in pending:
+                    _SCORES[k] = found[k]
+                while len(_SCORES) > config.SAFETY_SCORE_CACHE_SIZE:
+                    _SCORES.popitem(last=False)
+    return [found.get(k) for k in keys]
 
-def redact_profanity(text: str) -> str:
-    profane = [r"\bfuck\b", r"\bshit\b", r"\basshole\b", r"\bbitch\b"]
-    out = text
-    for p in profane:
-        out = re.sub(p, lambda m: m.group(0)[0] + "★"*(len(m.group(0))-1), out, flags=re.I)
+def moderate_many(texts: List[str]) -> List[Tuple[bool, Dict[str, float], Dict[str, bool]]]:
+    """moderate_text for many texts: regex per text, then one batched model pass for the rest."""
+    out: List[Any] = [None] * len(texts)
+    to_score: List[int] = []
+    for i, text in enumerate(texts):
+        flags = _regex_block(text or "")
+        if not (text or "").strip():
+            out[i] = (True, {}, flags)
+        elif any(flags.values()):
+            out[i] = (False, {}, flags)
+            _STATS["regex_blocked"] += 1
+        else:
+            out[i] = (True, {}, flags)
+            to_score.append(i)
+    _STATS["texts"] += len(texts)
+
+    if config.SAFETY_ENABLED and to_score:
+        scores = _detox_scores([texts[i] for i in to_score])
+        for i, sc in zip(to_score, scores):
+            if sc is None:
+                continue  # model unavailable: regex verdict stands
+            safe = _model_safe(sc)
+            if not safe:
+                _STATS["model_blocked"] += 1
+            out[i] = (safe, sc, out[i][2])
     return out
+
+# ---------- Query verdicts (LRU) ----------
+_VERDICTS: "OrderedDict[tuple, Tuple[bool, Dict[str, float], Dict[str, bool]]]" = OrderedDict()
+_VERDICT_STATS = {"hits": 0, "misses": 0}
+
+def _verdict_key(text: str) -> tuple:
+    # the rules read config at call time, so they are part of the key
+    return (" ".join(text.lower().split()), config.SAFETY_ENABLED, config.TOXICITY_THRESHOLD,
+            config.BLOCK_ADULT, config.BLOCK_HATE, config.BLOCK_VIOLENCE)
+
+def moderate_text(text: str) -> Tuple[bool, Dict[str, float], Dict[str, bool]]:
+    """(is_safe, model_scores, regex_flags); repeated queries are served from the verdict LRU."""
+    k = _verdict_key(text)
+    with _SCORES_LOCK:
+        v = _VERDICTS.get(k)
+        if v is not None:
+            _VERDICTS.move_to_end(k)
+            _VERDICT_STATS["hits"] += 1
+            return v
+        _VERDICT_STATS["misses"] += 1
+    v = moderate_many([text])[0]
+    with _SCORES_LOCK:
+        _VERDICTS[k] = v
+        while len(_VERDICTS) > config.SAFETY_VERDICT_CACHE_SIZE:
+            _VERDICTS.popitem(last=False)
+    return v
+
+def filter_safe_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop articles whose title + snippet fail moderation (one batched pass over all of them)."""
+    if not articles:
+        return articles
+    verdicts = moderate_many([f"{a.get('title') or ''}\n{a.get('snippet') or ''}" for a in articles])
+    return [a for a, (safe, _, _) in zip(articles, verdicts) if safe]
+
+def moderation_stats() -> Dict[str, Any]:
+    with _SCORES_LOCK:
+        cached = len(_SCORES)
+        verdicts = {**_VERDICT_STATS, "cached": len(_VERDICTS)}
+    lookups = _STATS["cache_hits"] + _STATS["scored"]
+    return {
+        **_STATS,
+        "cached_scores": cached,
+        "hit_rate": round(_STATS["cache_hits"] / lookups, 4) if lookups else 0.0,
+        "model_loaded": _DETOX is not None,
+        "verdicts": verdicts,
+    }
+
+def redact_profanity(text: str) -> str:
+    return _PROFANITY_RE.sub(lambda m: m.group(0)[0] + "★"*(len(m.group(0))-1), text)
@@ -0,0 +1,147 @@
+# app/embed_cache.py
+"""
+Content-addressed embedding cache shared by ranker._embed_ollama and embeddings.embed_text.
+
+Key = sha256(model + normalized text). An in-memory LRU sits in front of a small
+SQLite file. Both tiers hold float32 blobs and are bounded in bytes (EMBED_CACHE_MEM_BYTES,
+EMBED_CACHE_MAX_BYTES), evicting least-recently-used entries first.
+"""
+from __future__ import annotations
+import hashlib
+import re
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Any
+
+import config
+from .sqlite_lru import SQLiteLRU
+
+_WS_RE = re.compile(r"\s+")
+
+def _key(model: str, text: str) -> str:
+    norm = _WS_RE.sub(" ", text or "").strip()
+    return hashlib.sha256(f"{model}\0{norm}".encode("utf-8")).hexdigest()
+
+def _pack(vec: List[float]) -> bytes:
+    return array("f", vec).tobytes()
+
+def _unpack(blob: bytes) -> List[float]:
+    a = array("f")
+    a.frombytes(blob)
+    return a.tolist()
+
+class EmbeddingCache(SQLiteLRU):
+    TABLE = "emb"
+    COLUMNS = "v BLOB NOT NULL, used REAL NOT NULL"
+    BLOB = "v"
+
+    def __init__(self, path: str | None, mem_bytes: int, max_bytes: int):
+        super().__init__(path, mem_limit=mem_bytes, max_bytes=max_bytes)
+
+    def _mem_cost(self, blob: bytes) -> int:
+        return len(blob)   # memory tier holds float32 blobs, not list[float]; bounded in bytes
+
+    # ---- public ----
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        keys = [_key(model, t) for t in texts]
+        out: List[Optional[List[float]]] = [None] * len(keys)
+        disk_lookup: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, k in enumerate(keys):
+                blob = self._mem_get(k)
+                if blob is not None:
+                    self._stats["mem_hits"] += 1
+                    out[i] = _unpack(blob)
+                else:
+                    disk_lookup.setdefault(k, []).append(i)
+            if disk_lookup and self._db is not None:
+                found = {}
+                ks = list(disk_lookup)
+                for j in range(0, len(ks), 500):
+                    part = ks[j:j + 500]
+                    rows = self._db.execute(
+                        f"SELECT k, v FROM emb WHERE k IN ({','.join('?' * len(part))})", part
+                    ).fetchall()
+                    found.update(rows)
+                if found:
+                    self._disk_touch(found)
+                for k, blob in found.items():
+                    vec = _unpack(blob)
+                    self._mem_put(k, blob)
+                    for i in disk_lookup.pop(k):
+                        out[i] = vec
+                        self._stats["disk_hits"] += 1
+            self._stats["misses"] += sum(len(v) for v in disk_lookup.values())
+        return out
+
+    def put_many(self, model: str, texts: List[str], vecs: List[List[float]]) -> None:
+        rows = []
+        now = time.time()
+        with self._lock:
+            for t, vec in zip(texts, vecs):
+                if not vec:
+                    continue  # never cache failed/empty embeddings
+                k = _key(model, t)
+                blob = _pack(vec)
+                self._mem_put(k, blob)
+                rows.append((k, blob, (now,)))
+            if rows and self._db is not None:
+                self._disk_write(rows, "used")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**super().stats(), "mem_bytes": self._mem_used}
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            for k in self._stats:
+                self._stats[k] = 0
+
+_CACHE = EmbeddingCache(
+    config.EMBED_CACHE_PATH if config.EMBED_CACHE_ENABLED else None,
+    mem_bytes=config.EMBED_CACHE_MEM_BYTES,
+    max_bytes=config.EMBED_CACHE_MAX_BYTES,
+)
+
+def cached_embed(model: str, texts: List[str], embed_fn: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+    """Return embeddings for texts, calling embed_fn only for the cache misses (in one call)."""
+    if not config.EMBED_CACHE_ENABLED:
+        return embed_fn(texts)
+    out = _CACHE.get_many(model, texts)
+    misses: Dict[str, List[int]] = {}  # duplicate texts in one call are embedded once
+    for i, v in enumerate(out):
+        if v is None:
+            misses.setdefault(texts[i], []).append(i)
+    if misses:
+        miss_texts = list(misses)
+        fresh = embed_fn(miss_texts)
+        _CACHE.put_many(model, miss_texts, fresh)
+        for t, v in zip(miss_texts, fresh):
+            for i in misses[t]:
+                out[i] = v
+    return out
+
+def get(model: str, text: str) -> Optional[List[float]]:
+    if not config.EMBED_CACHE_ENABLED:
+        return None
+    return _CACHE.get_many(model, [text])[0]
+
+def get_many(model: str, texts: List[str]) -> List[Optional[List[float]]]:
+    if not config.EMBED_CACHE_ENABLED:
+        return [None] * len(texts)
+    return _CACHE.get_many(model, texts)
+
+def put_many(model: str, texts: List[str], vecs: List[List[float]]) -> None:
+    if config.EMBED_CACHE_ENABLED:
+        _CACHE.put_many(model, texts, vecs)
+
+def put(model: str, text: str, vec: List[float]) -> None:
+    if config.EMBED_CACHE_ENABLED:
+        _CACHE.put_many(model, [text], [vec])
+
+def stats() -> Dict[str, Any]:
+    return _CACHE.stats()
+
+def clear() -> None:
+    _CACHE.clear()
@@ -1,24 +1,100 @@
 # app/embeddings.py
-from typing import List
-import os
+from typing import List, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import config
+from app import embed_cache
+
+# ---- Ollama batch embeddings (shared with ranker) ----
+# None = unknown yet, False = server has no batch /api/embed (older Ollama) -> per-text calls
+_BATCH_SUPPORTED: Optional[bool] = None
+_EMBED_POOL = ThreadPoolExecutor(max_workers=max(1, config.EMBED_CONCURRENCY), thread_name_prefix="embed")
+
+def _embed_one(base: str, text: str) -> List[float]:
+    payload = {"model": config.EMBED_MODEL, "prompt": text}
+    r = requests.post(f"{base}/api/embeddings", json=payload, timeout=60)
+    r.raise_for_status()
+    emb = r.json().get("embedding")
+    if not isinstance(emb, list):
+        emb = r.json().get("data", [{}])[0].get("embedding", [])
+    return emb or []
+
+def _embed_batch(base: str, batch: List[str]) -> List[List[float]]:
+    """One POST /api/embed with an input list; falls back to per-text calls if unsupported."""
+    global _BATCH_SUPPORTED
+    if _BATCH_SUPPORTED is not False:
+        r = requests.post(f"{base}/api/embed", json={"model": config.EMBED_MODEL, "input": batch}, timeout=120)
+        if r.status_code in (404, 405):
+            _BATCH_SUPPORTED = False
+        else:
+            r.raise_for_status()
+            embs = r.json().get("embeddings")
+            if isinstance(embs, list) and len(embs) == len(batch):
+                _BATCH_SUPPORTED = True
+                return [e or [] for e in embs]
+            _BATCH_SUPPORTED = False
+    return [_embed_one(base, t) for t in batch]
+
+def embed_ollama_many(texts: List[str]) -> List[List[float]]:
+    """
+    Uses Ollama's batch endpoint: POST /api/embed {"input": [...]}, EMBED_BATCH_SIZE texts per call,
+    up to EMBED_CONCURRENCY batches in flight. Falls back to POST /api/embeddings per text
+    when the server predates /api/embed. No caching here; callers go through embed_cache.
+    """
+    if not texts:
+        return []
+    base = config.OLLAMA_BASE_URL.rstrip('/')
+    size = max(1, config.EMBED_BATCH_SIZE)
+    batches = [texts[i:i + size] for i in range(0, len(texts), size)]
+    if len(batches) == 1 or config.EMBED_CONCURRENCY <= 1:
+        results = [_embed_batch(base, b) for b in batches]
+    else:
+        results = list(_EMBED_POOL.map(lambda b: _embed_batch(base, b), batches))
+    return [e for batch in results for e in batch]
 
 # ---- Local fallback: FastEmbed (no protobuf) ----
-_FASTEMBED_MODEL = None
+_FASTEMBED_MODEL = None    # set once the local fallback has actually served a request
+_FASTEMBED_LOADED = None   # the loaded model (app.warmup may load it before any fallback)
+_FASTEMBED_LOCK = threading.Lock()
+
+def load_local_model():
+    """Load the fastembed fallback model once (import + weights); later calls return it."""
+    global _FASTEMBED_LOADED
+    if _FASTEMBED_LOADED is None:
+        with _FASTEMBED_LOCK:
+            if _FASTEMBED_LOADED is None:
+                # Defaults to a small, high-quality model
+                from fastembed import TextEmbedding
+                _FASTEMBED_LOADED = TextEmbedding(model_name=config.LOCAL_EMBED_MODEL)
+    return _FASTEMBED_LOADED
 
 def _local_embed(text: str) -> List[float]:
+    return _local_embed_many([text])[0]
+
+def _local_embed_many(texts: List[str]) -> List[List[float]]:
     global _FASTEMBED_MODEL
     if _FASTEMBED_MODEL is None:
-        # Defaults to a small, high-quality model
-        model_name = os.getenv("LOCAL_EMBED_MODEL", "BAAI/bge-small-en-v1.5")
-        from fastembed import TextEmbedding
-        _FASTEMBED_MODEL = TextEmbedding(model_name=model_name)
-    # fastembed returns a generator over np arrays
-    vec = next(_FASTEMBED_MODEL.embed([text]))
-    return [float(x) for x in vec.tolist()]
+        _FASTEMBED_MODEL = load_local_model()
+    # fastembed returns a generator over np arrays; it batches internally
+    return [[float(x) for x in vec.tolist()]
+            for vec in _FASTEMBED_MODEL.embed(texts, batch_size=max(1, config.EMBED_BATCH_SIZE))]
 
 def embed_text(text: str) -> List[float]:
+    """Embed one text, served from the shared embedding cache when possible."""
+    models = [config.EMBED_MODEL]
+    if _FASTEMBED_MODEL is not None:  # local fallback already in use this process
+        models.append(config.LOCAL_EMBED_MODEL)
+    for model in models:
+        vec = embed_cache.get(model, text)
+        if vec is not None:
+            return vec
+    model, vec = _embed_uncached(text)
+    embed_cache.put(model, text, vec)
+    return vec
+
+def _embed_uncached(text: str) -> Tuple[str, List[float]]:
+    """Returns (model_name, vector) from the first backend that answers."""
     base = config.OLLAMA_BASE_URL.rstrip("/")
 
     # 1) Try native Ollama embeddings
@@ -31,7 +107,7 @@ def embed_text(text: str) -> List[float]:
         if r.status_code == 404:
             raise FileNotFoundError("Ollama native /api/embeddings not available")
         r.raise_for_status()
-        return r.json()["embedding"]
+        return config.EMBED_MODEL, r.json()["embedding"]
     except Exception:
         # 2) Try OpenAI-compatible embeddings
         try:
@@ -42,10 +118,69 @@ def embed_text(text: str) -> List[float]:
             )
             if r2.status_code == 404:
                 # 3) Local fastembed fallback
-                return _local_embed(text)
+                return config.LOCAL_EMBED_MODEL, _local_embed(text)
             r2.raise_for_status()
             data = r2.json()
-            return data["data"][0]["embedding"]
+            return config.EMBED_MODEL, data["data"][0]["embedding"]
         except Exception:
             # Last resort: local fastembed
-            return _local_embed(text)
+            return config.LOCAL_EMBED_MODEL, _local_embed(text)
+
+# ---- batch API (vector store ingestion) ----
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Batch version of embed_text: one cache lookup for all texts, then the misses go
+    through the same backend chain in large batches (Ollama /api/embed ->
+    OpenAI-compatible /v1/embeddings -> fastembed), each backend tried once per call.
+    """
+    if not texts:
+        return []
+    models = [config.EMBED_MODEL]
+    if _FASTEMBED_MODEL is not None:
+        models.append(config.LOCAL_EMBED_MODEL)
+    out: List[Optional[List[float]]] = [None] * len(texts)
+    for model in models:
+        todo = [i for i, v in enumerate(out) if v is None]
+        if not todo:
+            break
+        for i, vec in zip(todo, embed_cache.get_many(model, [texts[i] for i in todo])):
+            out[i] = vec
+
+    misses: dict = {}
+    for i, v in enumerate(out):
+        if v is None:
+            misses.setdefault(texts[i], []).append(i)
+    if misses:
+        miss_texts = list(misses)
+        model, vecs = _embed_many_uncached(miss_texts)
+        embed_cache.put_many(model, miss_texts, vecs)
+        for t, v in zip(miss_texts, vecs):
+            for i in misses[t]:
+                out[i] = v
+    return out
+
+def _embed_many_uncached(texts: List[str]) -> Tuple[str, List[List[float]]]:
+    base = config.OLLAMA_BASE_URL.rstrip("/")
+    # 1) Native Ollama (batched)
+    try:
+        vecs = embed_ollama_many(texts)
+        if all(vecs):
+            return config.EMBED_MODEL, vecs
+    except Exception:
+        pass
+    # 2) OpenAI-compatible embeddings (input list)
+    try:
+        r2 = requests.post(
+            f"{base}/v1/embeddings",
+            json={"model": config.EMBED_MODEL, "input": texts},
+            timeout=120,
+        )
+        if r2.status_code != 404:
+            r2.raise_for_status()
+            data = sorted(r2.json()["data"], key=lambda d: d.get("index", 0))
+            if len(data) == len(texts):
+                return config.EMBED_MODEL, [d["embedding"] for d in data]
+    except Exception:
+        pass
+    # 3) Local fastembed fallback
+    return config.LOCAL_EMBED_MODEL, _local_embed_many(texts)
@@ -0,0 +1,68 @@
+# app/fulltext_cache.py
+"""
+Cache of extracted article bodies for content_extractor.fetch_fulltext.
+
+Keyed by normalized URL. Text is zlib-compressed in a SQLite file bounded by
+FULLTEXT_CACHE_MAX_BYTES (least-recently-used rows go first), with a small
+in-memory hot tier in front. Failed extractions are stored as negative entries
+so dead or paywalled URLs aren't retried on every summary.
+"""
+from __future__ import annotations
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from .sqlite_lru import SQLiteLRU
+
+class FulltextCache(SQLiteLRU):
+    TABLE = "docs"
+    COLUMNS = ("body BLOB NOT NULL, ok INTEGER NOT NULL,"
+               " etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, used REAL NOT NULL")
+
+    def __init__(self, path: str | None, mem_items: int, max_bytes: int):
+        super().__init__(path, mem_limit=mem_items, max_bytes=max_bytes)
+
+    def get(self, k: str) -> Optional[Dict[str, Any]]:
+        """Entry dict {text, ok, etag, last_modified, fetched_at} or None."""
+        with self._lock:
+            e = self._mem_get(k)
+            if e is not None:
+                self._stats["mem_hits"] += 1
+                return e
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT body, ok, etag, last_modified, fetched_at FROM docs WHERE k = ?", (k,)
+                ).fetchone()
+                if row is not None:
+                    self._disk_touch([k])
+                    e = {
+                        "text": zlib.decompress(row[0]).decode("utf-8") if row[1] else "",
+                        "ok": bool(row[1]), "etag": row[2], "last_modified": row[3], "fetched_at": row[4],
+                    }
+                    self._mem_put(k, e)
+                    self._stats["disk_hits"] += 1
+                    return e
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, k: str, text: str, etag: str | None = None, last_modified: str | None = None) -> Dict[str, Any]:
+        now = time.time()
+        e = {"text": text or "", "ok": bool(text), "etag": etag, "last_modified": last_modified, "fetched_at": now}
+        with self._lock:
+            self._mem_put(k, e)
+            if self._db is not None:
+                blob = zlib.compress(e["text"].encode("utf-8"), 6) if e["ok"] else b""
+                self._disk_write([(k, blob, (int(e["ok"]), etag, last_modified, now, now))],
+                                 "ok, etag, last_modified, fetched_at, used")
+        return e
+
+    def touch(self, k: str) -> None:
+        """Mark an entry as just revalidated (304)."""
+        now = time.time()
+        with self._lock:
+            e = self._mem.get(k)
+            if e is not None:
+                e["fetched_at"] = now
+            if self._db is not None:
+                self._db.execute("UPDATE docs SET fetched_at = ?, used = ? WHERE k = ?", (now, now, k))
+                self._db.commit()
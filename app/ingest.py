@@ -0,0 +1,77 @@
+# app/ingest.py
+"""
+Background RSS ingestion: polls every REGION_RSS / DEFAULT_RSS feed on a schedule,
+normalizes + dedupes entries and persists them to the feed_articles table (and the
+in-process BM25 index) so /get_news can read them with RSS_MODE=store instead of
+waiting on upstream feeds.
+
+Run one pass by hand with:  python -m app.ingest
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any
+
+import config
+from database.db import Base, engine, SessionLocal
+from database import crud
+from . import news_fetcher
+from .news_fetcher import _normalize_url, _dedupe, _entry_to_article
+from .search_index import ARTICLE_INDEX
+from .background import BackgroundWorker
+
+# Separate from news_fetcher's request-path pool: slow feeds may hold a worker for INGEST_FEED_TIMEOUT.
+_INGEST_POOL = ThreadPoolExecutor(max_workers=max(1, config.INGEST_MAX_WORKERS), thread_name_prefix="rss-ingest")
+
+def _default_feeds() -> Dict[str, List[str]]:
+    return {**news_fetcher.REGION_RSS, "default": news_fetcher.DEFAULT_RSS}
+
+def ingest_once(feeds_by_region: Dict[str, List[str]] | None = None) -> Dict[str, Any]:
+    """
+    Fetch every feed once (each URL only once even if shared by regions) and upsert entries.
+    Returns {"added": {region: n}, "missed": [urls], "evicted": n}.
+    """
+    feeds_by_region = feeds_by_region or _default_feeds()
+    Base.metadata.create_all(bind=engine)
+
+    urls = list(dict.fromkeys(u for feeds in feeds_by_region.values() for u in feeds))
+    parsed, missed = news_fetcher.fetch_feeds(
+        urls, concurrent=True, feed_timeout=config.INGEST_FEED_TIMEOUT,
+        deadline=config.INGEST_DEADLINE, pool=_INGEST_POOL,
+    )
+
+    added: Dict[str, int] = {}
+    db = SessionLocal()
+    try:
+        for region, feeds in feeds_by_region.items():
+            articles = []
+            for url in feeds:
+                feed = parsed.get(url)
+                if feed is None:
+                    continue
+                source = feed.feed.get("title", "")
+                for e in feed.entries:
+                    a = _entry_to_article(e, source)
+                    if a["title"] and a["link"]:
+                        articles.append(a)
+            articles = _dedupe(articles)
+            for a in articles:
+                a["link_key"] = _normalize_url(a["link"])
+            added[region] = crud.upsert_feed_articles(db, region, articles) if articles else 0
+            news_fetcher.index_articles(articles, region)
+        evicted = crud.delete_feed_articles_older_than(db, config.INGEST_RETENTION_DAYS)
+        ARTICLE_INDEX.evict_older_than(config.INDEX_MAX_AGE_HOURS * 3600)
+    finally:
+        db.close()
+    return {"added": added, "missed": missed, "evicted": evicted}
+
+_WORKER = BackgroundWorker("rss-ingest", lambda: ingest_once(), config.INGEST_INTERVAL)
+
+def start_ingest_worker(interval: float | None = None):
+    """Start the polling thread (idempotent)."""
+    return _WORKER.start(interval)
+
+def stop_ingest_worker(timeout: float = 5.0) -> None:
+    _WORKER.stop(timeout)
+
+if __name__ == "__main__":
+    print(ingest_once())
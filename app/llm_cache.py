@@ -0,0 +1,87 @@
+# app/llm_cache.py
+"""
+Cache of Ollama /api/generate responses for rag._ollama_generate.
+
+Keyed by (model, options incl. temperature, prompt hash): MAP prompts depend only on an
+article's title, link and chunks, so a popular story is summarized once for everyone.
+Responses are zlib-compressed in a SQLite file bounded by LLM_CACHE_MAX_BYTES
+(least-recently-used rows go first) with an in-memory LRU tier in front. Each row keeps
+the seconds the original generation took, so hits report LLM time saved.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+import config
+from .sqlite_lru import SQLiteLRU
+
+def key(model: str, options: Dict[str, Any], prompt: str) -> str:
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = json.dumps([model, options, prompt_hash], sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class LLMCache(SQLiteLRU):
+    TABLE = "gen"
+    COLUMNS = "body BLOB NOT NULL, gen_seconds REAL NOT NULL, used REAL NOT NULL"
+    EVICT_BATCH = 128
+
+    def __init__(self, path: str | None, mem_items: int, max_bytes: int):
+        super().__init__(path, mem_limit=mem_items, max_bytes=max_bytes)
+        self._stats.update(seconds_saved=0.0, seconds_generating=0.0)
+
+    def get(self, k: str) -> Optional[str]:
+        with self._lock:
+            e = self._mem_get(k)
+            if e is not None:
+                self._stats["mem_hits"] += 1
+            elif self._db is not None:
+                row = self._db.execute("SELECT body, gen_seconds FROM gen WHERE k = ?", (k,)).fetchone()
+                if row is not None:
+                    self._disk_touch([k])
+                    e = (zlib.decompress(row[0]).decode("utf-8"), row[1])
+                    self._mem_put(k, e)
+                    self._stats["disk_hits"] += 1
+            if e is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["seconds_saved"] += e[1]
+            return e[0]
+
+    def put(self, k: str, response: str, gen_seconds: float) -> None:
+        with self._lock:
+            self._stats["seconds_generating"] += gen_seconds
+            if not response:
+                return  # never cache empty generations
+            self._mem_put(k, (response, gen_seconds))
+            if self._db is not None:
+                blob = zlib.compress(response.encode("utf-8"), 6)
+                self._disk_write([(k, blob, (gen_seconds, time.time()))], "gen_seconds, used")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = super().stats()
+            s["seconds_saved"] = round(s["seconds_saved"], 3)
+            s["seconds_generating"] = round(s["seconds_generating"], 3)
+            return s
+
+_CACHE = LLMCache(
+    config.LLM_CACHE_PATH if config.LLM_CACHE_ENABLED else None,
+    mem_items=config.LLM_CACHE_MEM_ITEMS,
+    max_bytes=config.LLM_CACHE_MAX_BYTES,
+)
+
+def get(k: str) -> Optional[str]:
+    return _CACHE.get(k) if config.LLM_CACHE_ENABLED else None
+
+def put(k: str, response: str, gen_seconds: float) -> None:
+    if config.LLM_CACHE_ENABLED:
+        _CACHE.put(k, response, gen_seconds)
+
+def stats() -> Dict[str, Any]:
+    return {"enabled": config.LLM_CACHE_ENABLED, **_CACHE.stats()}
+
+def clear() -> None:
+    _CACHE.clear()
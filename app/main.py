@@ -2,9 +2,16 @@ from __future__ import annotations
 from typing import List, Dict, Any, Optional
 from fastapi import FastAPI, HTTPException, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool, iterate_in_threadpool
+from fastapi.responses import StreamingResponse, JSONResponse
+import importlib.util
+import json
+import secrets
 from pydantic import BaseModel
-from .content_safety import moderate_text, redact_profanity
-from . import news_fetcher
+from .content_safety import moderate_text, redact_profanity, moderation_stats
+from . import news_fetcher, embed_cache, summary_jobs, llm_cache, warmup
+from .content_extractor import fulltext_cache_stats
+from .result_cache import ResultCache
 from database.db import Base, engine            
 import database.models as db_models  
 from .auth_routes import router as auth_router      
@@ -13,9 +20,13 @@ from .suggest_routes import router as suggest_router
 import config
 try:
     # use your RAG pipeline if present
-    from .rag import generate_news_response as rag_generate
+    from .rag import generate_news_response as rag_generate, stream_news_response as rag_stream
+    # rag imports these lazily, so check they are installed instead of failing on first use
+    for _dep in ("chromadb", "langdetect", "trafilatura"):
+        if importlib.util.find_spec(_dep) is None:
+            raise ImportError(_dep)
 except Exception:
-    rag_generate = None  # graceful fallback
+    rag_generate = rag_stream = None  # graceful fallback
 
 app = FastAPI(title="Personalized News Aggregator API", version="1.0.0")
 
@@ -24,7 +35,33 @@ def _startup():
     # Import models module so SQLAlchemy knows about tables
     _ = db_models
     Base.metadata.create_all(bind=engine)
-    
+    if config.WARMUP_ENABLED:
+        warmup.start_warmup()
+    if config.INGEST_ENABLED:
+        from .ingest import start_ingest_worker
+        start_ingest_worker()
+    if config.VECTOR_RETENTION_ENABLED and rag_generate is not None:
+        from .retention import start_retention_worker
+        start_retention_worker()
+    if config.PRECOMPUTE_ENABLED and rag_generate is not None:
+        from .precompute import start_precompute_worker
+        start_precompute_worker()
+
+@app.on_event("shutdown")
+async def _shutdown():
+    if config.WARMUP_ENABLED:
+        warmup.stop_warmup()
+    if config.INGEST_ENABLED:
+        from .ingest import stop_ingest_worker
+        stop_ingest_worker()
+    if config.VECTOR_RETENTION_ENABLED:
+        from .retention import stop_retention_worker
+        stop_retention_worker()
+    if config.PRECOMPUTE_ENABLED:
+        from .precompute import stop_precompute_worker
+        stop_precompute_worker()
+    await news_fetcher.close_async_client()
+
 # ✅ mount the auth routes
 app.include_router(auth_router) 
 app.include_router(suggest_router)
@@ -52,6 +89,12 @@ class Summary(BaseModel):
 class GetNewsResponse(BaseModel):
     articles: List[Article]
     summary: Summary
+    summary_job: Optional[str] = None   # poll /summary/{summary_job} for the personalized summary
+    cursor: Optional[str] = None        # pass back with page=N for further pages of this result set
+    page: int = 1
+    page_size: int = 0
+    total: int = 0
+    has_more: bool = False
 
 class SummItem(BaseModel):
     title: str
@@ -68,18 +111,41 @@ class SummBatchIn(BaseModel):
 def health():
     return {"ok": True}
 
-@app.get("/get_news", response_model=GetNewsResponse)
-def get_news(
-    query: str = Query(..., min_length=1),
-    user_id: int = 0,
-    prefs: str = "",
-    token: str | None = None,
-    authorization: str | None = Header(default=None, alias="Authorization"),
-    lang: str = Query(config.DEFAULT_LANG, description="Language (SerpAPI hl)"),
-    region: str = Query(config.DEFAULT_REGION, description="Country/region (SerpAPI gl; also RSS)"),
-    timeframe: str = Query("7d"),
-    sort: str = Query("date"),
-):
+@app.get("/ready")
+def ready():
+    """Per-component warm-up state; 503 until every configured component finished loading."""
+    r = warmup.readiness()
+    return JSONResponse(r, status_code=200 if r["ready"] else 503)
+
+@app.get("/stats")
+def stats():
+    return {
+        "feed_cache": news_fetcher.feed_cache_stats(),
+        "embed_cache": embed_cache.stats(),
+        "result_cache": news_fetcher.result_cache_stats(),
+        "fulltext_cache": fulltext_cache_stats(),
+        "vector_store": _vector_store_stats(),
+        "summary_jobs": summary_jobs.stats(),
+        "llm_cache": llm_cache.stats(),
+        "summary_store": _summary_store_stats(),
+        "cursors": _CURSORS.stats(),
+        "moderation": moderation_stats(),
+    }
+
+def _summary_store_stats() -> Dict[str, Any] | None:
+    if rag_generate is None:
+        return None
+    from .rag import summary_store_stats
+    from .precompute import precompute_stats
+    return {**summary_store_stats(), "precompute": precompute_stats()}
+
+def _vector_store_stats() -> Dict[str, Any] | None:
+    if rag_generate is None:
+        return None  # RAG (and chromadb) unavailable in this deployment
+    from .vector_store import retention_stats
+    return retention_stats()
+
+def _resolve_user_id(user_id: int, token: str | None, authorization: str | None) -> int:
     # resolve user_id from token/header if present
     resolved_user_id = user_id or 0
     jwt_token = None
@@ -92,17 +158,17 @@ def get_news(
             resolved_user_id = int(decode_token(jwt_token))
         except Exception:
             pass
+    return resolved_user_id
 
-    # fetch
+async def _fetch_articles(query: str, lang: str, region: str, timeframe: str, sort: str) -> List[Dict[str, Any]]:
+    """Fetch + rank; safety blocks become 400, anything else 500."""
+    # fetch (ASYNC_PIPELINE: upstream I/O on the event loop; else the blocking path in the threadpool)
     try:
-        articles = news_fetcher.fetch_news_from_sources(
-            query,
-            lang=lang,
-            region=region,
-            timeframe=timeframe,
-            sort=sort,
-            limit=50,
-        )
+        fetch_kwargs = dict(lang=lang, region=region, timeframe=timeframe, sort=sort, limit=50)
+        if config.ASYNC_PIPELINE:
+            articles = await news_fetcher.fetch_news_from_sources_async(query, **fetch_kwargs)
+        else:
+            articles = await run_in_threadpool(news_fetcher.fetch_news_from_sources, query, **fetch_kwargs)
     except ValueError as ve:
         # safety blocked path (from news_fetcher)
         detail = {"message": "Query blocked by content safety", "blocked": True, "flags": {}}
@@ -129,51 +195,197 @@ def get_news(
             a["source"] = ""
         else:
             a["source"] = str(src)
+    return articles
 
-    default_summary: Dict[str, Any] = {
+def _default_summary(articles: List[Dict[str, Any]], query: str) -> Dict[str, Any]:
+    return {
         "summary": f"{len(articles)} articles found for '{query}'.",
         "highlights": [a["title"] for a in articles[:5]],
         "top": [{"title": a["title"], "link": a["link"]} for a in articles[:5]],
     }
 
-    if rag_generate:
+def _finish_summary(s: Any, default_summary: Dict[str, Any], region: str, lang: str, timeframe: str, sort: str) -> Dict[str, Any]:
+    if not isinstance(s, dict):
+        s = default_summary
+    else:
+        s.setdefault("summary", default_summary["summary"])
+        s.setdefault("highlights", [])
+        s.setdefault("top", [])
+    s["summary"] = s.get("summary", "")
+    s["summary"] += f" (region={region}, lang={lang}, timeframe={timeframe}, sort={sort})"
+    return s
+
+# Ranked result sets behind /get_news cursors: later pages are sliced from here
+# without fetching or ranking again.
+_CURSORS = ResultCache(
+    ttl=config.CURSOR_TTL,
+    stale=0,
+    max_entries=config.CURSOR_MAX_ENTRIES,
+    max_bytes=config.CURSOR_MAX_BYTES,
+)
+
+def _page_response(entry: Dict[str, Any], cursor: str, page: int, page_size: int | None) -> Dict[str, Any]:
+    articles = entry["articles"]
+    total = len(articles)
+    size = page_size or max(total, 1)
+    start = (page - 1) * size
+    return {
+        "articles": articles[start:start + size],
+        "summary": entry["summary"],
+        "summary_job": entry["summary_job"],
+        "cursor": cursor,
+        "page": page,
+        "page_size": size,
+        "total": total,
+        "has_more": start + size < total,
+    }
+
+@app.get("/get_news", response_model=GetNewsResponse)
+async def get_news(
+    query: str = Query(..., min_length=1),
+    user_id: int = 0,
+    prefs: str = "",
+    token: str | None = None,
+    authorization: str | None = Header(default=None, alias="Authorization"),
+    lang: str = Query(config.DEFAULT_LANG, description="Language (SerpAPI hl)"),
+    region: str = Query(config.DEFAULT_REGION, description="Country/region (SerpAPI gl; also RSS)"),
+    timeframe: str = Query("7d"),
+    sort: str = Query("date"),
+    page: int = Query(1, ge=1),
+    page_size: int | None = Query(None, ge=1, le=50, description="Articles per page (omit for all)"),
+    cursor: str | None = Query(None, description="Cursor from an earlier page of the same search"),
+):
+    resolved_user_id = _resolve_user_id(user_id, token, authorization)
+    params = (query, prefs, resolved_user_id, lang, region, timeframe, sort)
+
+    if cursor:
+        entry, state = _CURSORS.lookup(cursor)
+        if state == "fresh" and entry["params"] == params:
+            return _page_response(entry, cursor, page, page_size)
+        # unknown, expired or for another search: run it again under a new cursor
+
+    articles = await _fetch_articles(query, lang, region, timeframe, sort)
+    default_summary = _default_summary(articles, query)
+    job_id: str | None = None
+
+    if rag_generate and config.SUMMARY_JOBS_ENABLED:
+        # articles go out now; the RAG summary is computed by the job pool (see /summary/{job_id})
+        job_id = summary_jobs.submit(
+            summary_jobs.job_key("get_news", resolved_user_id, query, prefs, articles,
+                                 region=region, lang=lang, timeframe=timeframe, sort=sort),
+            _summarize, articles, prefs, query, resolved_user_id, region, lang, timeframe, sort,
+        )
+
+    if job_id is not None:
+        s = _default_summary(articles, query)
+    elif rag_generate:
+        # jobs disabled or job table full -> compute inline as before
         try:
-            s = rag_generate(articles, prefs, query, user_id=resolved_user_id)
-            if not isinstance(s, dict):
-                s = default_summary
-            else:
-                s.setdefault("summary", default_summary["summary"])
-                s.setdefault("highlights", [])
-                s.setdefault("top", [])
+            s = await run_in_threadpool(rag_generate, articles, prefs, query, user_id=resolved_user_id)
         except Exception:
             s = default_summary
     else:
         s = default_summary
 
-    # app/main.py, right before `return {"articles": articles, "summary": s}`
-    s["summary"] = s.get("summary", "")
-    s["summary"] += f" (region={region}, lang={lang}, timeframe={timeframe}, sort={sort})"
-    return {"articles": articles, "summary": s}
+    entry = {
+        "params": params,
+        "articles": articles,
+        "summary": _finish_summary(s, default_summary, region, lang, timeframe, sort),
+        "summary_job": job_id,
+    }
+    cursor = secrets.token_urlsafe(12)
+    _CURSORS.put(cursor, entry)
+    return _page_response(entry, cursor, page, page_size)
+
+def _summarize(articles: List[Dict[str, Any]], prefs: str, query: str, user_id: int,
+               region: str, lang: str, timeframe: str, sort: str) -> Dict[str, Any]:
+    """Job body: the RAG summary, finished exactly like the inline /get_news path."""
+    default_summary = _default_summary(articles, query)
+    return _finish_summary(rag_generate(articles, prefs, query, user_id=user_id),
+                           default_summary, region, lang, timeframe, sort)
+
+@app.get("/summary/{job_id}")
+async def get_summary(job_id: str, wait: float = Query(0, ge=0, description="Long-poll up to this many seconds")):
+    """Status of a summary job: pending | running | done (summary set) | error (error set)."""
+    job = await summary_jobs.wait_async(job_id, min(wait, config.SUMMARY_MAX_WAIT))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired summary job")
+    return {"job_id": job_id, "status": job["status"], "summary": job["result"], "error": job["error"]}
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.get("/get_news/stream")
+async def get_news_stream(
+    query: str = Query(..., min_length=1),
+    user_id: int = 0,
+    prefs: str = "",
+    token: str | None = None,
+    authorization: str | None = Header(default=None, alias="Authorization"),
+    lang: str = Query(config.DEFAULT_LANG, description="Language (SerpAPI hl)"),
+    region: str = Query(config.DEFAULT_REGION, description="Country/region (SerpAPI gl; also RSS)"),
+    timeframe: str = Query("7d"),
+    sort: str = Query("date"),
+):
+    """
+    Server-Sent Events version of /get_news. Events, in order:
+      progress {"stage": "fetch"} -> articles {"articles": [...]} (as soon as ranking is done)
+      -> progress {"stage": "fulltext" | "retrieve" | "map" | "reduce"} -> token {"text"}...
+      -> summary {...same shape as /get_news "summary"...} -> done {}
+    A blocked or failed fetch ends the stream with error {"status", "detail"}.
+    """
+    resolved_user_id = _resolve_user_id(user_id, token, authorization)
+
+    async def events():
+        yield _sse("progress", {"stage": "fetch"})
+        try:
+            articles = await _fetch_articles(query, lang, region, timeframe, sort)
+        except HTTPException as e:
+            yield _sse("error", {"status": e.status_code, "detail": e.detail})
+            return
+        yield _sse("articles", {"articles": articles})
+
+        default_summary = _default_summary(articles, query)
+        s: Any = default_summary
+        if rag_stream:
+            try:
+                async for ev in iterate_in_threadpool(rag_stream(articles, prefs, query, user_id=resolved_user_id)):
+                    if ev["event"] == "summary":
+                        s = ev["data"]
+                    else:
+                        yield _sse(ev["event"], ev["data"])
+            except Exception:
+                s = default_summary
+        yield _sse("summary", _finish_summary(s, default_summary, region, lang, timeframe, sort))
+        yield _sse("done", {})
 
-    print(s)
-    return {"articles": articles, "summary": s}
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/summarize_batch")
-def summarize_batch(payload: SummBatchIn, user_id: int = 0):
+def summarize_batch(payload: SummBatchIn, user_id: int = 0, defer: bool = False):
+    """
+    {link: summary}. Stored per-article summaries come back without LLM calls; misses are
+    generated concurrently, or with defer=true left generating in the background and listed
+    under "pending" (ask again later).
+    """
     items = [i.model_dump() for i in payload.items if i.link]
     if not items:
-        return {"summaries": {}}
+        return {"summaries": {}, "pending": []}
 
     # Prefer your RAG/LLM if available; graceful fallback otherwise
     summaries: dict[str, str] = {}
     if rag_generate:
         try:
-            from .rag import summarize_articles  # new helper (see rag.py below)
-            summaries = summarize_articles(items, user_id=user_id)
+            from .rag import summarize_articles
+            summaries = summarize_articles(items, user_id=user_id, defer_misses=defer)
         except Exception:
             summaries = {i["link"]: (i.get("snippet") or i.get("title") or "") for i in items}
     else:
         summaries = {i["link"]: (i.get("snippet") or i.get("title") or "") for i in items}
 
-    return {"summaries": summaries}
+    return {"summaries": summaries, "pending": [i["link"] for i in items if i["link"] not in summaries]}
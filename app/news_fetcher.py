@@ -1,12 +1,17 @@
 # app/news_fetcher.py
 from __future__ import annotations
-import requests, feedparser, re
-from typing import List, Dict, Any
-from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+import asyncio, requests, feedparser, re, threading, time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Tuple
 from datetime import datetime, timezone, timedelta
 import config
-from .content_safety import moderate_text
+from database.db import SessionLocal
+from database import crud
+from .content_safety import moderate_text, filter_safe_articles
 from .ranker import rank_articles
+from .result_cache import ResultCache
+from .search_index import ARTICLE_INDEX, article_text
+from .utils import normalize_url
 
 REGION_META = {
     "us": {"google_domain": "google.com",   "location": "United States",     "lang": "en"},
@@ -18,15 +23,7 @@ REGION_META = {
 }
 
 # ---------- URL normalization / dedupe ----------
-def _normalize_url(url: str) -> str:
-    try:
-        u = urlparse(url)
-        # strip tracking query params
-        q = [(k, v) for (k, v) in parse_qsl(u.query, keep_blank_values=False)
-             if not k.lower().startswith(("utm_", "fbclid", "gclid", "mc_cid", "mc_eid"))]
-        return urlunparse((u.scheme, u.netloc.lower(), u.path, "", urlencode(q), ""))
-    except Exception:
-        return url
+_normalize_url = normalize_url
 
 def _dedupe(articles: List[Dict]) -> List[Dict]:
     seen = set()
@@ -69,18 +66,37 @@ def _parse_serp_date(s: str | None) -> str | None:
     except Exception:
         return None
 
+# ---------- Async HTTP client (shared by the async pipeline) ----------
+_ASYNC_CLIENT = None
+
+def get_async_client():
+    """Process-wide httpx.AsyncClient; capacity is bounded by sockets, not threads."""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        import httpx  # only needed for ASYNC_PIPELINE
+        _ASYNC_CLIENT = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=config.HTTP_MAX_CONNECTIONS),
+            follow_redirects=True,
+        )
+    return _ASYNC_CLIENT
+
+async def close_async_client() -> None:
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is not None:
+        await _ASYNC_CLIENT.aclose()
+        _ASYNC_CLIENT = None
+
 # ---------- SerpAPI: Google News ----------
-def fetch_from_serpapi_news(
+SERPAPI_URL = "https://serpapi.com/search.json"
+
+def _serpapi_params(
     query: str,
     *,
     lang: str = "en",
     region: str = "us",
     timeframe: str = "7d",
     sort: str = "date"
-) -> List[Dict[str, Any]]:
-    if not config.SERPAPI_KEY:
-        return []
-
+) -> Dict[str, Any]:
     meta = REGION_META.get(region.lower(), REGION_META["us"])
     google_domain = meta["google_domain"]
     location_str  = meta["location"]
@@ -110,13 +126,41 @@ def fetch_from_serpapi_news(
         "gl": region.lower(),       # country hint
         "tbs": tbs,                 # language + recency + sort
         "num": 20,
-        "no_cache": True,           # avoid SerpAPI cache
+        "no_cache": config.SERPAPI_NO_CACHE,  # SerpAPI-side cache hits are not billed
     }
+    return params
 
-    r = requests.get("https://serpapi.com/search.json", params=params, timeout=60)
+def fetch_from_serpapi_news(
+    query: str,
+    *,
+    lang: str = "en",
+    region: str = "us",
+    timeframe: str = "7d",
+    sort: str = "date"
+) -> List[Dict[str, Any]]:
+    if not config.SERPAPI_KEY:
+        return []
+    params = _serpapi_params(query, lang=lang, region=region, timeframe=timeframe, sort=sort)
+    r = requests.get(SERPAPI_URL, params=params, timeout=60)
     r.raise_for_status()
-    data = r.json()
+    return _parse_serpapi(r.json())
 
+async def fetch_from_serpapi_news_async(
+    query: str,
+    *,
+    lang: str = "en",
+    region: str = "us",
+    timeframe: str = "7d",
+    sort: str = "date"
+) -> List[Dict[str, Any]]:
+    if not config.SERPAPI_KEY:
+        return []
+    params = _serpapi_params(query, lang=lang, region=region, timeframe=timeframe, sort=sort)
+    r = await get_async_client().get(SERPAPI_URL, params=params, timeout=60)
+    r.raise_for_status()
+    return _parse_serpapi(r.json())
+
+def _parse_serpapi(data: Dict[str, Any]) -> List[Dict[str, Any]]:
     out: List[Dict[str, Any]] = []
     for it in data.get("news_results", []) or []:
         out.append({
@@ -196,41 +240,343 @@ REGION_RSS: dict[str, list[str]] = {
         "https://www.thehindu.com/news/feeder/default.rss",
     ],
 }
-def fetch_from_rss(query: str, region: str | None = None) -> List[Dict[str, Any]]:
-    q = (query or "").lower()
-    feeds = REGION_RSS.get((region or "").lower(), DEFAULT_RSS)
+# Bounded pool shared by all requests so dead feeds can't pile up threads.
+_RSS_POOL = ThreadPoolExecutor(max_workers=config.RSS_MAX_WORKERS, thread_name_prefix="rss")
 
-    out: List[Dict[str, Any]] = []
-    for url in feeds:
+# ---------- Feed snapshot cache (conditional GET) ----------
+# url -> {"raw", "parsed", "etag", "last_modified", "fetched_at"}
+_FEED_CACHE: Dict[str, Dict[str, Any]] = {}
+_FEED_CACHE_LOCK = threading.Lock()
+_FEED_STATS = {"hits": 0, "misses": 0, "not_modified": 0, "bytes_downloaded": 0}
+
+def _bump(key: str, n: int = 1) -> None:
+    with _FEED_CACHE_LOCK:
+        _FEED_STATS[key] += n
+
+def feed_cache_stats() -> Dict[str, Any]:
+    """Counters for the feed snapshot cache (hits = served without any network call)."""
+    with _FEED_CACHE_LOCK:
+        return {**_FEED_STATS, "feeds": len(_FEED_CACHE),
+                "bytes_cached": sum(len(s["raw"]) for s in _FEED_CACHE.values())}
+
+def clear_feed_cache() -> None:
+    with _FEED_CACHE_LOCK:
+        _FEED_CACHE.clear()
+        for k in _FEED_STATS:
+            _FEED_STATS[k] = 0
+
+def _conditional_request(url: str) -> Tuple[Dict[str, Any] | None, Dict[str, str]]:
+    """(snapshot, request headers) for a feed; snapshot is returned as-is if still fresh."""
+    with _FEED_CACHE_LOCK:
+        snap = _FEED_CACHE.get(url)
+    headers = {"User-Agent": "Mozilla/5.0 (news-aggregator)"}
+    if snap and snap.get("etag"):
+        headers["If-None-Match"] = snap["etag"]
+    if snap and snap.get("last_modified"):
+        headers["If-Modified-Since"] = snap["last_modified"]
+    return snap, headers
+
+def _fresh_snapshot(snap: Dict[str, Any] | None):
+    if snap and time.time() - snap["fetched_at"] < config.RSS_FRESH_SECONDS:
+        _bump("hits")
+        return snap["parsed"]
+    return None
+
+def _store_feed_response(url: str, snap: Dict[str, Any] | None, status: int, raw: bytes, headers) -> Any:
+    """Turn an HTTP response into a parsed feed, reusing the snapshot on 304."""
+    if status == 304 and snap:
+        with _FEED_CACHE_LOCK:
+            snap["fetched_at"] = time.time()
+        _bump("not_modified")
+        return snap["parsed"]
+    parsed = feedparser.parse(raw)
+    with _FEED_CACHE_LOCK:
+        _FEED_CACHE[url] = {
+            "raw": raw,
+            "parsed": parsed,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        _FEED_STATS["misses"] += 1
+        _FEED_STATS["bytes_downloaded"] += len(raw)
+    return parsed
+
+def _read_local_feed(url: str):
+    with open(url[len("file://"):], "rb") as f:
+        return feedparser.parse(f.read())
+
+def _download_feed(url: str, timeout: float):
+    """
+    Fetch and parse one feed; the timeout bounds the HTTP round-trip.
+    Snapshots younger than RSS_FRESH_SECONDS are served without a request;
+    older ones are revalidated with If-None-Match/If-Modified-Since and a 304 skips parsing.
+    """
+    if url.startswith("file://"):  # local stub feeds (ingestion tests / offline dev)
+        return _read_local_feed(url)
+    snap, headers = _conditional_request(url)
+    parsed = _fresh_snapshot(snap)
+    if parsed is not None:
+        return parsed
+    r = requests.get(url, timeout=timeout, headers=headers)
+    if r.status_code != 304:
+        r.raise_for_status()
+    return _store_feed_response(url, snap, r.status_code, r.content, r.headers)
+
+async def _download_feed_async(url: str, timeout: float):
+    if url.startswith("file://"):
+        return _read_local_feed(url)
+    snap, headers = _conditional_request(url)
+    parsed = _fresh_snapshot(snap)
+    if parsed is not None:
+        return parsed
+    r = await get_async_client().get(url, timeout=timeout, headers=headers)
+    if r.status_code != 304:
+        r.raise_for_status()
+    # feedparser is CPU-bound; keep it off the event loop
+    return await asyncio.to_thread(_store_feed_response, url, snap, r.status_code, r.content, r.headers)
+
+def fetch_feeds(
+    feeds: List[str],
+    *,
+    concurrent: bool | None = None,
+    feed_timeout: float | None = None,
+    deadline: float | None = None,
+    pool: ThreadPoolExecutor | None = None,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Fetch and parse `feeds`. Returns ({url: parsed_feed}, missed_urls).
+    Concurrent mode submits every feed to `pool` (default: the shared request-path pool)
+    and waits at most `deadline` seconds overall; feeds still running (or failed) are
+    reported as missed.
+    """
+    concurrent = config.RSS_CONCURRENT if concurrent is None else concurrent
+    feed_timeout = config.RSS_FEED_TIMEOUT if feed_timeout is None else feed_timeout
+    deadline = config.RSS_DEADLINE if deadline is None else deadline
+
+    parsed: Dict[str, Any] = {}
+    missed: List[str] = []
+    if not concurrent:
+        for url in feeds:
+            try:
+                parsed[url] = _download_feed(url, feed_timeout)
+            except Exception:
+                missed.append(url)
+        return parsed, missed
+
+    futures = {(pool or _RSS_POOL).submit(_download_feed, url, feed_timeout): url for url in feeds}
+    done, pending = wait(futures, timeout=deadline)
+    for fut in pending:
+        fut.cancel()  # not started yet -> never runs; already running -> ends at feed_timeout
+    for fut, url in futures.items():
+        if fut in done and fut.exception() is None:
+            parsed[url] = fut.result()
+        else:
+            missed.append(url)
+    return parsed, missed
+
+async def fetch_feeds_async(
+    feeds: List[str],
+    *,
+    feed_timeout: float | None = None,
+    deadline: float | None = None,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Event-loop version of fetch_feeds: at most RSS_MAX_WORKERS feeds in flight, same deadline semantics."""
+    feed_timeout = config.RSS_FEED_TIMEOUT if feed_timeout is None else feed_timeout
+    deadline = config.RSS_DEADLINE if deadline is None else deadline
+    sem = asyncio.Semaphore(max(1, config.RSS_MAX_WORKERS))
+
+    async def one(url: str):
+        async with sem:
+            return await _download_feed_async(url, feed_timeout)
+
+    tasks = {asyncio.ensure_future(one(url)): url for url in feeds}
+    if not tasks:
+        return {}, []
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for t in pending:
+        t.cancel()
+    parsed: Dict[str, Any] = {}
+    missed: List[str] = []
+    for t, url in tasks.items():
+        if t in done and t.exception() is None:
+            parsed[url] = t.result()
+        else:
+            missed.append(url)
+    return parsed, missed
+
+def _entry_published_at(e) -> str | None:
+    if getattr(e, "published_parsed", None):
+        try:
+            dt = datetime(*e.published_parsed[:6], tzinfo=timezone.utc)
+            return dt.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+        except Exception:
+            pass
+    return None
+
+def _entry_to_article(e, source: str) -> Dict[str, Any]:
+    return {
+        "title": getattr(e, "title", "") or "",
+        "link": getattr(e, "link", "") or "",
+        "snippet": getattr(e, "summary", "") or "",
+        "source": source,
+        "published_at": _entry_published_at(e),
+    }
+
+def _feed_articles(feed) -> List[Dict[str, Any]]:
+    if feed is None:
+        return []
+    try:
+        source = feed.feed.get("title", "")
+        return [a for a in (_entry_to_article(e, source) for e in feed.entries) if a["title"] and a["link"]]
+    except Exception:
+        return []
+
+# ---------- BM25 index maintenance ----------
+# (region, url) -> (parsed feed object, indexed_at). Unchanged snapshots (cache hit / 304)
+# are skipped, but re-touched before they could age out of the index.
+_INDEXED_FEEDS: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+_INDEX_LOCK = threading.Lock()
+
+def index_articles(articles: List[Dict[str, Any]], region: str) -> int:
+    """Add/refresh articles in ARTICLE_INDEX under `region`. Returns number of (re)indexed docs."""
+    n = 0
+    for a in articles:
+        if ARTICLE_INDEX.add(_normalize_url(a["link"]), article_text(a), article=a, region=region):
+            n += 1
+    return n
+
+def index_feeds(parsed: Dict[str, Any], region: str) -> None:
+    """Index entries of freshly parsed feeds, then evict docs no feed has carried for a while."""
+    max_age = config.INDEX_MAX_AGE_HOURS * 3600
+    now = time.time()
+    with _INDEX_LOCK:
+        for url, feed in parsed.items():
+            key = (region, url)
+            prev = _INDEXED_FEEDS.get(key)
+            if prev is not None and prev[0] is feed and now - prev[1] < max_age / 2:
+                continue
+            index_articles(_feed_articles(feed), region)
+            _INDEXED_FEEDS[key] = (feed, now)
+        ARTICLE_INDEX.evict_older_than(max_age)
+
+def _search_index(query: str, region: str) -> List[Dict[str, Any]]:
+    hits = ARTICLE_INDEX.search(query, k=config.INDEX_MAX_RESULTS, regions=[region])
+    return [dict(a) for _, _, a in hits if a]
+
+def rss_region_key(region: str | None) -> str:
+    """Region key used by REGION_RSS and the article store; unknown regions map to 'default'."""
+    r = (region or "").lower()
+    return r if r in REGION_RSS else "default"
+
+def rss_feeds_for(region: str | None) -> List[str]:
+    return REGION_RSS.get(rss_region_key(region), DEFAULT_RSS)
+
+def _fetch_from_store(region: str | None) -> List[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        return crud.search_feed_articles(db, rss_region_key(region))
+    finally:
+        db.close()
+
+# region -> newest fetched_at already copied from the article store into ARTICLE_INDEX
+_STORE_SYNCED: Dict[str, datetime] = {}
+
+def _sync_index_from_store(rkey: str) -> None:
+    """
+    Index what the ingestion worker stored for `rkey` since the last sync (everything on
+    the first one), so store-mode queries get the same BM25 search as live mode even when
+    ingestion runs in another process.
+    """
+    db = SessionLocal()
+    try:
+        articles, newest = crud.feed_articles_since(db, rkey, _STORE_SYNCED.get(rkey))
+    finally:
+        db.close()
+    with _INDEX_LOCK:
+        index_articles(articles, rkey)
+        if newest is not None:
+            _STORE_SYNCED[rkey] = newest
+
+def fetch_from_rss_with_status(
+    query: str,
+    region: str | None = None,
+    *,
+    mode: str | None = None,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Like fetch_from_rss, but also returns the feed URLs that failed or missed the deadline.
+    mode="store" reads what the ingestion worker (app/ingest.py) persisted instead of the network.
+    """
+    mode = (mode or config.RSS_MODE).lower()
+    if mode == "store":
+        return _rss_from_store(query, region)
+    feeds = rss_feeds_for(region)
+    parsed, missed = fetch_feeds(feeds)
+    return _rss_results(query, region, feeds, parsed), missed
+
+async def fetch_from_rss_with_status_async(
+    query: str,
+    region: str | None = None,
+    *,
+    mode: str | None = None,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    mode = (mode or config.RSS_MODE).lower()
+    if mode == "store":
+        return await asyncio.to_thread(_rss_from_store, query, region)
+    feeds = rss_feeds_for(region)
+    parsed, missed = await fetch_feeds_async(feeds)
+    return await asyncio.to_thread(_rss_results, query, region, feeds, parsed), missed
+
+def _rss_from_store(query: str, region: str | None) -> Tuple[List[Dict[str, Any]], List[str]]:
+    rkey = rss_region_key(region)
+    q = (query or "").strip()
+    if q:
         try:
-            feed = feedparser.parse(url)
-            for e in feed.entries:
-                title = getattr(e, "title", "") or ""
-                link = getattr(e, "link", "") or ""
-                summ = getattr(e, "summary", "") or ""
-                text = f"{title}\n{summ}".lower()
-                # Loose match: prefer titles that contain the query, else include if snippet matches
-                if (q and (q in title.lower() or q in summ.lower())) or not q:
-                    # Try published date
-                    published_at = None
-                    if getattr(e, "published_parsed", None):
-                        try:
-                            dt = datetime(*e.published_parsed[:6], tzinfo=timezone.utc)
-                            published_at = dt.replace(microsecond=0).isoformat().replace("+00:00", "Z")
-                        except Exception:
-                            pass
-                    out.append({
-                        "title": title,
-                        "link": link,
-                        "snippet": summ,
-                        "source": feed.feed.get("title", ""),
-                        "published_at": published_at,
-                    })
+            _sync_index_from_store(rkey)
         except Exception:
-            continue
+            pass  # store unavailable: search what is already indexed
+        return _search_index(q, rkey), []
+    try:
+        return _dedupe(_fetch_from_store(region)), []
+    except Exception:
+        return [], []
+
+def _rss_results(query: str, region: str | None, feeds: List[str], parsed: Dict[str, Any]) -> List[Dict[str, Any]]:
+    rkey = rss_region_key(region)
+    q = (query or "").strip()
+    index_feeds(parsed, rkey)
+    if q:
+        return _search_index(q, rkey)
+    out: List[Dict[str, Any]] = []
+    for url in feeds:  # keep configured feed order regardless of completion order
+        out.extend(_feed_articles(parsed.get(url)))
     return _dedupe(out)
 
+def fetch_from_rss(query: str, region: str | None = None, *, mode: str | None = None) -> List[Dict[str, Any]]:
+    return fetch_from_rss_with_status(query, region=region, mode=mode)[0]
+
 # ---------- Public entry ----------
+# Ranked results for head queries, shared across users (see config.RESULT_CACHE_*).
+_RESULTS = ResultCache(
+    ttl=config.RESULT_CACHE_TTL,
+    stale=config.RESULT_CACHE_STALE,
+    max_entries=config.RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=config.RESULT_CACHE_MAX_BYTES,
+)
+_BG_TASKS: set = set()  # keep refresh tasks referenced until done
+
+def _result_key(query: str, lang: str, region: str, timeframe: str, sort: str, limit: int) -> tuple:
+    q = " ".join((query or "").lower().split())
+    return (q, (lang or "").lower(), (region or "").lower(), timeframe, sort, limit)
+
+def _copy_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # callers mutate article dicts (e.g. main.get_news coerces "source"); never hand out cached ones
+    return [dict(a) for a in articles]
+
+def result_cache_stats() -> Dict[str, Any]:
+    return _RESULTS.stats()
+
 def fetch_news_from_sources(
     query: str,
     *,
@@ -243,16 +589,102 @@ def fetch_news_from_sources(
     safe, scores, flags = moderate_text(query)
     if not safe:
         raise ValueError(f"blocked by safety: {flags}")
+    if not config.RESULT_CACHE_ENABLED:
+        return _fetch_and_rank(query, lang, region, timeframe, sort, limit)
 
+    key = _result_key(query, lang, region, timeframe, sort, limit)
+    cached, state = _RESULTS.lookup(key)
+    if state == "stale" and _RESULTS.claim_refresh(key):
+        threading.Thread(
+            target=_refresh_result, args=(key, query, lang, region, timeframe, sort, limit), daemon=True
+        ).start()
+    if state != "miss":
+        return _copy_articles(cached)
+
+    ranked = _fetch_and_rank(query, lang, region, timeframe, sort, limit)
+    _RESULTS.put(key, _copy_articles(ranked))
+    return ranked
+
+def _fetch_and_rank(query: str, lang: str, region: str, timeframe: str, sort: str, limit: int) -> List[Dict[str, Any]]:
     serp = fetch_from_serpapi_news(query, lang=lang, region=region, timeframe=timeframe, sort=sort)
     rss  = fetch_from_rss(query, region=region)   # <-- region-aware now
+    return _rank_combined(query, serp, rss, limit)
+
+def _refresh_result(key: tuple, *args) -> None:
+    try:
+        _RESULTS.put(key, _fetch_and_rank(*args))
+    except Exception:
+        _RESULTS.release_refresh(key)  # keep serving stale; next stale hit retries
+
+def _moderate_top(ranked: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """
+    First `limit` safe articles in ranked order. Only the top limit + ARTICLE_MODERATION_MARGIN
+    go through the model; if some are dropped, the next-ranked candidates top the list up.
+    limit <= 0 means no limit (as in rank_articles): every article is moderated.
+    """
+    if limit <= 0:
+        return filter_safe_articles(ranked)
+    out: List[Dict[str, Any]] = []
+    i = 0
+    while len(out) < limit and i < len(ranked):
+        n = limit - len(out) + config.ARTICLE_MODERATION_MARGIN
+        out.extend(filter_safe_articles(ranked[i:i + n]))
+        i += n
+    return out[:limit]
 
+def _rank_combined(query: str, serp: List[Dict[str, Any]], rss: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
     combined = _dedupe(serp + rss)
-    ranked = rank_articles(query, combined, use_embeddings=True)
-    if limit and limit > 0:
-        ranked = ranked[:limit]
+    if config.ARTICLE_MODERATION_ENABLED:
+        ranked = _moderate_top(rank_articles(query, combined, use_embeddings=True), limit)
+    else:
+        ranked = rank_articles(query, combined, use_embeddings=True, top_k=limit)
     for a in ranked:
         a.setdefault("snippet", "")
         a.setdefault("source", "")
         a.setdefault("published_at", None)
     return ranked
+
+async def fetch_news_from_sources_async(
+    query: str,
+    *,
+    lang: str = "en",
+    region: str = "us",
+    timeframe: str = "7d",
+    sort: str = "date",
+    limit: int = 50
+) -> List[Dict[str, Any]]:
+    """
+    Async twin of fetch_news_from_sources: SerpAPI and RSS run concurrently on the
+    event loop; CPU-bound moderation and ranking run in worker threads.
+    """
+    safe, scores, flags = await asyncio.to_thread(moderate_text, query)
+    if not safe:
+        raise ValueError(f"blocked by safety: {flags}")
+    if not config.RESULT_CACHE_ENABLED:
+        return await _fetch_and_rank_async(query, lang, region, timeframe, sort, limit)
+
+    key = _result_key(query, lang, region, timeframe, sort, limit)
+    cached, state = _RESULTS.lookup(key)
+    if state == "stale" and _RESULTS.claim_refresh(key):
+        task = asyncio.ensure_future(_refresh_result_async(key, query, lang, region, timeframe, sort, limit))
+        _BG_TASKS.add(task)
+        task.add_done_callback(_BG_TASKS.discard)
+    if state != "miss":
+        return _copy_articles(cached)
+
+    ranked = await _fetch_and_rank_async(query, lang, region, timeframe, sort, limit)
+    _RESULTS.put(key, _copy_articles(ranked))
+    return ranked
+
+async def _fetch_and_rank_async(query: str, lang: str, region: str, timeframe: str, sort: str, limit: int) -> List[Dict[str, Any]]:
+    serp, (rss, _missed) = await asyncio.gather(
+        fetch_from_serpapi_news_async(query, lang=lang, region=region, timeframe=timeframe, sort=sort),
+        fetch_from_rss_with_status_async(query, region=region),
+    )
+    return await asyncio.to_thread(_rank_combined, query, serp, rss, limit)
+
+async def _refresh_result_async(key: tuple, *args) -> None:
+    try:
+        _RESULTS.put(key, await _fetch_and_rank_async(*args))
+    except Exception:
+        _RESULTS.release_refresh(key)
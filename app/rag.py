@@ -1,11 +1,18 @@
 # app/rag.py
+import hashlib
 import json
-from typing import List, Dict, Any
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Iterator, Optional
 import requests
 import config
-from app.content_extractor import fetch_fulltext
-from app.vector_store import add_article_chunks, query as vs_query
-from langdetect import detect
+from app import llm_cache, summary_jobs
+from app.content_extractor import fetch_fulltext, fetch_fulltext_many, peek_fulltext
+from app.utils import normalize_url
+from app.vector_store import add_articles_chunks, query as vs_query
+from database.db import SessionLocal
+from database import crud
 
 def chunk_text(s: str, size: int = 900, overlap: int = 150) -> List[str]:
     s = (s or "").strip()
@@ -17,15 +24,60 @@ def chunk_text(s: str, size: int = 900, overlap: int = 150) -> List[str]:
         i += step
     return out
 
-def _ollama_generate(prompt: str, temperature: float = 0.7) -> str:
+def _ollama_generate(prompt: str, temperature: float = 0.7, timeout: float = 120, fresh: bool = False) -> str:
+    """
+    Completion for prompt, served from llm_cache when the same model/options/prompt ran before.
+    fresh=True asks for a new sample (temperature-driven variety): the cache is not read.
+    """
+    options = {"temperature": temperature}
+    key = llm_cache.key(config.LLM_MODEL, options, prompt)
+    if not fresh:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return cached
+    t0 = time.time()
     r = requests.post(
         f"{config.OLLAMA_BASE_URL}/api/generate",
         json={"model": config.LLM_MODEL, "prompt": prompt, "stream": False,
-              "options": {"temperature": temperature}},
-        timeout=120,
+              "options": options},
+        timeout=timeout,
     )
     r.raise_for_status()
-    return r.json().get("response", "").strip()
+    out = r.json().get("response", "").strip()
+    llm_cache.put(key, out, time.time() - t0)
+    return out
+
+def _ollama_generate_stream(prompt: str, temperature: float = 0.7, timeout: float = 120, fresh: bool = False) -> Iterator[str]:
+    """Same call with `stream: true`: yields response fragments as Ollama produces them (one fragment on a cache hit)."""
+    options = {"temperature": temperature}
+    key = llm_cache.key(config.LLM_MODEL, options, prompt)
+    if not fresh:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+    t0 = time.time()
+    parts: List[str] = []
+    with requests.post(
+        f"{config.OLLAMA_BASE_URL}/api/generate",
+        json={"model": config.LLM_MODEL, "prompt": prompt, "stream": True,
+              "options": options},
+        timeout=timeout,  # per read: a stalled stream fails, a long one does not
+        stream=True,
+    ) as r:
+        r.raise_for_status()
+        for line in r.iter_lines():
+            if not line:
+                continue
+            msg = json.loads(line)
+            if msg.get("error"):
+                raise RuntimeError(msg["error"])
+            if msg.get("response"):
+                parts.append(msg["response"])
+                yield msg["response"]
+            if msg.get("done"):
+                llm_cache.put(key, "".join(parts).strip(), time.time() - t0)
+                break
 
 MAP_PROMPT = """
 You are a concise journalist and summarizer. From the ARTICLE below, write 3–5 bullet points summarizing key insights.
@@ -56,78 +108,254 @@ Per-article bullets:
 Only return JSON.
 """
 
-def generate_news_response(news_articles: List[Dict[str, Any]], user_preferences: str, query: str, user_id: int = 0) -> Dict[str, Any]:
-    # 1) index / upsert
+# MAP calls run in parallel (Ollama serves OLLAMA_NUM_PARALLEL requests at once)
+_MAP_POOL = ThreadPoolExecutor(max_workers=max(1, config.RAG_MAP_CONCURRENCY), thread_name_prefix="rag-map")
+
+def _map_one(v: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    body = "\n\n".join(v["texts"])
+    try:
+        bullets = _ollama_generate(
+            MAP_PROMPT.format(title=v["title"], link=v["link"], body=body[:10000]),
+            timeout=config.RAG_MAP_TIMEOUT,
+        )
+    except Exception:
+        return None
+    if not bullets:
+        return None
+    return {"title": v["title"], "link": v["link"], "bullets": bullets}
+
+def _map_articles(groups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Per-article bullets, concurrently. Articles whose call fails, comes back empty or runs
+    longer than RAG_MAP_TIMEOUT are dropped so REDUCE still runs on the rest. Each call's
+    clock starts when it leaves the queue: the pool is shared with other digests and with
+    summarize_articles, so time spent waiting for a worker does not count against it.
+    Output keeps retrieval order.
+    """
+    if not groups:
+        return []
+    started: List[Optional[float]] = [None] * len(groups)
+
+    def run(i: int) -> Optional[Dict[str, Any]]:
+        started[i] = time.monotonic()
+        return _map_one(groups[i])
+
+    futs = [_MAP_POOL.submit(run, i) for i in range(len(groups))]
+    timeout = config.RAG_MAP_TIMEOUT
+    while True:
+        now = time.monotonic()
+        # unfinished calls that are queued or still within their own timeout
+        live = [i for i, f in enumerate(futs)
+                if not f.done() and (started[i] is None or now - started[i] < timeout)]
+        if not live:
+            break
+        expiry = min((started[i] + timeout for i in live if started[i] is not None), default=now + timeout)
+        wait([futs[i] for i in live], timeout=max(0.0, expiry - now), return_when=FIRST_COMPLETED)
+    # overdue calls keep running until their request timeout; their result is ignored
+    return [f.result() for f in futs if f.done() and f.result() is not None]
+
+def _index_for_user(news_articles: List[Dict[str, Any]], user_id: int) -> None:
+    # fetch full text concurrently (bounded per domain + overall budget), then index / upsert
+    arts = []
     for art in news_articles:
         title   = art.get("title") or ""
         link    = art.get("link") or art.get("url") or ""
         snippet = art.get("snippet") or art.get("description") or ""
-        if not (title and link): 
-            continue
-        body = fetch_fulltext(link) or snippet
+        if title and link:
+            arts.append((title, link, snippet))
+    bodies = fetch_fulltext_many([link for _, link, _ in arts])
+
+    from langdetect import detect  # loaded on first use; app.warmup preloads it
+    to_index = []
+    for title, link, snippet in arts:
+        body = bodies.get(link) or snippet
         try:
             if detect(body) != "en":
                 continue  # skip non-English articles
         except:
             pass 
-        chunks = chunk_text(body)
-        add_article_chunks(user_id=user_id, title=title, link=link, chunks=chunks, snippet=snippet)
+        to_index.append({"title": title, "link": link, "chunks": chunk_text(body), "snippet": snippet})
+    # one bulk call: chunks of all articles are embedded together in large batches
+    add_articles_chunks(user_id, to_index)
 
-    # 2) retrieve
+def _retrieve_groups(user_id: int, query: str) -> List[Dict[str, Any]]:
+    """Top chunks for the query, grouped per article (at most 2 chunks each)."""
     hits = vs_query(user_id=user_id, query_text=query, k=10)
-    if not hits:
-        return {"summary": "No relevant content found.", "highlights": [], "top": []}
-
-    # 3) map per article (group by link)
     by_link: Dict[str, Dict[str, Any]] = {}
     for h in hits:
         by_link.setdefault(h["link"], {"title": h["title"], "link": h["link"], "texts": []})
         if len(by_link[h["link"]]["texts"]) < 2:
             by_link[h["link"]]["texts"].append(h["text"])
+    return list(by_link.values())
 
-    mapped = []
-    for v in by_link.values():
-        body = "\n\n".join(v["texts"])
-        bullets = _ollama_generate(MAP_PROMPT.format(title=v["title"], link=v["link"], body=body[:10000]))
-        mapped.append({"title": v["title"], "link": v["link"], "bullets": bullets})
-
-    # 4) reduce
+def _reduce_prompt(mapped: List[Dict[str, Any]], user_preferences: str, query: str) -> str:
     block = "\n\n".join([f"TITLE: {m['title']}\nURL: {m['link']}\nBULLETS:\n{m['bullets']}" for m in mapped])
-    raw = _ollama_generate(REDUCE_PROMPT.format(prefs=user_preferences, query=query, bullets=block))
+    return REDUCE_PROMPT.format(prefs=user_preferences, query=query, bullets=block)
+
+def _parse_reduce(raw: str, mapped: List[Dict[str, Any]]) -> Dict[str, Any]:
     try:
         return json.loads(raw)
     except json.JSONDecodeError:
         return {"summary": raw, "highlights": [], "top": [{"title": m["title"], "link": m["link"]} for m in mapped[:5]]}
 
-def summarize_articles(items: list[dict], user_id: int = 0) -> dict[str, str]:
+_NO_CONTENT = {"summary": "No relevant content found.", "highlights": [], "top": []}
+_MAP_FAILED = {"summary": "Could not summarize the retrieved articles.", "highlights": [], "top": []}
+
+def generate_news_response(news_articles: List[Dict[str, Any]], user_preferences: str, query: str, user_id: int = 0) -> Dict[str, Any]:
+    # 1) fetch full text + index
+    _index_for_user(news_articles, user_id)
+
+    # 2) retrieve
+    groups = _retrieve_groups(user_id, query)
+    if not groups:
+        return dict(_NO_CONTENT)
+
+    # 3) map per article (group by link)
+    mapped = _map_articles(groups)
+    if not mapped:
+        return dict(_MAP_FAILED)
+
+    # 4) reduce
+    return _parse_reduce(_ollama_generate(_reduce_prompt(mapped, user_preferences, query)), mapped)
+
+def stream_news_response(news_articles: List[Dict[str, Any]], user_preferences: str, query: str, user_id: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    generate_news_response as a sequence of events:
+      {"event": "progress", "data": {"stage": ...}}  before each stage (fulltext, retrieve, map, reduce)
+      {"event": "token",    "data": {"text": ...}}   REDUCE output as Ollama streams it
+      {"event": "summary",  "data": {...}}           the parsed summary, always last
+    """
+    yield {"event": "progress", "data": {"stage": "fulltext", "articles": len(news_articles)}}
+    _index_for_user(news_articles, user_id)
+
+    yield {"event": "progress", "data": {"stage": "retrieve"}}
+    groups = _retrieve_groups(user_id, query)
+    if not groups:
+        yield {"event": "summary", "data": dict(_NO_CONTENT)}
+        return
+
+    yield {"event": "progress", "data": {"stage": "map", "articles": len(groups)}}
+    mapped = _map_articles(groups)
+    if not mapped:
+        yield {"event": "summary", "data": dict(_MAP_FAILED)}
+        return
+
+    yield {"event": "progress", "data": {"stage": "reduce", "articles": len(mapped)}}
+    parts: List[str] = []
+    for tok in _ollama_generate_stream(_reduce_prompt(mapped, user_preferences, query)):
+        parts.append(tok)
+        yield {"event": "token", "data": {"text": tok}}
+    yield {"event": "summary", "data": _parse_reduce("".join(parts).strip(), mapped)}
+
+# ---------- Per-article summaries (/summarize_batch) ----------
+_SUMMARY_STATS = {"hits": 0, "misses": 0, "generated": 0, "failed": 0, "deferred": 0}
+_SUMMARY_STATS_LOCK = threading.Lock()  # bumped from request threads, map workers and summary jobs
+
+def _bump(key: str, n: int = 1) -> None:
+    with _SUMMARY_STATS_LOCK:
+        _SUMMARY_STATS[key] += n
+
+def summary_store_stats() -> Dict[str, int]:
+    with _SUMMARY_STATS_LOCK:
+        return dict(_SUMMARY_STATS)
+
+def _body_hash(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+def _stored_summaries(link_keys: List[str]) -> Dict[str, List[tuple]]:
+    db = SessionLocal()
+    try:
+        return crud.get_article_summaries(db, link_keys)
+    finally:
+        db.close()
+
+def _summarize_body(it: Dict[str, Any], body: str) -> str:
+    """LLM summary of one article body, persisted under (normalized link, body hash)."""
+    title   = it.get("title", "")
+    snippet = it.get("snippet", "")
+    if not body:
+        return snippet or title or ""
+
+    # Build the summarization prompt
+    prompt = (
+        "You are a concise news assistant. Write a 2-3 sentence, neutral summary. "
+        "Focus on what happened and why it matters. Avoid quotes or clickbait.\n\n"
+        f"Title: {title}\nContent: {body[:3000]}"
+    )
+    try:
+        summ = _ollama_generate(prompt).strip()
+    except Exception:
+        summ = ""
+    if not summ:
+        _bump("failed")
+        return snippet or title or ""
+
+    _bump("generated")
+    db = SessionLocal()
+    try:
+        crud.upsert_article_summary(db, normalize_url(it.get("link", "")), _body_hash(body), summ, config.LLM_MODEL)
+    finally:
+        db.close()
+    return summ
+
+def _summarize_item(it: Dict[str, Any]) -> str:
+    # Try to fetch the full article content if possible
+    body = fetch_fulltext(it.get("link", "")) or it.get("snippet", "") or it.get("title", "")
+    return _summarize_body(it, body)
+
+def summarize_articles(items: list[dict], user_id: int = 0, defer_misses: bool = False) -> dict[str, str]:
     """
     items: [{'title','link','snippet',...}, ...]
     Returns {link: concise_summary}
+
+    Summaries are stored per article (normalized link + hash of the summarized body) and
+    served without fetching or calling the LLM when the cached body is unchanged (or not
+    cached at all). Misses are fetched and summarized concurrently. defer_misses=True
+    returns the hits only and finishes the misses in the background job pool, so they are
+    hits on the next call.
     """
-    out = {}
+    out: dict[str, str] = {}
+    items = [it for it in items if it.get("link")]
+    keys = {it["link"]: normalize_url(it["link"]) for it in items}
+    stored = _stored_summaries(list(keys.values()))
+
+    misses = []
     for it in items:
-        title   = it.get("title", "")
-        link    = it.get("link", "")
-        snippet = it.get("snippet", "")
-
-        # Try to fetch the full article content if possible
-        body = fetch_fulltext(link) or snippet or title
-        if not body:
-            out[link] = snippet or title or ""
-            continue
-
-        # Build the summarization prompt
-        prompt = (
-            "You are a concise news assistant. Write a 2-3 sentence, neutral summary. "
-            "Focus on what happened and why it matters. Avoid quotes or clickbait.\n\n"
-            f"Title: {title}\nContent: {body[:3000]}"
+        link = it["link"]
+        versions = stored.get(keys[link])
+        if versions:
+            body = peek_fulltext(link)
+            match = versions[0][1] if body is None else next(
+                (summ for h, summ in versions if h == _body_hash(body)), None
+            )
+            if match:
+                out[link] = match
+                _bump("hits")
+                continue
+        misses.append(it)
+    _bump("misses", len(misses))
+    if not misses:
+        return out
+
+    if defer_misses:
+        for it in misses:
+            # article summaries depend on the article only (no user retrieval): shared, user 0
+            summary_jobs.submit(summary_jobs.job_key("article_summary", 0, keys[it["link"]], "", []),
+                                _summarize_item, it)
+            _bump("deferred")
+        return out
+
+    bodies = fetch_fulltext_many([it["link"] for it in misses])
+    futs = {
+        it["link"]: _MAP_POOL.submit(
+            _summarize_body, it, bodies.get(it["link"]) or it.get("snippet", "") or it.get("title", "")
         )
+        for it in misses
+    }
+    for link, fut in futs.items():
         try:
-            summ = _ollama_generate(prompt)
+            out[link] = fut.result()
         except Exception:
-            summ = snippet or title or ""
-
-        out[link] = summ.strip()
-
+            it = next(i for i in misses if i["link"] == link)
+            out[link] = it.get("snippet") or it.get("title") or ""
     return out
-
@@ -2,28 +2,27 @@
 from __future__ import annotations
 from typing import List, Dict
 import math
-import requests
 import config
-import re
 from datetime import datetime, timezone
+from . import embed_cache
+from .embeddings import embed_ollama_many
+try:
+    import numpy as np  # vectorized scoring path; pure-Python fallback below
+except ImportError:
+    np = None
+from .search_index import ARTICLE_INDEX, article_text, tokenize
+from .utils import normalize_url
 
 # ---------- Embeddings (Ollama) ----------
 def _embed_ollama(texts: List[str]) -> List[List[float]]:
     """
-    Uses Ollama embeddings endpoint: POST /api/embeddings
+    Embeds texts through the shared embedding cache; only misses hit Ollama.
     Model: config.EMBED_MODEL (e.g., "nomic-embed-text:latest")
     """
-    url = f"{config.OLLAMA_BASE_URL.rstrip('/')}/api/embeddings"
-    out: List[List[float]] = []
-    for t in texts:
-        payload = {"model": config.EMBED_MODEL, "prompt": t[:4000]}
-        r = requests.post(url, json=payload, timeout=60)
-        r.raise_for_status()
-        emb = r.json().get("embedding")
-        if not isinstance(emb, list):
-            emb = r.json().get("data", [{}])[0].get("embedding", [])
-        out.append(emb or [])
-    return out
+    texts = [t[:4000] for t in texts]
+    if not texts:
+        return []
+    return embed_cache.cached_embed(config.EMBED_MODEL, texts, embed_ollama_many)
 
 def _cosine(u: List[float], v: List[float]) -> float:
     if not u or not v or len(u) != len(v):
@@ -34,18 +33,30 @@ def _cosine(u: List[float], v: List[float]) -> float:
     return dot / math.sqrt(su*sv)
 
 # ---------- Lightweight keyword score (fallback) ----------
-WORD_RE = re.compile(r"[a-z0-9]+")
-
 def _tokens(text: str) -> set[str]:
-    return {m.group(0) for m in WORD_RE.finditer(text.lower()) if len(m.group(0)) > 2}
+    return set(tokenize(text))
 
-def _keyword_overlap(q: str, t: str) -> float:
-    qs, ts = _tokens(q), _tokens(t)
+def _overlap(qs: set[str], ts) -> float:
     if not qs or not ts:
         return 0.0
-    inter = len(qs & ts)
+    inter = sum(1 for t in qs if t in ts)
     return inter / (len(qs) ** 0.5 * len(ts) ** 0.5)
 
+def _keyword_overlap(q: str, t: str) -> float:
+    return _overlap(_tokens(q), _tokens(t))
+
+def _keyword_scores(query: str, articles: List[Dict], texts: List[str]) -> List[float]:
+    """
+    Keyword overlap per article. Articles indexed in ARTICLE_INDEX from the same text reuse
+    its stored term sets; the rest (e.g. SerpAPI results) are tokenized here.
+    """
+    qs = _tokens(query)
+    out = []
+    for a, t in zip(articles, texts):
+        terms = ARTICLE_INDEX.doc_terms(normalize_url(a.get("link") or ""), article_text(a))
+        out.append(_overlap(qs, terms if terms is not None else _tokens(t)))
+    return out
+
 # ---------- Date helpers ----------
 def parse_iso(s: str | None) -> datetime | None:
     if not s:
@@ -65,10 +76,67 @@ def recency_factor(published_at_iso: str | None, half_life_hours: float = 72.0)
     age_h = max(0.0, (datetime.now(timezone.utc) - dt).total_seconds() / 3600.0)
     return 0.5 ** (age_h / half_life_hours)
 
+# ---------- Vectorized scoring (NumPy) ----------
+def _cosine_many(q_emb: List[float], a_embs: List[List[float]]):
+    """Cosine of q against every row: one float32 matrix-vector product. Bad/empty rows score 0."""
+    out = np.zeros(len(a_embs), dtype=np.float64)
+    d = len(q_emb) if q_emb else 0
+    rows = [i for i, e in enumerate(a_embs) if e and len(e) == d] if d else []
+    if not rows:
+        return out
+    M = np.asarray([a_embs[i] for i in rows], dtype=np.float32)  # contiguous (n, d)
+    q = np.asarray(q_emb, dtype=np.float32)
+    qn = float(q @ q)
+    if qn <= 0:
+        return out
+    norms = np.einsum("ij,ij->i", M, M)
+    dots = M @ q
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[rows] = np.where(norms > 0, dots / np.sqrt(norms * qn), 0.0)
+    return out
+
+def _recency_many(items: List[Dict], half_life_hours: float = 72.0):
+    """Array version of recency_factor (0.8 for missing/unparseable dates)."""
+    now = datetime.now(timezone.utc)
+    ages = np.full(len(items), np.nan)
+    for i, a in enumerate(items):
+        dt = parse_iso(a.get("published_at"))
+        if dt:
+            ages[i] = (now - dt).total_seconds() / 3600.0
+    return np.where(np.isnan(ages), 0.8, 0.5 ** (np.maximum(ages, 0.0) / half_life_hours))
+
+def _top_k_indices(scores, k: int | None):
+    """
+    Indices of the k best scores, ordered like a stable descending sort
+    (ties keep input order). Partial selection first, then sorts only the survivors.
+    """
+    n = len(scores)
+    if k is None or k <= 0 or k >= n:
+        cand = np.arange(n)
+    else:
+        kth = np.partition(scores, n - k)[n - k]
+        cand = np.flatnonzero(scores >= kth)  # keeps every tie at the boundary
+    order = cand[np.lexsort((cand, -scores[cand]))]
+    return order[:k] if k and k > 0 else order
+
+def _rank_vectorized(items, q_emb, a_embs, kw_scores, use_embeddings: bool, top_k: int | None) -> List[Dict]:
+    kw = np.asarray(kw_scores, dtype=np.float64)
+    rec = _recency_many(items)
+    if use_embeddings:
+        score = 0.7 * _cosine_many(q_emb, a_embs) + 0.2 * rec + 0.1 * kw
+    else:
+        score = 0.7 * kw + 0.3 * rec
+    out = []
+    for i in _top_k_indices(np.round(score, 6), top_k):
+        b = items[i].copy()
+        b["_score"] = round(float(score[i]), 6)
+        out.append(b)
+    return out
+
 # ---------- Public API ----------
-def rank_articles(query: str, articles: List[Dict], use_embeddings: bool = True) -> List[Dict]:
+def rank_articles(query: str, articles: List[Dict], use_embeddings: bool = True, top_k: int | None = None) -> List[Dict]:
     """
-    Returns a re-ordered copy of articles.
+    Returns a re-ordered copy of articles (only the best `top_k` if given).
     Score = 0.7 * semantic + 0.2 * recency + 0.1 * keyword_overlap
     Falls back to keyword overlap if embeddings unavailable.
     """
@@ -80,18 +148,21 @@ def rank_articles(query: str, articles: List[Dict], use_embeddings: bool = True)
         texts.append(f"{title}\n\n{snippet}".strip()[:4000])
         items.append(a)
 
-    semantic_scores: List[float] = [0.0] * len(items)
+    q_emb: List[float] = []
+    a_embs: List[List[float]] = []
     if use_embeddings:
         try:
-            q_emb = _embed_ollama([query])[0]
-            a_embs = _embed_ollama(texts)
-            semantic_scores = [_cosine(q_emb, e) for e in a_embs]
+            embs = _embed_ollama([query] + texts)  # one batched round-trip for query + articles
+            q_emb, a_embs = embs[0], embs[1:]
         except Exception:
             # silently fall back
-            semantic_scores = [0.0] * len(items)
             use_embeddings = False
 
-    kw_scores = [_keyword_overlap(query, t) for t in texts]
+    kw_scores = _keyword_scores(query, items, texts)
+    if np is not None:
+        return _rank_vectorized(items, q_emb, a_embs, kw_scores, use_embeddings, top_k)
+
+    semantic_scores = [_cosine(q_emb, e) for e in a_embs] if use_embeddings else [0.0] * len(items)
     recency = [recency_factor(a.get("published_at")) for a in items]
 
     out = []
@@ -105,4 +176,4 @@ def rank_articles(query: str, articles: List[Dict], use_embeddings: bool = True)
         out.append(b)
 
     out.sort(key=lambda x: x["_score"], reverse=True)
-    return out
+    return out[:top_k] if top_k and top_k > 0 else out
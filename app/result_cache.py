@@ -0,0 +1,92 @@
+# app/result_cache.py
+"""
+Small TTL cache with stale-while-revalidate, bounded by entry count and approximate bytes.
+
+State per lookup:
+  fresh  -> age < ttl                 : serve
+  stale  -> ttl <= age < ttl + stale  : serve, and let exactly one caller refresh in the background
+  miss   -> absent or older than that : caller computes inline
+"""
+from __future__ import annotations
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+def _approx_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except Exception:
+        return 1024
+
+class ResultCache:
+    def __init__(self, ttl: float, stale: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._refreshing: set = set()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0}
+
+    def lookup(self, key: Hashable) -> Tuple[Any, str]:
+        """Returns (value, "fresh" | "stale" | "miss")."""
+        now = time.time()
+        with self._lock:
+            e = self._data.get(key)
+            if e is not None:
+                age = now - e["at"]
+                if age < self.ttl:
+                    self._data.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return e["value"], "fresh"
+                if age < self.ttl + self.stale:
+                    self._data.move_to_end(key)
+                    self._stats["stale_hits"] += 1
+                    return e["value"], "stale"
+                self._drop_locked(key)
+            self._stats["misses"] += 1
+            return None, "miss"
+
+    def claim_refresh(self, key: Hashable) -> bool:
+        """True if the caller should run the (single) background refresh for key."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._stats["refreshes"] += 1
+            return True
+
+    def release_refresh(self, key: Hashable) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = _approx_size(value)
+        with self._lock:
+            self._refreshing.discard(key)
+            if size > self.max_bytes:
+                return
+            if key in self._data:
+                self._drop_locked(key)
+            self._data[key] = {"value": value, "at": time.time(), "size": size}
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop_locked(next(iter(self._data)))
+                self._stats["evictions"] += 1
+
+    def _drop_locked(self, key: Hashable) -> None:
+        e = self._data.pop(key)
+        self._bytes -= e["size"]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._data), "bytes": self._bytes}
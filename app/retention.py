@@ -0,0 +1,42 @@
+# app/retention.py
+"""
+Vector store retention: on a schedule, evict article chunks older than VECTOR_MAX_AGE_DAYS,
+cap the shared collection at VECTOR_MAX_CHUNKS and compact it after large deletions.
+
+Run one pass by hand with:  python -m app.retention [--max-age-days N] [--max-chunks N] [--compact]
+"""
+from __future__ import annotations
+import argparse
+import json
+from typing import Any, Dict
+
+import config
+from .background import BackgroundWorker
+
+def retention_once(**kwargs: Any) -> Dict[str, Any]:
+    """One eviction (+ optional compaction) pass; see vector_store.apply_retention for kwargs."""
+    from . import vector_store  # chromadb is heavy; only load it when a pass actually runs
+    return vector_store.apply_retention(**kwargs)
+
+# the first pass runs one interval after startup
+_WORKER = BackgroundWorker("vector-retention", lambda: retention_once(), config.VECTOR_RETENTION_INTERVAL,
+                           run_first=False)
+
+def start_retention_worker(interval: float | None = None):
+    """Start the retention thread (idempotent). The first pass runs one interval after startup."""
+    return _WORKER.start(interval)
+
+def stop_retention_worker(timeout: float = 5.0) -> None:
+    _WORKER.stop(timeout)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evict old chunks from the vector store and compact it.")
+    parser.add_argument("--max-age-days", type=float, default=config.VECTOR_MAX_AGE_DAYS)
+    parser.add_argument("--max-chunks", type=int, default=config.VECTOR_MAX_CHUNKS)
+    parser.add_argument("--compact", action="store_true", help="always rebuild the index after evicting")
+    args = parser.parse_args()
+    print(json.dumps(retention_once(
+        max_age_seconds=args.max_age_days * 86400,
+        max_chunks=args.max_chunks,
+        compact=True if args.compact else None,
+    ), indent=2))
@@ -0,0 +1,161 @@
+# app/search_index.py
+"""
+Incremental BM25 inverted index over article title + snippet.
+
+Documents are keyed by normalized link. Postings are added as feed entries
+arrive (news_fetcher / ingest) and evicted once a document hasn't been seen
+for a while, so the index tracks what the feeds currently carry.
+The ranker reuses the stored per-document term sets for its keyword score.
+"""
+from __future__ import annotations
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Unicode words, so "Grèce", "Élection", "Straße" stay whole; combining marks (e.g. the
+# dot casefold leaves on "İ", or decomposed accents) belong to the word they sit on.
+WORD_RE = re.compile(r"[\w\u0300-\u036f]+")
+
+def tokenize(text: str) -> List[str]:
+    """NFC-normalized, casefolded word tokens longer than 2 chars (same rule as ranker keyword score)."""
+    t = unicodedata.normalize("NFC", text or "").casefold()
+    return [m.group(0) for m in WORD_RE.finditer(t) if len(m.group(0)) > 2]
+
+class BM25Index:
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}        # term -> {doc_id: tf}
+        self._docs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # oldest seen first
+        self._doc_len: Dict[str, int] = {}                      # flat copy for the scoring loop
+        self._total_len = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ---- mutation ----
+    def add(self, doc_id: str, text: str, article: Dict[str, Any] | None = None,
+            region: str | None = None, now: float | None = None) -> bool:
+        """Index or refresh a document. Returns True if postings were (re)written."""
+        now = time.time() if now is None else now
+        with self._lock:
+            doc = self._docs.get(doc_id)
+            if doc is not None and doc["text"] == text:
+                doc["seen_at"] = now
+                if region:
+                    doc["regions"].add(region)
+                if article is not None:
+                    doc["article"] = article
+                self._docs.move_to_end(doc_id)
+                return False
+            regions = set(doc["regions"]) if doc is not None else set()
+            if doc is not None:
+                self._remove_locked(doc_id)
+            tf = Counter(tokenize(text))
+            length = sum(tf.values())
+            for term, n in tf.items():
+                self._postings.setdefault(term, {})[doc_id] = n
+            if region:
+                regions.add(region)
+            self._docs[doc_id] = {
+                "text": text, "tf": tf, "len": length, "article": article,
+                "regions": regions, "seen_at": now,
+            }
+            self._doc_len[doc_id] = length
+            self._total_len += length
+            return True
+
+    def remove(self, doc_id: str) -> bool:
+        with self._lock:
+            if doc_id not in self._docs:
+                return False
+            self._remove_locked(doc_id)
+            return True
+
+    def _remove_locked(self, doc_id: str) -> None:
+        doc = self._docs.pop(doc_id)
+        del self._doc_len[doc_id]
+        for term in doc["tf"]:
+            plist = self._postings.get(term)
+            if plist is not None:
+                plist.pop(doc_id, None)
+                if not plist:
+                    del self._postings[term]
+        self._total_len -= doc["len"]
+
+    def evict_older_than(self, max_age_seconds: float, now: float | None = None) -> int:
+        """Drop documents not seen within max_age_seconds. O(evicted) thanks to seen-order."""
+        cutoff = (time.time() if now is None else now) - max_age_seconds
+        n = 0
+        with self._lock:
+            while self._docs:
+                doc_id, doc = next(iter(self._docs.items()))
+                if doc["seen_at"] >= cutoff:
+                    break
+                self._remove_locked(doc_id)
+                n += 1
+        return n
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self._doc_len.clear()
+            self._total_len = 0
+
+    # ---- lookup ----
+    def doc_terms(self, doc_id: str, text: str | None = None):
+        """
+        Term -> frequency mapping of an indexed document, or None. With `text`, only if the
+        document was indexed from exactly that text (another source may carry the same URL
+        with a different title/snippet).
+        """
+        doc = self._docs.get(doc_id)
+        if doc is None or (text is not None and doc["text"] != text):
+            return None
+        return doc["tf"]
+
+    def search(self, query: str, k: int = 50, regions: Iterable[str] | None = None) -> List[Tuple[str, float, Dict[str, Any] | None]]:
+        """Top-k (doc_id, bm25_score, article) for the query terms (OR semantics)."""
+        terms = set(tokenize(query))
+        region_set = set(regions) if regions is not None else None
+        with self._lock:
+            n_docs = len(self._docs)
+            if not terms or not n_docs:
+                return []
+            avgdl = self._total_len / n_docs or 1.0
+            k1, b = self.k1, self.b
+            c0, c1 = k1 * (1 - b), k1 * b / avgdl
+            doc_len = self._doc_len
+            scores: Dict[str, float] = {}
+            get = scores.get
+            for term in terms:
+                plist = self._postings.get(term)
+                if not plist:
+                    continue
+                df = len(plist)
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                w = idf * (k1 + 1)
+                for doc_id, tf in plist.items():
+                    scores[doc_id] = get(doc_id, 0.0) + w * tf / (tf + c0 + c1 * doc_len[doc_id])
+            if region_set is not None:
+                scores = {d: s for d, s in scores.items() if self._docs[d]["regions"] & region_set}
+            top = heapq.nlargest(k, scores.items(), key=lambda x: x[1])
+            return [(d, s, self._docs[d]["article"]) for d, s in top]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"docs": len(self._docs), "terms": len(self._postings), "total_len": self._total_len}
+
+# Process-wide index shared by news_fetcher, ingest and ranker.
+ARTICLE_INDEX = BM25Index()
+
+def article_text(article: Dict[str, Any]) -> str:
+    """Indexed text for an article dict (title + snippet, as the ranker sees it)."""
+    return f"{article.get('title') or ''}\n\n{article.get('snippet') or ''}".strip()
@@ -0,0 +1,127 @@
+# app/sqlite_lru.py
+"""
+Two-tier LRU shared by the embedding, full-text and LLM caches.
+
+An in-memory OrderedDict (bounded by mem_limit, counted with _mem_cost: entries by
+default, bytes where a subclass says so) sits in front of a SQLite table whose blob
+column is bounded by max_bytes. Each row is charged len(blob) + ROW_OVERHEAD (key, other
+columns, index entry), so rows with empty blobs (negative entries) still count. Both tiers evict least-recently-used entries first; the
+file is trimmed to 90% of max_bytes so a full cache doesn't evict on every put.
+
+Subclasses set TABLE, COLUMNS (DDL after the key) and BLOB, add their own get/put on
+top of the _mem_* / _disk_* helpers, and always hold self._lock while using them.
+"""
+from __future__ import annotations
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+class SQLiteLRU:
+    TABLE = ""
+    COLUMNS = ""        # e.g. "body BLOB NOT NULL, used REAL NOT NULL"; must include BLOB and `used`
+    BLOB = "body"
+    EVICT_BATCH = 256
+    ROW_OVERHEAD = 256  # bytes charged per row on top of its blob
+
+    def __init__(self, path: str | None, mem_limit: int, max_bytes: int):
+        self.mem_limit = mem_limit
+        self.max_bytes = max_bytes
+        self._mem: "OrderedDict[str, Any]" = OrderedDict()
+        self._mem_used = 0
+        self._lock = threading.RLock()
+        self._stats: Dict[str, Any] = {"mem_hits": 0, "disk_hits": 0, "misses": 0, "evicted": 0}
+        self._db: sqlite3.Connection | None = None
+        self._bytes = 0
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} (k TEXT PRIMARY KEY, {self.COLUMNS})")
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS {self.TABLE}_used ON {self.TABLE}(used)")
+            self._bytes = self._db.execute(
+                f"SELECT COALESCE(SUM(LENGTH({self.BLOB}) + ?), 0) FROM {self.TABLE}", (self.ROW_OVERHEAD,)
+            ).fetchone()[0]
+
+    # ---- memory tier ----
+    def _mem_cost(self, entry: Any) -> int:
+        return 1
+
+    def _mem_get(self, k: str) -> Any:
+        e = self._mem.get(k)
+        if e is not None:
+            self._mem.move_to_end(k)
+        return e
+
+    def _mem_put(self, k: str, entry: Any) -> None:
+        self._mem_drop(k)
+        self._mem[k] = entry
+        self._mem_used += self._mem_cost(entry)
+        while self._mem_used > self.mem_limit and self._mem:
+            self._mem_used -= self._mem_cost(self._mem.popitem(last=False)[1])
+
+    def _mem_drop(self, k: str) -> None:
+        old = self._mem.pop(k, None)
+        if old is not None:
+            self._mem_used -= self._mem_cost(old)
+
+    # ---- disk tier ----
+    def _disk_touch(self, keys: Iterable[str]) -> None:
+        now = time.time()
+        self._db.executemany(f"UPDATE {self.TABLE} SET used = ? WHERE k = ?", [(now, k) for k in keys])
+        self._db.commit()
+
+    def _disk_write(self, rows: List[Tuple[str, bytes, tuple]], columns: str) -> None:
+        """
+        INSERT OR REPLACE rows of (k, blob, other column values) into (k, BLOB, columns...),
+        keep the byte count, then evict and commit.
+        """
+        n_cols = 2 + (columns.count(",") + 1 if columns else 0)
+        sql = (f"INSERT OR REPLACE INTO {self.TABLE} (k, {self.BLOB}{', ' + columns if columns else ''})"
+               f" VALUES ({', '.join('?' * n_cols)})")
+        for k, blob, rest in rows:
+            old = self._db.execute(f"SELECT LENGTH({self.BLOB}) FROM {self.TABLE} WHERE k = ?", (k,)).fetchone()
+            self._bytes += len(blob) + self.ROW_OVERHEAD - (old[0] + self.ROW_OVERHEAD if old else 0)
+            self._db.execute(sql, (k, blob, *rest))
+        self._evict_locked()
+        self._db.commit()
+
+    def _evict_locked(self) -> None:
+        if self._bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        while self._bytes > target:
+            rows = self._db.execute(
+                f"SELECT k, LENGTH({self.BLOB}) FROM {self.TABLE} ORDER BY used LIMIT ?", (self.EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            doomed = []
+            for k, n in rows:
+                doomed.append((k,))
+                self._bytes -= n + self.ROW_OVERHEAD
+                self._mem_drop(k)
+                self._stats["evicted"] += 1
+                if self._bytes <= target:
+                    break
+            self._db.executemany(f"DELETE FROM {self.TABLE} WHERE k = ?", doomed)
+
+    # ---- public ----
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._mem_used = 0
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self.TABLE}")
+                self._db.commit()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+            lookups = s["mem_hits"] + s["disk_hits"] + s["misses"]
+            s["hit_rate"] = round((s["mem_hits"] + s["disk_hits"]) / lookups, 4) if lookups else 0.0
+            s["mem_items"] = len(self._mem)
+            s["bytes_used"] = self._bytes
+            return s
@@ -0,0 +1,115 @@
+# app/summary_jobs.py
+"""
+Background summary jobs: /get_news hands the RAG summary to a bounded worker pool and returns
+a job id; clients poll /summary/{job_id}.
+
+- Identical in-flight or finished jobs (same key) are shared instead of recomputed.
+- Finished jobs are kept for SUMMARY_JOB_TTL seconds, failed ones are retried on next submit.
+- At most SUMMARY_MAX_JOBS are tracked; expired jobs go first, then the oldest finished ones.
+"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import config
+
+PENDING, RUNNING, DONE, ERROR = "pending", "running", "done", "error"
+
+_POOL = ThreadPoolExecutor(max_workers=max(1, config.SUMMARY_WORKERS), thread_name_prefix="summary")
+_JOBS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_LOCK = threading.Lock()
+_STATS = {"submitted": 0, "deduped": 0, "done": 0, "errors": 0, "rejected": 0}
+
+def job_key(kind: str, user_id: int, query: str, prefs: str, articles: List[Dict[str, Any]],
+            **params: Any) -> str:
+    """
+    Same kind of job, user, query, prefs, article set and params -> same job (article order
+    does not matter). The user is part of the key: RAG retrieval only searches that user's
+    own articles, so a summary must never be shared across users.
+    """
+    links = sorted({(a.get("link") or a.get("url") or "") for a in articles})
+    raw = json.dumps([kind, int(user_id or 0), query.strip().lower(), prefs.strip(), links, params],
+                     ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+def _expired(job: Dict[str, Any], now: float) -> bool:
+    return job["finished_at"] is not None and now - job["finished_at"] > config.SUMMARY_JOB_TTL
+
+def _prune_locked(now: float) -> None:
+    for jid in [jid for jid, j in _JOBS.items() if _expired(j, now)]:
+        del _JOBS[jid]
+    while len(_JOBS) > config.SUMMARY_MAX_JOBS:
+        finished = next((jid for jid, j in _JOBS.items() if j["finished_at"] is not None), None)
+        if finished is None:
+            break  # everything left is queued or running
+        del _JOBS[finished]
+
+def _run(job: Dict[str, Any], fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+    job["status"] = RUNNING
+    job["started_at"] = time.time()
+    try:
+        job["result"] = fn(*args, **kwargs)
+        job["status"] = DONE
+        _STATS["done"] += 1
+    except Exception as e:
+        job["error"] = str(e) or e.__class__.__name__
+        job["status"] = ERROR
+        _STATS["errors"] += 1
+    finally:
+        job["finished_at"] = time.time()
+        job["event"].set()
+
+def submit(key: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Optional[str]:
+    """
+    Queue fn(*args, **kwargs) under key and return the job id, or the id of an existing live
+    job with the same key. Returns None when SUMMARY_MAX_JOBS jobs are already queued/running.
+    """
+    now = time.time()
+    with _LOCK:
+        _prune_locked(now)
+        job = _JOBS.get(key)
+        if job is not None and job["status"] != ERROR:
+            _STATS["deduped"] += 1
+            return key
+        if len(_JOBS) >= config.SUMMARY_MAX_JOBS:
+            _STATS["rejected"] += 1
+            return None
+        job = {
+            "id": key, "status": PENDING, "result": None, "error": None,
+            "created_at": now, "started_at": None, "finished_at": None,
+            "event": threading.Event(),
+        }
+        _JOBS[key] = job
+        _STATS["submitted"] += 1
+    _POOL.submit(_run, job, fn, args, kwargs)
+    return key
+
+def get(job_id: str) -> Optional[Dict[str, Any]]:
+    """Public view of a job: {id, status, result, error, created_at, finished_at} or None."""
+    with _LOCK:
+        job = _JOBS.get(job_id)
+        if job is None or _expired(job, time.time()):
+            return None
+    return {k: v for k, v in job.items() if k != "event"}
+
+async def wait_async(job_id: str, timeout: float, interval: float = 0.25) -> Optional[Dict[str, Any]]:
+    """Long-poll from the event loop without parking a thread on the job."""
+    deadline = time.monotonic() + max(0.0, timeout)
+    job = get(job_id)
+    while job is not None and job["status"] in (PENDING, RUNNING) and time.monotonic() < deadline:
+        await asyncio.sleep(interval)
+        job = get(job_id)
+    return job
+
+def stats() -> Dict[str, Any]:
+    with _LOCK:
+        by_status: Dict[str, int] = {}
+        for j in _JOBS.values():
+            by_status[j["status"]] = by_status.get(j["status"], 0) + 1
+    return {**_STATS, "jobs": by_status, "workers": config.SUMMARY_WORKERS}
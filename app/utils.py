@@ -0,0 +1,13 @@
+# app/utils.py
+from __future__ import annotations
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+def normalize_url(url: str) -> str:
+    try:
+        u = urlparse(url)
+        # strip tracking query params
+        q = [(k, v) for (k, v) in parse_qsl(u.query, keep_blank_values=False)
+             if not k.lower().startswith(("utm_", "fbclid", "gclid", "mc_cid", "mc_eid"))]
+        return urlunparse((u.scheme, u.netloc.lower(), u.path, "", urlencode(q), ""))
+    except Exception:
+        return url
@@ -1,36 +1,134 @@
 # app/vector_store.py
 from typing import List, Dict, Any, Optional
-import uuid
-import chromadb
-from chromadb.config import Settings
-from app.embeddings import embed_text
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from app.embeddings import embed_text, embed_texts
+from app.utils import normalize_url
+from database.db import SessionLocal
+from database import crud
 import config
 from pathlib import Path
 
 # ---- schema (metadata keys we store per chunk)
-META_USER_ID  = "user_id"
 META_TITLE    = "title"
 META_LINK     = "link"
 META_SNIPPET  = "snippet"
 META_CHUNK_IX = "chunk_ix"
+META_LINK_KEY = "link_key"          # normalized link (tracking params stripped)
+META_VERSION  = "content_version"   # hash of all chunks of the article at index time
+META_INGESTED_AT = "ingested_at"    # unix seconds when the chunk was embedded (retention clock)
 
 # ---- client & collection helpers
-Path(config.VECTOR_DB_DIR).mkdir(parents=True, exist_ok=True)
+# chromadb is imported and the PersistentClient opened on first use (or by app.warmup),
+# not at import time.
+_client = None
+_CLIENT_LOCK = threading.Lock()
 
-_client = chromadb.PersistentClient(
-    path=config.VECTOR_DB_DIR,
-    settings=Settings(allow_reset=False)
-)
+def _get_client():
+    global _client
+    if _client is None:
+        with _CLIENT_LOCK:
+            if _client is None:
+                import chromadb
+                from chromadb.config import Settings
+                Path(config.VECTOR_DB_DIR).mkdir(parents=True, exist_ok=True)
+                _client = chromadb.PersistentClient(
+                    path=config.VECTOR_DB_DIR,
+                    settings=Settings(allow_reset=False)
+                )
+    return _client
 
-def _collection_name(user_id: int) -> str:
-    return f"{config.CHROMA_COLLECTION_PREFIX}{user_id}"
+# One article-chunk collection shared by every user: a story searched by 1,000 users is
+# embedded and stored once. Per-user relevance is the user_articles table (user -> links).
+_COLLECTIONS: Dict[str, Any] = {}
+_COLLECTIONS_LOCK = threading.Lock()
+_WRITE_LOCK = threading.RLock()   # ingestion vs. retention/compaction
+_RECOVERED: set = set()           # collection names already checked for an interrupted compaction
 
-def get_or_create_collection(user_id: int):
-    name = _collection_name(user_id)
+def _collection_name() -> str:
+    return f"{config.CHROMA_COLLECTION_PREFIX}articles"
+
+def _recover_compaction(name: str) -> None:
+    """
+    Clean up after a compaction that was interrupted. If the original collection is
+    missing, the `_compact` copy was fully written and is the only copy: rename it back.
+    If both exist, the copy is partial: drop it.
+    """
+    client = _get_client()
+    tmp_name = f"{name}_compact"
+    try:
+        tmp = client.get_collection(tmp_name)
+    except Exception:
+        return  # nothing left over
+    try:
+        client.get_collection(name)
+    except Exception:
+        tmp.modify(name=name)
+        return
+    client.delete_collection(tmp_name)
+
+def _is_missing_collection(e: Exception) -> bool:
+    """Chroma's error for a handle whose collection was deleted (or swapped by compaction)."""
+    return "does not exist" in str(e)
+
+def get_or_create_collection():
+    name = _collection_name()
+    col = _COLLECTIONS.get(name)
+    if col is None:
+        if name not in _RECOVERED:
+            # once per process, and never while a compaction is filling `<name>_compact`;
+            # before get_or_create, which would add an empty original
+            with _WRITE_LOCK:
+                if name not in _RECOVERED:
+                    _recover_compaction(name)
+                    _RECOVERED.add(name)
+        with _COLLECTIONS_LOCK:
+            col = _COLLECTIONS.get(name)
+            if col is None:
+                col = _get_client().get_or_create_collection(name=name, metadata={"hnsw:space": "cosine"})
+                _COLLECTIONS[name] = col
+    return col
+
+def _record_user_links(user_id: int, link_keys: List[str]) -> None:
+    db = SessionLocal()
     try:
-        return _client.get_collection(name=name)
-    except:
-        return _client.create_collection(name=name, metadata={"hnsw:space": "cosine"})
+        crud.record_user_links(db, user_id, link_keys)
+    finally:
+        db.close()
+
+def _user_link_keys(user_id: int) -> List[str]:
+    db = SessionLocal()
+    try:
+        return crud.get_user_link_keys(db, user_id, limit=config.VECTOR_USER_LINKS_MAX)
+    finally:
+        db.close()
+
+# ---- content addressing
+def _sha(s: str) -> str:
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+def content_version(chunks: List[str]) -> str:
+    return _sha("\0".join(chunks))[:32]
+
+def chunk_id(link: str, ix: int, chunk: str) -> str:
+    """Deterministic id: same link + same chunk content -> same id across requests."""
+    return f"{_sha(normalize_url(link))[:16]}-{ix}-{_sha(chunk)[:16]}"
+
+def _indexed_versions(col, ids: List[str]) -> Dict[str, Optional[str]]:
+    """{chunk_id: content_version} for the ids already in the collection (one round-trip)."""
+    out: Dict[str, Optional[str]] = {}
+    for i in range(0, len(ids), 1000):
+        try:
+            res = col.get(ids=ids[i:i + 1000], include=["metadatas"])
+        except Exception:
+            continue
+        for cid, meta in zip(res.get("ids") or [], res.get("metadatas") or []):
+            out[cid] = (meta or {}).get(META_VERSION)
+    return out
 
 # ---- public API: add chunks and query
 def add_article_chunks(
@@ -40,42 +138,90 @@ def add_article_chunks(
     chunks: List[str],
     snippet: str = ""
 ) -> int:
-    """Embed and upsert chunks for a single article. Returns number stored."""
-    if not chunks:
-        return 0
-    col = get_or_create_collection(user_id)
-
-    ids, docs, metas, embs = [], [], [], []
-    for j, chunk in enumerate(chunks):
-        vec = embed_text(chunk)
-        ids.append(str(uuid.uuid4()))
-        docs.append(chunk)
-        metas.append({
-            META_USER_ID: user_id,
-            META_TITLE: title,
-            META_LINK: link,
-            META_SNIPPET: snippet,
-            META_CHUNK_IX: j,
+    """Embed and upsert chunks for a single article. Returns number embedded+stored."""
+    return add_articles_chunks(user_id, [{"title": title, "link": link, "chunks": chunks, "snippet": snippet}])
+
+def add_articles_chunks(user_id: int, articles: List[Dict[str, Any]]) -> int:
+    """
+    Bulk ingestion into the shared collection: articles = [{"title", "link", "chunks", "snippet"}, ...].
+    Every article is recorded as seen by user_id (that is what query() filters on).
+    Articles already indexed at the same content version are skipped without embedding;
+    chunks of all remaining articles are embedded together in large batches, then
+    upserted, and chunks from older versions of those articles are dropped.
+    Returns number of chunks embedded+stored.
+    """
+    plans, seen = [], set()
+    for a in articles:
+        chunks = a.get("chunks") or []
+        link = a.get("link") or ""
+        if not chunks or normalize_url(link) in seen:  # same article twice -> duplicate ids
+            continue
+        seen.add(normalize_url(link))
+        plans.append({
+            **a,
+            "link": link,
+            "link_key": normalize_url(link),
+            "version": content_version(chunks),
+            "ids": [chunk_id(link, j, c) for j, c in enumerate(chunks)],
         })
-        embs.append(vec)
+    if not plans:
+        return 0
+    _record_user_links(user_id, [p["link_key"] for p in plans])
 
-        if len(ids) >= 64:  # batch flush
-            col.add(ids=ids, documents=docs, metadatas=metas, embeddings=embs)
-            ids, docs, metas, embs = [], [], [], []
+    with _WRITE_LOCK:
+        return _index_plans(get_or_create_collection(), plans)
 
-    if ids:
-        col.add(ids=ids, documents=docs, metadatas=metas, embeddings=embs)
-    return len(chunks)
+def _index_plans(col, plans: List[Dict[str, Any]]) -> int:
+    existing = _indexed_versions(col, [cid for p in plans for cid in p["ids"]])
+    todo = [p for p in plans if not all(existing.get(cid, "") == p["version"] for cid in p["ids"])]
+    if not todo:
+        return 0
+
+    now = int(time.time())
+    ids, docs, metas = [], [], []
+    for p in todo:
+        for j, chunk in enumerate(p["chunks"]):
+            ids.append(p["ids"][j])
+            docs.append(chunk)
+            metas.append({
+                META_TITLE: p.get("title") or "",
+                META_LINK: p["link"],
+                META_LINK_KEY: p["link_key"],
+                META_SNIPPET: p.get("snippet") or "",
+                META_CHUNK_IX: j,
+                META_VERSION: p["version"],
+                META_INGESTED_AT: now,
+            })
+    embs = embed_texts(docs)
+
+    for i in range(0, len(ids), 256):  # batch flush
+        col.upsert(ids=ids[i:i + 256], documents=docs[i:i + 256],
+                   metadatas=metas[i:i + 256], embeddings=embs[i:i + 256])
+    for p in todo:
+        # drop chunks left over from an older version of this article
+        col.delete(where={"$and": [{META_LINK_KEY: p["link_key"]}, {META_VERSION: {"$ne": p["version"]}}]})
+    return len(ids)
 
 def query(
     user_id: int,
     query_text: str,
     k: int = 8
 ) -> List[Dict[str, Any]]:
-    """Return top-k hits as {text, title, link, snippet} dicts for this user."""
+    """Return top-k hits as {text, title, link, snippet} dicts among the articles this user has seen."""
+    keys = _user_link_keys(user_id)
+    if not keys:
+        return []
     qvec = embed_text(query_text)
-    col  = get_or_create_collection(user_id)
-    res  = col.query(query_embeddings=[qvec], n_results=k, where={META_USER_ID: user_id})
+    where = {META_LINK_KEY: keys[0]} if len(keys) == 1 else {META_LINK_KEY: {"$in": keys}}
+    try:
+        res = get_or_create_collection().query(query_embeddings=[qvec], n_results=k, where=where)
+    except Exception as e:
+        if not _is_missing_collection(e):
+            raise
+        # handle went stale (collection swapped by compaction) -> fetch it again once
+        with _COLLECTIONS_LOCK:
+            _COLLECTIONS.clear()
+        res = get_or_create_collection().query(query_embeddings=[qvec], n_results=k, where=where)
     out: List[Dict[str, Any]] = []
     docs = res.get("documents", [[]])[0]
     metas = res.get("metadatas", [[]])[0]
@@ -88,3 +234,175 @@ def query(
             "snippet":meta.get(META_SNIPPET, ""),
         })
     return out
+
+# ---- retention: TTL eviction, size cap, compaction
+_RETENTION_STATS: Dict[str, Any] = {
+    "runs": 0, "evicted_expired": 0, "evicted_cap": 0,
+    "compactions": 0, "bytes_reclaimed": 0, "last_run": None,
+}
+
+def _dir_bytes(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total
+
+def _scan_ingest_times(col, page: int = 5000) -> Dict[str, Optional[int]]:
+    """{chunk_id: ingested_at or None} for every chunk in the collection."""
+    out: Dict[str, Optional[int]] = {}
+    offset = 0
+    while True:
+        res = col.get(limit=page, offset=offset, include=["metadatas"])
+        ids = res.get("ids") or []
+        if not ids:
+            break
+        for cid, meta in zip(ids, res.get("metadatas") or []):
+            out[cid] = (meta or {}).get(META_INGESTED_AT)
+        offset += len(ids)
+    return out
+
+def _delete_ids(col, ids: List[str]) -> None:
+    for i in range(0, len(ids), 1000):
+        col.delete(ids=ids[i:i + 1000])
+
+def apply_retention(
+    max_age_seconds: Optional[float] = None,
+    max_chunks: Optional[int] = None,
+    compact: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Evict chunks ingested more than max_age_seconds ago, then the oldest chunks beyond
+    max_chunks. Chunks without an ingest time (indexed before retention existed) are
+    stamped with the current time. compact=None compacts when at least
+    VECTOR_COMPACT_FRACTION of the collection was evicted; True/False forces it.
+    """
+    max_age_seconds = config.VECTOR_MAX_AGE_DAYS * 86400 if max_age_seconds is None else max_age_seconds
+    max_chunks = config.VECTOR_MAX_CHUNKS if max_chunks is None else max_chunks
+    started = time.time()
+    with _WRITE_LOCK:
+        col = get_or_create_collection()
+        times = _scan_ingest_times(col)
+        before = len(times)
+
+        now = int(started)
+        unstamped = [cid for cid, ts in times.items() if ts is None]
+        for i in range(0, len(unstamped), 1000):
+            batch = unstamped[i:i + 1000]
+            col.update(ids=batch, metadatas=[{META_INGESTED_AT: now}] * len(batch))
+            for cid in batch:
+                times[cid] = now
+
+        cutoff = started - max_age_seconds if max_age_seconds > 0 else None
+        expired = [cid for cid, ts in times.items() if cutoff is not None and ts < cutoff]
+        _delete_ids(col, expired)
+
+        over_cap: List[str] = []
+        remaining = before - len(expired)
+        if max_chunks > 0 and remaining > max_chunks:
+            expired_set = set(expired)
+            alive = sorted((ts, cid) for cid, ts in times.items() if cid not in expired_set)
+            over_cap = [cid for _, cid in alive[:remaining - max_chunks]]
+            _delete_ids(col, over_cap)
+
+        evicted = len(expired) + len(over_cap)
+        if compact is None:
+            compact = evicted > 0 and evicted >= config.VECTOR_COMPACT_FRACTION * before
+        reclaimed = compact_collection()["bytes_reclaimed"] if compact else 0
+
+    if cutoff is not None:
+        db = SessionLocal()
+        try:
+            crud.delete_user_articles_older_than(db, max_age_seconds / 86400)
+        finally:
+            db.close()
+
+    run = {
+        "chunks_before": before,
+        "chunks_after": before - evicted,
+        "evicted_expired": len(expired),
+        "evicted_cap": len(over_cap),
+        "stamped": len(unstamped),
+        "compacted": bool(compact),
+        "bytes_reclaimed": reclaimed,
+        "seconds": round(time.time() - started, 3),
+    }
+    _RETENTION_STATS["runs"] += 1
+    _RETENTION_STATS["evicted_expired"] += len(expired)
+    _RETENTION_STATS["evicted_cap"] += len(over_cap)
+    _RETENTION_STATS["compactions"] += int(bool(compact))
+    _RETENTION_STATS["bytes_reclaimed"] += reclaimed
+    _RETENTION_STATS["last_run"] = run
+    return run
+
+def _vacuum_sqlite() -> None:
+    """Give free pages of chroma.sqlite3 back to the filesystem."""
+    path = os.path.join(config.VECTOR_DB_DIR, "chroma.sqlite3")
+    if not os.path.exists(path):
+        return
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+def _remove_orphan_segments() -> None:
+    """Chroma leaves the HNSW directory of a deleted collection on disk; drop unreferenced ones."""
+    path = os.path.join(config.VECTOR_DB_DIR, "chroma.sqlite3")
+    if not os.path.exists(path):
+        return
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        live = {row[0] for row in conn.execute("SELECT id FROM segments")}
+    finally:
+        conn.close()
+    for entry in os.scandir(config.VECTOR_DB_DIR):
+        if entry.is_dir() and len(entry.name) == 36 and entry.name.count("-") == 4 and entry.name not in live:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+def compact_collection(page: int = 1000) -> Dict[str, Any]:
+    """
+    Rebuild the shared collection so the HNSW index only holds live chunks: copy everything
+    into a fresh collection, swap it in under the original name, then VACUUM the sqlite
+    store and remove the old index directory. Returns {"chunks", "bytes_reclaimed"}.
+    """
+    with _WRITE_LOCK:
+        name = _collection_name()
+        tmp_name = f"{name}_compact"
+        bytes_before = _dir_bytes(config.VECTOR_DB_DIR)
+        src = get_or_create_collection()
+        _recover_compaction(name)          # a copy left by an earlier failed run in this process
+        dst = _get_client().create_collection(name=tmp_name, metadata={"hnsw:space": "cosine"})
+        copied, offset = 0, 0
+        while True:
+            res = src.get(limit=page, offset=offset, include=["embeddings", "documents", "metadatas"])
+            ids = res.get("ids") or []
+            if not ids:
+                break
+            dst.upsert(ids=ids, embeddings=res["embeddings"],
+                       documents=res["documents"], metadatas=res["metadatas"])
+            copied += len(ids)
+            offset += len(ids)
+
+        with _COLLECTIONS_LOCK:
+            _get_client().delete_collection(name)
+            dst.modify(name=name)
+            _COLLECTIONS.clear()
+
+        try:
+            _vacuum_sqlite()
+            _remove_orphan_segments()
+        except Exception:
+            pass  # space is reclaimed on the next successful compaction
+        reclaimed = max(0, bytes_before - _dir_bytes(config.VECTOR_DB_DIR))
+    return {"chunks": copied, "bytes_reclaimed": reclaimed}
+
+def retention_stats() -> Dict[str, Any]:
+    try:
+        chunks = get_or_create_collection().count()
+    except Exception:
+        chunks = None
+    return {"chunks": chunks, "disk_bytes": _dir_bytes(config.VECTOR_DB_DIR), **_RETENTION_STATS}
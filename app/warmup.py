@@ -0,0 +1,102 @@
+# app/warmup.py
+"""
+Background warm-up: heavy dependencies are imported lazily, so the API starts serving at
+once and this thread loads them (in WARMUP_COMPONENTS order) right after boot instead of
+on the first request that needs them. /ready reports each component's state:
+
+  pending -> loading -> ready | unavailable (optional dependency not installed) | error
+  skipped: not in WARMUP_COMPONENTS, or disabled by config
+
+Warm it by hand (prints the states) with:  python -m app.warmup
+"""
+from __future__ import annotations
+import json
+import time
+from typing import Any, Callable, Dict
+
+import config
+from .background import BackgroundWorker
+
+PENDING, LOADING, READY, UNAVAILABLE, ERROR, SKIPPED = (
+    "pending", "loading", "ready", "unavailable", "error", "skipped"
+)
+
+def _detoxify() -> bool:
+    if not config.SAFETY_ENABLED:
+        return False
+    from .content_safety import load_model
+    return load_model()
+
+def _vector_store() -> bool:
+    from .vector_store import get_or_create_collection  # imports chromadb, opens the PersistentClient
+    get_or_create_collection()
+    return True
+
+def _extractors() -> bool:
+    import trafilatura  # noqa: F401  (rag / content_extractor import it on first use)
+    from langdetect import detect
+    detect("warm up the language profiles")  # profiles load on the first call
+    return True
+
+def _fastembed() -> bool:
+    from .embeddings import load_local_model
+    load_local_model()
+    return True
+
+# name -> loader; a loader returns False when the component is disabled by config
+_LOADERS: Dict[str, Callable[[], bool]] = {
+    "detoxify": _detoxify,
+    "vector_store": _vector_store,
+    "extractors": _extractors,
+    "fastembed": _fastembed,
+}
+
+_STATE: Dict[str, Dict[str, Any]] = {
+    name: {"state": PENDING, "seconds": None, "error": None} for name in _LOADERS
+}
+def _load(name: str) -> None:
+    st = _STATE[name]
+    st["state"] = LOADING
+    t0 = time.time()
+    try:
+        st["state"] = READY if _LOADERS[name]() else SKIPPED
+    except ImportError as e:
+        st["state"], st["error"] = UNAVAILABLE, str(e)
+    except Exception as e:
+        st["state"], st["error"] = ERROR, str(e) or e.__class__.__name__
+    st["seconds"] = round(time.time() - t0, 3)
+
+def warmup_once() -> Dict[str, Any]:
+    """Load every configured component in order (blocking); returns readiness()."""
+    for name in _LOADERS:
+        if name not in config.WARMUP_COMPONENTS:
+            _STATE[name]["state"] = SKIPPED
+    for name in config.WARMUP_COMPONENTS:
+        if _WORKER.stopped():
+            break
+        if name in _LOADERS and _STATE[name]["state"] == PENDING:
+            _load(name)
+    return readiness()
+
+def readiness() -> Dict[str, Any]:
+    """
+    {"ready": bool, "components": {...}}; ready once no component is pending or loading.
+    With WARMUP_ENABLED off components stay pending (they load on first use) and the
+    service counts as ready.
+    """
+    components = {name: dict(st) for name, st in _STATE.items()}
+    ready = not config.WARMUP_ENABLED or all(c["state"] not in (PENDING, LOADING) for c in components.values())
+    return {"ready": ready, "components": components}
+
+_WORKER = BackgroundWorker("warmup", lambda: warmup_once())
+
+def start_warmup():
+    """Start the warm-up thread (idempotent)."""
+    return _WORKER.start()
+
+def stop_warmup(timeout: float = 5.0) -> None:
+    """Stop after the component currently loading (a model load itself cannot be interrupted)."""
+    _WORKER.stop(timeout)
+
+if __name__ == "__main__":
+    print(json.dumps(warmup_once(), indent=2))
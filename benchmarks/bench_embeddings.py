@@ -0,0 +1,44 @@
+# benchmarks/bench_embeddings.py
+"""
+embeddings.embed_ollama_many: batched /api/embed vs the per-text /api/embeddings fallback,
+against a local stub Ollama with a fixed per-request latency.
+
+Run from the repo root:  python -m benchmarks.bench_embeddings [--texts 100 1000] [--latency 0.02]
+"""
+from __future__ import annotations
+import argparse
+import time
+from typing import List
+
+from benchmarks.stubs import ollama_handler, scratch_env, serve
+
+scratch_env()
+
+import config
+from app import embeddings
+
+def _time(base: str, texts: List[str]) -> float:
+    config.OLLAMA_BASE_URL = base
+    embeddings._BATCH_SUPPORTED = None  # probe the server again
+    t0 = time.perf_counter()
+    embeddings.embed_ollama_many(texts)
+    return time.perf_counter() - t0
+
+def bench(sizes: List[int], latency: float) -> None:
+    print(f"{latency * 1000:.0f} ms per request, EMBED_BATCH_SIZE {config.EMBED_BATCH_SIZE}, "
+          f"EMBED_CONCURRENCY {config.EMBED_CONCURRENCY}")
+    with serve(ollama_handler(embed_latency=latency, batch=False)) as old, \
+            serve(ollama_handler(embed_latency=latency, batch=True)) as new:
+        for n in sizes:
+            texts = [f"article {i} about markets" for i in range(n)]
+            per_text = _time(old, texts)
+            batched = _time(new, texts)
+            print(f"  {n:>6} texts  per-text {per_text:7.2f} s  batched {batched:7.3f} s  "
+                  f"({per_text / batched:5.1f}x)", flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched vs per-text embedding benchmark.")
+    parser.add_argument("--texts", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+    bench(args.texts, args.latency)
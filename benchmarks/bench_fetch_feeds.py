@@ -0,0 +1,46 @@
+# benchmarks/bench_fetch_feeds.py
+"""
+news_fetcher.fetch_feeds latency, sequential vs concurrent, against local stub feeds
+with fixed per-feed latency. Concurrent fetching should track the slowest feed (or the
+deadline, with a dead feed in the set), sequential fetching the sum of all feeds.
+
+Run from the repo root:  python -m benchmarks.bench_fetch_feeds [--latencies 0.1 0.2 0.4 0.8] [--deadline 2]
+"""
+from __future__ import annotations
+import argparse
+import time
+from typing import List
+
+from benchmarks.stubs import feed_server_handler, scratch_env, serve
+
+scratch_env()
+
+from app import news_fetcher
+
+def _run(urls: List[str], concurrent: bool, feed_timeout: float, deadline: float):
+    news_fetcher.clear_feed_cache()  # every run goes to the network
+    t0 = time.perf_counter()
+    parsed, missed = news_fetcher.fetch_feeds(urls, concurrent=concurrent,
+                                              feed_timeout=feed_timeout, deadline=deadline)
+    return time.perf_counter() - t0, len(parsed), len(missed)
+
+def bench(latencies: List[float], dead: float, feed_timeout: float, deadline: float) -> None:
+    feeds = {f"feed{i}": lat for i, lat in enumerate(latencies)}
+    feeds["dead"] = dead
+    with serve(feed_server_handler(feeds)) as base:
+        live = [f"{base}/feed{i}" for i in range(len(latencies))]
+        print(f"{len(live)} feeds, latencies {latencies} s: sum {sum(latencies):.2f} s, "
+              f"slowest {max(latencies):.2f} s; feed timeout {feed_timeout} s, deadline {deadline} s")
+        for label, urls in (("live feeds      ", live), ("+ one dead feed ", live + [f"{base}/dead"])):
+            for mode, concurrent in (("sequential", False), ("concurrent", True)):
+                wall, ok, missed = _run(urls, concurrent, feed_timeout, deadline)
+                print(f"  {label} {mode}  {wall:6.2f} s  ({ok} parsed, {missed} missed)", flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent RSS fetch benchmark.")
+    parser.add_argument("--latencies", type=float, nargs="+", default=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6])
+    parser.add_argument("--dead", type=float, default=30.0, help="latency of the dead feed")
+    parser.add_argument("--feed-timeout", type=float, default=3.0)
+    parser.add_argument("--deadline", type=float, default=2.0)
+    args = parser.parse_args()
+    bench(args.latencies, args.dead, args.feed_timeout, args.deadline)
@@ -0,0 +1,102 @@
+# benchmarks/bench_get_news.py
+"""
+/get_news load test: requests/sec and latency percentiles of the async pipeline
+(ASYNC_PIPELINE=true) vs the blocking one, against local stubs.
+
+The app runs in-process under uvicorn. SerpAPI, the region's RSS feeds and Ollama's
+embedding endpoint are local stub servers with fixed latency; result/feed caches,
+article moderation and the RAG summary are off, so every request goes upstream.
+
+Run from the repo root:  python -m benchmarks.bench_get_news [--concurrency 16 64] [--requests 200]
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+from typing import List
+
+from benchmarks.stubs import feed_server_handler, ollama_handler, percentile, reply, scratch_env, serve
+
+scratch_env(RESULT_CACHE_ENABLED="false", RSS_FRESH_SECONDS="0", ARTICLE_MODERATION_ENABLED="false",
+            SUMMARY_JOBS_ENABLED="false", VECTOR_RETENTION_ENABLED="false")
+
+import httpx
+import uvicorn
+
+import config
+from app import main, news_fetcher
+
+def _serpapi_handler(latency: float):
+    def handle(h):
+        time.sleep(latency)
+        results = [{"title": f"Serp story {i} on markets", "link": f"https://serp.example.com/{i}",
+                    "snippet": "Rates and stocks.", "source": "Wire", "date": "2 hours ago"}
+                   for i in range(10)]
+        reply(h, json.dumps({"news_results": results}).encode())
+    return handle
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def _load(url: str, concurrency: int, total: int) -> List[float]:
+    latencies: List[float] = []
+    queue = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        async def worker():
+            for _ in queue:
+                t0 = time.perf_counter()
+                r = await client.get(url, params={"query": "markets", "region": "us"})
+                r.raise_for_status()
+                latencies.append(time.perf_counter() - t0)
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+def bench(concurrencies: List[int], total: int, n_feeds: int, feed_latency: float, serp_latency: float) -> None:
+    main.rag_generate = None  # measure fetch + rank only
+    feeds = {f"feed{i}": feed_latency for i in range(n_feeds)}
+    with serve(feed_server_handler(feeds)) as rss, serve(_serpapi_handler(serp_latency)) as serp, \
+            serve(ollama_handler()) as ollama:
+        news_fetcher.REGION_RSS = {"us": [f"{rss}/{name}" for name in feeds]}
+        news_fetcher.SERPAPI_URL = f"{serp}/search.json"
+        config.SERPAPI_KEY = "bench"
+        config.OLLAMA_BASE_URL = ollama
+
+        port = _free_port()
+        server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+        url = f"http://127.0.0.1:{port}/get_news"
+        print(f"{n_feeds} feeds x {feed_latency * 1000:.0f} ms, SerpAPI {serp_latency * 1000:.0f} ms, "
+              f"{total} requests per run")
+        try:
+            for c in concurrencies:
+                for label, async_mode in (("sync ", False), ("async", True)):
+                    config.ASYNC_PIPELINE = async_mode
+                    asyncio.run(_load(url, c, min(total, 2 * c)))  # warm-up: connections, first-use imports
+                    t0 = time.perf_counter()
+                    lat = asyncio.run(_load(url, c, total))
+                    wall = time.perf_counter() - t0
+                    print(f"  {c:>3} concurrent  {label}  {total / wall:7.1f} req/s  "
+                          f"p50 {percentile(lat, 50) * 1000:7.0f} ms  p99 {percentile(lat, 99) * 1000:7.0f} ms",
+                          flush=True)
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/get_news async vs sync load test.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--feeds", type=int, default=5)
+    parser.add_argument("--feed-latency", type=float, default=0.2)
+    parser.add_argument("--serp-latency", type=float, default=0.3)
+    args = parser.parse_args()
+    bench(args.concurrency, args.requests, args.feeds, args.feed_latency, args.serp_latency)
@@ -0,0 +1,73 @@
+# benchmarks/bench_moderation.py
+"""
+Per-query moderation latency (content_safety.moderate_text): verdict-cache hit vs miss,
+plus the combined blocklist matcher vs one re.search per raw pattern.
+
+Misses use distinct queries, so neither the verdict LRU nor the score cache helps. The
+model is Detoxify when it can be loaded, otherwise a stub with a fixed cost per call
+(--model-ms), so the miss figure then shows the cache's saving rather than real inference.
+
+Run from the repo root:  python -m benchmarks.bench_moderation [--queries 2000] [--model-ms 15]
+"""
+from __future__ import annotations
+import argparse
+import re
+import time
+
+from benchmarks.stubs import scratch_env
+
+scratch_env(SAFETY_ENABLED="true")
+
+import config
+from app import content_safety
+
+class _StubModel:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+    def predict(self, x):
+        time.sleep(self.seconds)
+        n = 1 if isinstance(x, str) else len(x)
+        return {"toxicity": 0.01 if isinstance(x, str) else [0.01] * n}
+
+def _per_pattern_block(text: str) -> dict:
+    """The pre-compiled-matcher rule check: lowercase, then one re.search per raw pattern."""
+    t = text.lower()
+    return {
+        "adult": any(re.search(p, t) for p in content_safety.BLOCKLIST_ADULT),
+        "hate": any(re.search(p, t) for p in content_safety.BLOCKLIST_HATE),
+        "violence": any(re.search(p, t) for p in content_safety.BLOCKLIST_VIOLENCE),
+    }
+
+def _per_query_us(fn, queries) -> float:
+    t0 = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - t0) / len(queries) * 1e6
+
+def bench(n: int, model_ms: float) -> None:
+    try:
+        content_safety.load_model()
+        model = "Detoxify"
+    except Exception:
+        content_safety._DETOX = _StubModel(model_ms / 1000)
+        model = f"stub model, {model_ms:.0f} ms/call"
+    misses = [f"central bank raises rates again {i}" for i in range(n)]
+    head = ["central bank raises rates"] * n
+    blocked = [f"graphic violence footage {i}" for i in range(n)]
+
+    print(f"{n} queries, {model}")
+    print(f"  rules   per-pattern re.search  {_per_query_us(_per_pattern_block, misses):9.1f} us")
+    print(f"  rules   combined matcher       {_per_query_us(content_safety._regex_block, misses):9.1f} us")
+    content_safety.moderate_text(head[0])
+    print(f"  verdict cache hit              {_per_query_us(content_safety.moderate_text, head):9.1f} us")
+    print(f"  miss, blocked by rules         {_per_query_us(content_safety.moderate_text, blocked):9.1f} us")
+    # the model path is slow: 200 queries are enough for a stable per-query figure
+    print(f"  miss, model scored             {_per_query_us(content_safety.moderate_text, misses[:200]):9.1f} us")
+    print(f"  verdicts: {content_safety.moderation_stats()['verdicts']}  (cache size {config.SAFETY_VERDICT_CACHE_SIZE})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Moderation fast-path benchmark.")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--model-ms", type=float, default=15.0)
+    args = parser.parse_args()
+    bench(args.queries, args.model_ms)
@@ -0,0 +1,42 @@
+# benchmarks/bench_rag_map.py
+"""
+RAG MAP phase wall time vs RAG_MAP_CONCURRENCY, against a local stub generator with a
+fixed per-call latency (a stand-in for an Ollama server with OLLAMA_NUM_PARALLEL slots).
+
+Run from the repo root:  python -m benchmarks.bench_rag_map [--articles 10] [--latency 0.5] [--concurrency 1 2 4 8]
+"""
+from __future__ import annotations
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from benchmarks.stubs import ollama_handler, scratch_env, serve
+
+scratch_env(LLM_CACHE_ENABLED="false")
+
+import config
+from app import rag
+
+def bench(n_articles: int, latency: float, concurrencies: List[int]) -> None:
+    groups = [{"title": f"Story {i}", "link": f"https://ex.com/{i}", "texts": [f"Body of story {i}."]}
+              for i in range(n_articles)]
+    with serve(ollama_handler(latency=latency)) as base:
+        config.OLLAMA_BASE_URL = base
+        print(f"{n_articles} articles, {latency * 1000:.0f} ms per MAP call "
+              f"(sequential floor {n_articles * latency:.2f} s)")
+        for c in concurrencies:
+            rag._MAP_POOL = ThreadPoolExecutor(max_workers=c, thread_name_prefix="rag-map")
+            t0 = time.perf_counter()
+            mapped = rag._map_articles(groups)
+            wall = time.perf_counter() - t0
+            rag._MAP_POOL.shutdown(wait=True)
+            print(f"  concurrency {c:>2}  {wall:6.2f} s  ({len(mapped)}/{n_articles} mapped)", flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RAG MAP phase concurrency benchmark.")
+    parser.add_argument("--articles", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    bench(args.articles, args.latency, args.concurrency)
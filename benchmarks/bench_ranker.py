@@ -0,0 +1,66 @@
+# benchmarks/bench_ranker.py
+"""
+rank_articles scoring + top-k at 100 / 1k / 10k candidates: the vectorized NumPy path vs
+the pure-Python fallback (ranker.np = None), with precomputed 768-d embeddings so only
+scoring and selection are timed. Also checks both paths return the same order.
+
+Run from the repo root:  python -m benchmarks.bench_ranker [--sizes 100 1000 10000] [--top-k 50]
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from typing import List
+
+from benchmarks.stubs import scratch_env
+
+scratch_env()
+
+from app import ranker
+
+DIM = 768
+
+def _corpus(n: int, rng: random.Random):
+    articles = [{
+        "title": f"Story {i} about {rng.choice(['markets', 'rates', 'climate', 'elections'])}",
+        "snippet": "central bank inflation stocks",
+        "link": f"https://ex.com/{i}",
+        "published_at": f"2026-10-{rng.randint(1, 16):02d}T{rng.randint(0, 23):02d}:00:00Z",
+    } for i in range(n)]
+    # row 0 is the query; every 13th article has no embedding
+    embs = [[] if i % 13 == 12 else [rng.gauss(0, 1) for _ in range(DIM)] for i in range(n + 1)]
+    return articles, embs
+
+def _time(query: str, articles, top_k: int, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = ranker.rank_articles(query, articles, use_embeddings=True, top_k=top_k)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+def bench(sizes: List[int], top_k: int, repeat: int) -> None:
+    rng = random.Random(0)
+    numpy = ranker.np
+    query = "markets rates"
+    print(f"{DIM}-d embeddings (1 in 13 empty), top_k={top_k}, best of {repeat}")
+    for n in sizes:
+        articles, embs = _corpus(n, rng)
+        ranker._embed_ollama = lambda texts, embs=embs: embs[:len(texts)]
+        ranker.np = numpy
+        vec_s, vec = _time(query, articles, top_k, repeat)
+        ranker.np = None
+        py_s, py = _time(query, articles, top_k, repeat)
+        ranker.np = numpy
+        same = [a["link"] for a in vec] == [a["link"] for a in py]
+        drift = max(abs(a["_score"] - b["_score"]) for a, b in zip(vec, py))
+        print(f"  {n:>6} candidates  numpy {vec_s * 1000:8.1f} ms  python {py_s * 1000:8.1f} ms  "
+              f"({py_s / vec_s:4.1f}x)  same order: {same}  max score diff {drift:.1e}", flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectorized ranking benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    bench(args.sizes, args.top_k, args.repeat)
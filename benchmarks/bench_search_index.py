@@ -0,0 +1,56 @@
+# benchmarks/bench_search_index.py
+"""
+BM25Index query latency at 10k / 100k / 1M documents.
+
+Synthetic corpus: 20-token documents over a 50k-word Zipf vocabulary, 2-term queries
+sampled from the same distribution (head terms touch a large share of the postings, so
+these are worst-case figures).
+
+Run from the repo root:  python -m benchmarks.bench_search_index [--sizes 10000 100000] [--queries 50]
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from itertools import accumulate
+from typing import List
+
+from app.search_index import BM25Index
+
+VOCAB = 50_000
+DOC_TOKENS = 20
+
+def _zipf_sampler(rng: random.Random, vocab: int):
+    words = [f"w{i:05d}" for i in range(vocab)]
+    cum = list(accumulate(1.0 / (r + 1) for r in range(vocab)))
+    return lambda k: rng.choices(words, cum_weights=cum, k=k)
+
+def build(n_docs: int, seed: int = 0) -> BM25Index:
+    rng = random.Random(seed)
+    sample = _zipf_sampler(rng, VOCAB)
+    idx = BM25Index()
+    for i in range(n_docs):
+        idx.add(f"doc{i}", " ".join(sample(DOC_TOKENS)))
+    return idx
+
+def bench(sizes: List[int], n_queries: int, k: int) -> None:
+    for n in sizes:
+        t0 = time.perf_counter()
+        idx = build(n)
+        built = time.perf_counter() - t0
+        sample = _zipf_sampler(random.Random(1), VOCAB)
+        queries = [" ".join(sample(2)) for _ in range(n_queries)]
+        t0 = time.perf_counter()
+        for q in queries:
+            idx.search(q, k=k)
+        per_query = (time.perf_counter() - t0) / n_queries
+        print(f"{n:>9,} docs  build {built:7.2f} s  query {per_query * 1000:8.2f} ms  "
+              f"({idx.stats()['terms']:,} terms)", flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BM25Index query latency benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=50)
+    args = parser.parse_args()
+    bench(args.sizes, args.queries, args.k)
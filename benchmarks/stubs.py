@@ -0,0 +1,114 @@
+# benchmarks/stubs.py
+"""
+Local stand-ins for the upstreams (RSS feeds, Ollama) used by the benchmarks.
+
+Call scratch_env() before importing config/app modules: config reads the environment at
+import, and the benchmarks must not touch ./database or load the moderation model.
+"""
+from __future__ import annotations
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator
+
+def scratch_env(**overrides: str) -> str:
+    """Point every store at a fresh temp dir (plus any overrides); returns the dir."""
+    tmp = tempfile.mkdtemp(prefix="news-bench-")
+    os.environ.update({
+        "APP_DB_URL": f"sqlite:///{tmp}/app.db",
+        "EMBED_CACHE_PATH": f"{tmp}/embed_cache.sqlite",
+        "FULLTEXT_CACHE_PATH": f"{tmp}/fulltext_cache.sqlite",
+        "LLM_CACHE_PATH": f"{tmp}/llm_cache.sqlite",
+        "VECTOR_DB_DIR": f"{tmp}/chroma",
+        "SAFETY_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+        **overrides,
+    })
+    return tmp
+
+@contextmanager
+def serve(handle: Callable[[BaseHTTPRequestHandler], None]) -> Iterator[str]:
+    """Run handle(request_handler) for every GET/POST on 127.0.0.1; yields the base URL."""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        def do_GET(self):
+            try:
+                handle(self)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client gave up (timeout/deadline): expected under load
+        do_POST = do_GET
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.daemon_threads = True
+    srv.request_queue_size = 1024
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{srv.server_address[1]}"
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+def reply(h: BaseHTTPRequestHandler, body: bytes, content_type: str = "application/json") -> None:
+    h.send_response(200)
+    h.send_header("Content-Type", content_type)
+    h.send_header("Content-Length", str(len(body)))
+    h.end_headers()
+    h.wfile.write(body)
+
+def read_json(h: BaseHTTPRequestHandler) -> Dict:
+    return json.loads(h.rfile.read(int(h.headers.get("Content-Length") or 0)) or b"{}")
+
+def rss_feed(name: str, items: int = 20) -> bytes:
+    entries = "".join(
+        f"<item><title>{name} story {i} about markets and rates</title>"
+        f"<link>https://{name}.example.com/{i}</link>"
+        f"<description>Snippet {i} from {name}: central bank, inflation, stocks.</description>"
+        f"<pubDate>Mon, 12 Oct 2026 {i % 24:02d}:00:00 GMT</pubDate></item>"
+        for i in range(items)
+    )
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel><title>{name}</title>'
+            f"{entries}</channel></rss>").encode()
+
+def feed_server_handler(latency: Dict[str, float], items: int = 20):
+    """GET /<name> -> an RSS feed after latency[name] seconds (0 for unknown names)."""
+    def handle(h):
+        name = h.path.strip("/").split("?")[0]
+        time.sleep(latency.get(name, 0.0))
+        reply(h, rss_feed(name, items), "application/rss+xml")
+    return handle
+
+def ollama_handler(latency: float = 0.0, dim: int = 64, response: str = "- stub bullet",
+                   embed_latency: float = 0.0, batch: bool = True):
+    """
+    Ollama stand-in: /api/embed (404 with batch=False, like servers that predate it) and
+    /api/embeddings return fixed-size vectors after `embed_latency` seconds per request;
+    /api/generate returns `response` after `latency` seconds (non-streaming).
+    """
+    vec = [1.0] + [0.0] * (dim - 1)
+
+    def handle(h):
+        body = read_json(h)
+        if h.path == "/api/embed" and not batch:
+            h.send_response(404)
+            h.send_header("Content-Length", "0")
+            h.end_headers()
+        elif h.path == "/api/embed":
+            time.sleep(embed_latency)
+            reply(h, json.dumps({"embeddings": [vec] * len(body.get("input") or [])}).encode())
+        elif h.path == "/api/embeddings":
+            time.sleep(embed_latency)
+            reply(h, json.dumps({"embedding": vec}).encode())
+        else:
+            time.sleep(latency)
+            reply(h, json.dumps({"response": response, "done": True}).encode())
+    return handle
+
+def percentile(samples, p: float) -> float:
+    s = sorted(samples)
+    return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))] if s else 0.0
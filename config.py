@@ -21,19 +21,77 @@ DEFAULT_LANGUAGE = "en"
 # Ollama / models
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 LLM_MODEL       = os.getenv("LLM_MODEL", "mistral:latest")
+RAG_MAP_CONCURRENCY = int(os.getenv("RAG_MAP_CONCURRENCY", "4"))     # parallel per-article MAP calls
+RAG_MAP_TIMEOUT     = float(os.getenv("RAG_MAP_TIMEOUT", "60"))       # seconds per MAP call; slower articles are dropped
+
+# /get_news cursors: ranked result sets kept for later pages
+CURSOR_TTL         = float(os.getenv("CURSOR_TTL", "900"))
+CURSOR_MAX_ENTRIES = int(os.getenv("CURSOR_MAX_ENTRIES", "2000"))
+CURSOR_MAX_BYTES   = int(os.getenv("CURSOR_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# LLM response cache for rag._ollama_generate (keyed by model + options + prompt hash)
+LLM_CACHE_ENABLED   = _b("LLM_CACHE_ENABLED", True)
+LLM_CACHE_PATH      = os.getenv("LLM_CACHE_PATH", "./database/llm_cache.sqlite")
+LLM_CACHE_MEM_ITEMS = int(os.getenv("LLM_CACHE_MEM_ITEMS", "1024"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Background summary jobs (/get_news returns a job id, clients poll /summary/{job_id})
+SUMMARY_JOBS_ENABLED = _b("SUMMARY_JOBS_ENABLED", True)
+SUMMARY_WORKERS      = int(os.getenv("SUMMARY_WORKERS", "2"))       # RAG pipelines running at once
+SUMMARY_JOB_TTL      = float(os.getenv("SUMMARY_JOB_TTL", "900"))   # seconds a finished summary stays fetchable
+SUMMARY_MAX_JOBS     = int(os.getenv("SUMMARY_MAX_JOBS", "500"))
+SUMMARY_MAX_WAIT     = float(os.getenv("SUMMARY_MAX_WAIT", "30"))   # longest long-poll on /summary/{job_id}
+
+# Precompute per-article summaries for trending queries (app/precompute.py)
+PRECOMPUTE_ENABLED  = _b("PRECOMPUTE_ENABLED", False)
+PRECOMPUTE_INTERVAL = float(os.getenv("PRECOMPUTE_INTERVAL", "900"))  # seconds between passes
+PRECOMPUTE_QUERIES  = int(os.getenv("PRECOMPUTE_QUERIES", "10"))      # top trending queries per pass
+PRECOMPUTE_DAYS     = int(os.getenv("PRECOMPUTE_DAYS", "1"))          # trending window
+PRECOMPUTE_TOP      = int(os.getenv("PRECOMPUTE_TOP", "5"))           # articles summarized per query
 EMBED_MODEL     = os.getenv("EMBED_MODEL", "nomic-embed-text:latest")
+EMBED_BATCH_SIZE  = int(os.getenv("EMBED_BATCH_SIZE", "32"))   # texts per /api/embed call
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "2"))   # batches in flight at once
+LOCAL_EMBED_MODEL = os.getenv("LOCAL_EMBED_MODEL", "BAAI/bge-small-en-v1.5")  # fastembed fallback
+
+# Embedding cache (app/embed_cache.py)
+EMBED_CACHE_ENABLED   = _b("EMBED_CACHE_ENABLED", True)
+EMBED_CACHE_PATH      = os.getenv("EMBED_CACHE_PATH", "./database/embed_cache.sqlite")
+EMBED_CACHE_MEM_BYTES = int(os.getenv("EMBED_CACHE_MEM_BYTES", str(64 * 1024 * 1024)))  # float32: ~21k x 768-d
+EMBED_CACHE_MAX_BYTES = int(os.getenv("EMBED_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
 
 # Vector store
 VECTOR_DB_DIR = os.getenv("VECTOR_DB_DIR", "./database/chroma")
 CHROMA_COLLECTION_PREFIX = os.getenv("CHROMA_COLLECTION_PREFIX", "news_")
+VECTOR_USER_LINKS_MAX = int(os.getenv("VECTOR_USER_LINKS_MAX", "500"))  # most recent links a user's retrieval searches
+
+# Vector store retention (scheduled in the API process, or run `python -m app.retention`)
+VECTOR_RETENTION_ENABLED  = _b("VECTOR_RETENTION_ENABLED", True)
+VECTOR_RETENTION_INTERVAL = float(os.getenv("VECTOR_RETENTION_INTERVAL", "3600"))  # seconds between passes
+VECTOR_MAX_AGE_DAYS       = float(os.getenv("VECTOR_MAX_AGE_DAYS", "7"))           # 0 disables TTL eviction
+VECTOR_MAX_CHUNKS         = int(os.getenv("VECTOR_MAX_CHUNKS", "200000"))          # 0 disables the cap
+VECTOR_COMPACT_FRACTION   = float(os.getenv("VECTOR_COMPACT_FRACTION", "0.25"))    # rebuild after evicting this share
 
 SAFETY_ENABLED = os.getenv("SAFETY_ENABLED", "true").lower() == "true"
 TOXICITY_THRESHOLD = float(os.getenv("TOXICITY_THRESHOLD", "0.75"))
 BLOCK_ADULT   = os.getenv("BLOCK_ADULT", "true").lower() == "true"
 BLOCK_HATE    = os.getenv("BLOCK_HATE", "true").lower() == "true"
 BLOCK_VIOLENCE= os.getenv("BLOCK_VIOLENCE", "true").lower() == "true"
+# Moderate the ranked top `limit` + margin (topped up if some are dropped), not every candidate.
+# Cold cost is ~limit+margin Detoxify passes (batched) once per article: scores are cached by
+# text and /get_news results by query, so repeat articles and queries skip the model.
+ARTICLE_MODERATION_ENABLED = _b("ARTICLE_MODERATION_ENABLED", True)
+ARTICLE_MODERATION_MARGIN  = int(os.getenv("ARTICLE_MODERATION_MARGIN", "10"))
+SAFETY_BATCH_SIZE       = int(os.getenv("SAFETY_BATCH_SIZE", "32"))        # texts per Detoxify forward pass
+SAFETY_MAX_CHARS        = int(os.getenv("SAFETY_MAX_CHARS", "1000"))       # title + snippet is plenty
+SAFETY_SCORE_CACHE_SIZE = int(os.getenv("SAFETY_SCORE_CACHE_SIZE", "50000"))  # cached Detoxify results (LRU)
+SAFETY_VERDICT_CACHE_SIZE = int(os.getenv("SAFETY_VERDICT_CACHE_SIZE", "10000"))  # final verdicts per normalized query
 SAFESEARCH_GOOGLE = os.getenv("SAFESEARCH_GOOGLE", "true").lower() == "true"
 
+# Startup: heavy deps (chromadb, trafilatura, langdetect, Detoxify, fastembed) load lazily;
+# the warm-up thread loads them right after boot. /ready reports per-component progress.
+WARMUP_ENABLED    = _b("WARMUP_ENABLED", True)
+WARMUP_COMPONENTS = [c.strip() for c in os.getenv("WARMUP_COMPONENTS", "detoxify,vector_store,extractors,fastembed").split(",") if c.strip()]
+
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 
 APP_DB_URL = os.getenv("APP_DB_URL", "sqlite:///./database/app.db")
@@ -44,4 +102,48 @@ SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change-me")
 DB_RESET_ON_STARTUP = _b("DB_RESET_ON_STARTUP", False)
 
 DEFAULT_REGION = os.getenv("DEFAULT_REGION", "us")  
-DEFAULT_LANG   = os.getenv("DEFAULT_LANG", "en") 
\ No newline at end of file
+DEFAULT_LANG   = os.getenv("DEFAULT_LANG", "en") 
+# RSS fetching
+RSS_CONCURRENT   = _b("RSS_CONCURRENT", True)
+RSS_MAX_WORKERS  = int(os.getenv("RSS_MAX_WORKERS", "8"))
+RSS_FEED_TIMEOUT = float(os.getenv("RSS_FEED_TIMEOUT", "5"))    # seconds per feed
+RSS_DEADLINE     = float(os.getenv("RSS_DEADLINE", "8"))        # seconds for the whole fan-out
+RSS_FRESH_SECONDS = float(os.getenv("RSS_FRESH_SECONDS", "120")) # serve cached feed snapshot without revalidating
+
+# "live" = fetch feeds in the request path, "store" = read the ingestion worker's article store
+RSS_MODE = os.getenv("RSS_MODE", "live").strip().lower()
+
+# Background feed ingestion (app/ingest.py)
+INGEST_ENABLED        = _b("INGEST_ENABLED", False)
+INGEST_INTERVAL       = float(os.getenv("INGEST_INTERVAL", "300"))   # seconds between polls
+INGEST_RETENTION_DAYS = int(os.getenv("INGEST_RETENTION_DAYS", "7"))
+INGEST_FEED_TIMEOUT   = float(os.getenv("INGEST_FEED_TIMEOUT", "30"))  # no user is waiting: give slow feeds time
+INGEST_DEADLINE       = float(os.getenv("INGEST_DEADLINE", "120"))     # seconds for one pass over all feeds
+INGEST_MAX_WORKERS    = int(os.getenv("INGEST_MAX_WORKERS", "4"))      # own pool, so request-path fetches never queue behind it
+
+# BM25 article index (app/search_index.py)
+INDEX_MAX_AGE_HOURS = float(os.getenv("INDEX_MAX_AGE_HOURS", "72"))  # evict docs no feed has carried for this long
+INDEX_MAX_RESULTS   = int(os.getenv("INDEX_MAX_RESULTS", "100"))
+
+# Async /get_news pipeline (httpx on the event loop instead of blocking requests in the threadpool)
+ASYNC_PIPELINE       = _b("ASYNC_PIPELINE", False)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+
+# /get_news result cache (app/result_cache.py), keyed by (query, lang, region, timeframe, sort)
+RESULT_CACHE_ENABLED     = _b("RESULT_CACHE_ENABLED", True)
+RESULT_CACHE_TTL         = float(os.getenv("RESULT_CACHE_TTL", "300"))     # fresh for 5 min
+RESULT_CACHE_STALE       = float(os.getenv("RESULT_CACHE_STALE", "1800"))  # then served stale while one refresh runs
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "500"))
+RESULT_CACHE_MAX_BYTES   = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SERPAPI_NO_CACHE         = _b("SERPAPI_NO_CACHE", False)  # SerpAPI's own cached searches are free
+
+# Extracted article body cache (app/fulltext_cache.py)
+FULLTEXT_CACHE_ENABLED    = _b("FULLTEXT_CACHE_ENABLED", True)
+FULLTEXT_CACHE_PATH       = os.getenv("FULLTEXT_CACHE_PATH", "./database/fulltext_cache.sqlite")
+FULLTEXT_CACHE_MEM_ITEMS  = int(os.getenv("FULLTEXT_CACHE_MEM_ITEMS", "256"))
+FULLTEXT_CACHE_MAX_BYTES  = int(os.getenv("FULLTEXT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+FULLTEXT_FRESH_SECONDS    = float(os.getenv("FULLTEXT_FRESH_SECONDS", str(6 * 3600)))  # then revalidate
+FULLTEXT_NEGATIVE_TTL     = float(os.getenv("FULLTEXT_NEGATIVE_TTL", "3600"))          # retry failed URLs after
+FULLTEXT_MAX_WORKERS      = int(os.getenv("FULLTEXT_MAX_WORKERS", "16"))   # global cap on concurrent article fetches
+FULLTEXT_PER_DOMAIN       = int(os.getenv("FULLTEXT_PER_DOMAIN", "2"))     # concurrent fetches per site
+FULLTEXT_BUDGET           = float(os.getenv("FULLTEXT_BUDGET", "10"))      # seconds before falling back to snippets
@@ -1,10 +1,11 @@
 # database/crud.py
 from __future__ import annotations
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, delete, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from .models import SearchEvent
+from .models import SearchEvent, FeedArticle, UserArticle, ArticleSummary
 
 def add_search_event(db: Session, user_id: int, query: str) -> None:
     db.add(SearchEvent(user_id=user_id, query=query.strip()[:256]))
@@ -31,3 +32,226 @@ def get_trending_queries(db: Session, days: int = 30, limit: int = 25) -> List[T
     )
     rows = db.execute(q).all()
     return [(r[0], r[1]) for r in rows]
+
+# ---------- Feed article store ----------
+def _feed_article_dict(row: FeedArticle) -> Dict[str, Any]:
+    return {
+        "title": row.title,
+        "link": row.link,
+        "snippet": row.snippet or "",
+        "source": row.source or "",
+        "published_at": row.published_at,
+    }
+
+def _feed_row(region: str, a: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    return {
+        "region": region,
+        "link_key": a["link_key"],
+        "title": a.get("title", ""),
+        "link": a.get("link", ""),
+        "snippet": a.get("snippet", ""),
+        "source": a.get("source", ""),
+        "published_at": a.get("published_at"),
+        "fetched_at": now,
+    }
+
+def upsert_feed_articles(db: Session, region: str, articles: List[Dict[str, Any]]) -> int:
+    """
+    Insert or refresh articles keyed by (region, link_key). Returns number of new rows.
+    One upsert, so overlapping ingest passes don't collide on uq_feed_article_region_link
+    (the count is taken before it and may be off by what a concurrent pass added).
+    """
+    now = datetime.utcnow()
+    articles = list({a["link_key"]: a for a in articles}.values())
+    keys = [a["link_key"] for a in articles]
+    if not keys:
+        return 0
+    existing = set(db.execute(
+        select(FeedArticle.link_key).where(FeedArticle.region == region, FeedArticle.link_key.in_(keys))
+    ).scalars())
+    insert = _dialect_insert(db)
+    if insert is not None:
+        for i in range(0, len(articles), 500):
+            stmt = insert(FeedArticle).values([_feed_row(region, a, now) for a in articles[i:i + 500]])
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["region", "link_key"],
+                set_={c: getattr(stmt.excluded, c)
+                      for c in ("title", "link", "snippet", "source", "published_at", "fetched_at")},
+            ))
+        db.commit()
+        return len(set(keys) - existing)
+    try:
+        return _upsert_feed_articles_orm(db, region, articles, now)
+    except IntegrityError:
+        db.rollback()  # a concurrent pass inserted some of the rows first: update them now
+        return _upsert_feed_articles_orm(db, region, articles, now)
+
+def _upsert_feed_articles_orm(db: Session, region: str, articles: List[Dict[str, Any]], now: datetime) -> int:
+    keys = [a["link_key"] for a in articles]
+    existing = {
+        row.link_key: row
+        for row in db.execute(
+            select(FeedArticle).where(FeedArticle.region == region, FeedArticle.link_key.in_(keys))
+        ).scalars()
+    }
+    added = 0
+    for a in articles:
+        row = existing.get(a["link_key"])
+        if row is None:
+            row = FeedArticle(region=region, link_key=a["link_key"])
+            db.add(row)
+            existing[a["link_key"]] = row
+            added += 1
+        row.title = a.get("title", "")
+        row.link = a.get("link", "")
+        row.snippet = a.get("snippet", "")
+        row.source = a.get("source", "")
+        row.published_at = a.get("published_at")
+        row.fetched_at = now
+    db.commit()
+    return added
+
+def search_feed_articles(db: Session, region: str, query: str = "", limit: int = 200) -> List[Dict[str, Any]]:
+    """
+    Newest articles first, optionally filtered by a case-insensitive substring match on
+    title/snippet. Store-mode queries are ranked by the BM25 index instead (see
+    feed_articles_since); this serves the unfiltered listing.
+    """
+    q = select(FeedArticle).where(FeedArticle.region == region)
+    if query:
+        pat = f"%{query}%"
+        q = q.where(or_(FeedArticle.title.ilike(pat), FeedArticle.snippet.ilike(pat)))
+    q = q.order_by(desc(FeedArticle.fetched_at)).limit(limit)
+    return [_feed_article_dict(r) for r in db.execute(q).scalars()]
+
+def feed_articles_since(
+    db: Session, region: str, since: datetime | None = None, limit: int = 10000
+) -> Tuple[List[Dict[str, Any]], datetime | None]:
+    """Articles fetched after `since` (all if None), oldest first, and the newest fetched_at among them."""
+    q = select(FeedArticle).where(FeedArticle.region == region)
+    if since is not None:
+        q = q.where(FeedArticle.fetched_at > since)
+    rows = list(db.execute(q.order_by(FeedArticle.fetched_at).limit(limit)).scalars())
+    return [_feed_article_dict(r) for r in rows], (rows[-1].fetched_at if rows else None)
+
+def delete_feed_articles_older_than(db: Session, days: int) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    res = db.execute(delete(FeedArticle).where(FeedArticle.fetched_at < cutoff))
+    db.commit()
+    return res.rowcount or 0
+
+# ---------- User -> article mapping (shared vector collection) ----------
+def _dialect_insert(db: Session):
+    """INSERT construct with ON CONFLICT support for this database, or None."""
+    name = db.get_bind().dialect.name
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert
+
+def record_user_links(db: Session, user_id: int, link_keys: List[str]) -> None:
+    """
+    Mark links as seen by the user (refreshes seen_at for existing rows). One upsert, so
+    concurrent summary jobs for the same user don't collide on uq_user_article.
+    """
+    keys = list(dict.fromkeys(k for k in link_keys if k))
+    if not keys:
+        return
+    now = datetime.utcnow()
+    insert = _dialect_insert(db)
+    if insert is not None:
+        for i in range(0, len(keys), 500):
+            stmt = insert(UserArticle).values(
+                [{"user_id": user_id, "link_key": k, "seen_at": now} for k in keys[i:i + 500]]
+            )
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["user_id", "link_key"], set_={"seen_at": stmt.excluded.seen_at}
+            ))
+        db.commit()
+        return
+    try:
+        _record_user_links_orm(db, user_id, keys, now)
+    except IntegrityError:
+        db.rollback()  # a concurrent writer inserted some of the rows first: they exist now
+        _record_user_links_orm(db, user_id, keys, now)
+
+def _record_user_links_orm(db: Session, user_id: int, keys: List[str], now: datetime) -> None:
+    existing = {
+        row.link_key: row
+        for row in db.execute(
+            select(UserArticle).where(UserArticle.user_id == user_id, UserArticle.link_key.in_(keys))
+        ).scalars()
+    }
+    for k in keys:
+        row = existing.get(k)
+        if row is None:
+            db.add(UserArticle(user_id=user_id, link_key=k, seen_at=now))
+        else:
+            row.seen_at = now
+    db.commit()
+
+def get_user_link_keys(db: Session, user_id: int, limit: int = 500) -> List[str]:
+    q = (
+        select(UserArticle.link_key)
+        .where(UserArticle.user_id == user_id)
+        .order_by(desc(UserArticle.seen_at))
+        .limit(limit)
+    )
+    return [r[0] for r in db.execute(q).all()]
+
+def delete_user_articles_older_than(db: Session, days: float) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    res = db.execute(delete(UserArticle).where(UserArticle.seen_at < cutoff))
+    db.commit()
+    return res.rowcount or 0
+
+# ---------- Per-article summary store ----------
+def get_article_summaries(db: Session, link_keys: List[str]) -> Dict[str, List[Tuple[str, str]]]:
+    """{link_key: [(body_hash, summary), ...] newest first} for the keys that have any."""
+    out: Dict[str, List[Tuple[str, str]]] = {}
+    keys = list(dict.fromkeys(k for k in link_keys if k))
+    for i in range(0, len(keys), 500):
+        q = (
+            select(ArticleSummary.link_key, ArticleSummary.body_hash, ArticleSummary.summary)
+            .where(ArticleSummary.link_key.in_(keys[i:i + 500]))
+            .order_by(desc(ArticleSummary.created_at))
+        )
+        for link_key, body_hash, summary in db.execute(q).all():
+            out.setdefault(link_key, []).append((body_hash, summary))
+    return out
+
+def upsert_article_summary(db: Session, link_key: str, body_hash: str, summary: str, model: str = "") -> None:
+    """Store or replace the summary of one article version (concurrent writers safe)."""
+    insert = _dialect_insert(db)
+    if insert is not None:
+        now = datetime.utcnow()
+        stmt = insert(ArticleSummary).values(
+            link_key=link_key, body_hash=body_hash, summary=summary, model=model, created_at=now
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["link_key", "body_hash"],
+            set_={"summary": stmt.excluded.summary, "model": stmt.excluded.model,
+                  "created_at": stmt.excluded.created_at},
+        ))
+        db.commit()
+        return
+    try:
+        _upsert_article_summary_orm(db, link_key, body_hash, summary, model)
+    except IntegrityError:
+        db.rollback()
+        _upsert_article_summary_orm(db, link_key, body_hash, summary, model)
+
+def _upsert_article_summary_orm(db: Session, link_key: str, body_hash: str, summary: str, model: str) -> None:
+    row = db.execute(
+        select(ArticleSummary).where(ArticleSummary.link_key == link_key, ArticleSummary.body_hash == body_hash)
+    ).scalar_one_or_none()
+    if row is None:
+        row = ArticleSummary(link_key=link_key, body_hash=body_hash)
+        db.add(row)
+    row.summary = summary
+    row.model = model
+    row.created_at = datetime.utcnow()
+    db.commit()
@@ -1,6 +1,6 @@
 # database/models.py
 from __future__ import annotations
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, func
 from .db import Base
 
 class User(Base):
@@ -16,4 +16,37 @@ class SearchEvent(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
     query = Column(String(256), nullable=False, index=True)
-    created_at = Column(DateTime, server_default=func.now(), index=True)
\ No newline at end of file
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+class FeedArticle(Base):
+    """RSS entries persisted by the background ingestion worker (app/ingest.py)."""
+    __tablename__ = "feed_articles"
+    __table_args__ = (UniqueConstraint("region", "link_key", name="uq_feed_article_region_link"),)
+    id = Column(Integer, primary_key=True, index=True)
+    region = Column(String(16), nullable=False, index=True)
+    link_key = Column(String(1024), nullable=False)   # normalized link (news_fetcher._normalize_url)
+    title = Column(String, nullable=False)
+    link = Column(String, nullable=False)
+    snippet = Column(String, default="")
+    source = Column(String, default="")
+    published_at = Column(String, nullable=True)       # ISO-8601 'Z' string, same as the article dicts
+    fetched_at = Column(DateTime, nullable=False, index=True)
+
+class UserArticle(Base):
+    """Which articles (normalized links) a user has searched into the shared vector collection."""
+    __tablename__ = "user_articles"
+    __table_args__ = (UniqueConstraint("user_id", "link_key", name="uq_user_article"),)
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, index=True)   # 0 = anonymous, so no FK to users
+    link_key = Column(String(1024), nullable=False)
+    seen_at = Column(DateTime, nullable=False, index=True)
+
+class ArticleSummary(Base):
+    """Per-article LLM summary, reused across users until the article body changes."""
+    __tablename__ = "article_summaries"
+    __table_args__ = (UniqueConstraint("link_key", "body_hash", name="uq_article_summary"),)
+    id = Column(Integer, primary_key=True, index=True)
+    link_key = Column(String(1024), nullable=False, index=True)
+    body_hash = Column(String(64), nullable=False)      # sha256 of the text that was summarized
+    summary = Column(String, nullable=False)
+    model = Column(String, default="")
+    created_at = Column(DateTime, nullable=False, index=True)
@@ -7,7 +7,8 @@ BACKEND_URL = settings.BACKEND_URL
 def get_news(query: str, user_id: int, token: str | None = None,
              page: int = 1, page_size: int = 10,
              region: str | None = None, lang: str | None = None,
-             timeframe: str | None = None, sort: str | None = None) -> dict:
+             timeframe: str | None = None, sort: str | None = None,
+             cursor: str | None = None) -> dict:
 
     params = {
         "query": query,
@@ -15,6 +16,7 @@ def get_news(query: str, user_id: int, token: str | None = None,
         "page": page,
         "page_size": page_size,
     }
+    if cursor:    params["cursor"] = cursor
     if region:    params["region"] = region
     if lang:      params["lang"] = lang
     if timeframe: params["timeframe"] = timeframe
@@ -28,6 +30,15 @@ def get_news(query: str, user_id: int, token: str | None = None,
     r.raise_for_status()
     return r.json()
 
+def get_summary(job_id: str, wait: float = 0, token: str | None = None) -> dict:
+    """Poll a summary job from /get_news; wait > 0 long-polls up to that many seconds."""
+    headers = {}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    r = requests.get(f"{BACKEND_URL}/summary/{job_id}", params={"wait": wait}, headers=headers, timeout=wait + 30)
+    r.raise_for_status()
+    return r.json()
+
 def track_search(user_id: int, query: str, token: str | None = None) -> None:
     params = {"user_id": user_id, "query": query}
     headers = {}
@@ -47,8 +58,12 @@ def get_personal_topics(user_id: int, k: int = 3, token: str | None = None) -> l
 
 
 def summarize_batch(articles, user_id, token=None):
-    url = f"{BACKEND_URL}/summarize"
+    url = f"{BACKEND_URL}/summarize_batch"
     headers = {"Authorization": f"Bearer {token}"} if token else {}
-    resp = requests.post(url, json={"articles": articles, "user_id": user_id}, headers=headers, timeout=60)
+    items = [
+        {k: a.get(k) or "" for k in ("title", "link", "snippet", "source", "published_at")}
+        for a in articles if a.get("link")
+    ]
+    resp = requests.post(url, json={"items": items}, params={"user_id": user_id}, headers=headers, timeout=60)
     resp.raise_for_status()
     return resp.json().get("summaries", {})  # Expected: {link: summary}
@@ -6,14 +6,16 @@ BASE_DIR = Path(__file__).resolve().parent
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
+import time
 import streamlit as st
-from settings import DEFAULT_USER_ID
+from settings import DEFAULT_USER_ID, SUMMARY_POLL_WAIT, SUMMARY_POLL_INTERVAL, SUMMARY_POLL_MAX
 from safety import is_client_safe
 from topics import suggest_topics
 from auth_client import register, login
 import ui
 import requests
-from api_client import get_news as api_get_news, track_search, get_personal_topics, summarize_batch
+from api_client import track_search, get_personal_topics
+from client_cache import get_news as cached_get_news, get_summaries, prefetch_page, job_summary
 
 st.set_page_config(page_title="Personalized News Aggregator", layout="wide")
 st.title("Personalized News Aggregator")
@@ -39,6 +41,28 @@ def _maybe_reset_pagination(current_q):
         st.session_state["page"] = 1
         st.session_state["last_query"] = current_q
 
+def _show_job_summary(job_id, quick_summary):
+    """
+    The job's summary if it finished, else the quick one. Each check long-polls at most
+    SUMMARY_POLL_WAIT seconds, so a script run never blocks on the LLM; after
+    SUMMARY_POLL_MAX seconds of checks the quick summary stays.
+    """
+    started = st.session_state.setdefault("summary_polls", {}).setdefault(job_id, time.time())
+    done = None
+    if time.time() - started < SUMMARY_POLL_MAX:
+        try:
+            done = job_summary(job_id, token=st.session_state.get("token"), wait=SUMMARY_POLL_WAIT)
+        except Exception:
+            pass  # keep the quick summary already shown
+    ui.show_summary(done or quick_summary)
+
+# Streamlit >= 1.37: re-check in a fragment that reruns on its own every SUMMARY_POLL_INTERVAL
+# (finished jobs come from the client cache). Older versions check once per script run.
+if hasattr(st, "fragment"):
+    _job_summary_panel = st.fragment(run_every=SUMMARY_POLL_INTERVAL)(_show_job_summary)
+else:
+    _job_summary_panel = _show_job_summary
+
 # ---------------------------
 # Auth UI
 # ---------------------------
@@ -156,25 +180,35 @@ query = st.text_input("Enter a topic to search for news", value=st.session_state
 _maybe_reset_pagination(query)
 
 if query:
+    page_size = int(st.session_state["page_size"])
+    cur_page = int(st.session_state["page"])
+    news_args = dict(
+        query=query,
+        user_id=st.session_state["user_id"] or DEFAULT_USER_ID,
+        token=st.session_state.get("token"),
+        region=st.session_state.get("effective_region", "us"),
+        lang=st.session_state.get("effective_lang", "en"),
+        page_size=page_size,
+    )
     try:
-        data = api_get_news(
-            query=query,
-            user_id=st.session_state["user_id"] or DEFAULT_USER_ID,
-            token=st.session_state.get("token"),
-            page=st.session_state.get("page", 1),
-            page_size=st.session_state.get("page_size", 10),
-            region=st.session_state.get("effective_region", "us"),
-            lang=st.session_state.get("effective_lang", "en"),
-        )
-
-        try:
-            track_search(
-                user_id=st.session_state["user_id"],
-                query=query,
-                token=st.session_state.get("token")
-            )
-        except Exception:
-            pass
+        # one page per call: the backend keeps the ranked set under a cursor, and pages
+        # already seen (or prefetched) are served from the client cache
+        data = cached_get_news(page=cur_page, **news_args)
+        if not data.get("articles") and data.get("total") and cur_page > 1:
+            # result set shrank (e.g. cursor expired and re-ranked): clamp to the last page
+            cur_page = max(1, (data["total"] + page_size - 1) // page_size)
+            data = cached_get_news(page=cur_page, **news_args)
+
+        if st.session_state.get("tracked_query") != query:  # once per search, not per rerun
+            try:
+                track_search(
+                    user_id=st.session_state["user_id"],
+                    query=query,
+                    token=st.session_state.get("token")
+                )
+                st.session_state["tracked_query"] = query
+            except Exception:
+                pass
 
     except requests.HTTPError as e:
         st.error(f"Request failed: {e}")
@@ -184,37 +218,29 @@ if query:
     articles = data.get("articles", [])
     st.session_state["related_topics"] = suggest_topics(articles, query, k=3)
 
-    safe_articles = []
+    page_slice = []
     for a in articles:
         title = a.get("title", "")
         snippet = a.get("snippet", "")
         try:
             if is_client_safe(f"{title}\n{snippet}"):
-                safe_articles.append(a)
+                page_slice.append(a)
         except Exception:
-            safe_articles.append(a)
+            page_slice.append(a)
 
-    page_size = int(st.session_state["page_size"])
-    total = len(safe_articles)
+    total = int(data.get("total", len(articles)))
     total_pages = max(1, (total + page_size - 1) // page_size)
-    cur_page = int(st.session_state["page"])
-    cur_page = max(1, min(cur_page, total_pages))
     st.session_state["page"] = cur_page
 
-    start = (cur_page - 1) * page_size
-    end = start + page_size
-    page_slice = safe_articles[start:end][:3]
+    # next page (and its summaries) load in the background while this one is read
+    if data.get("has_more"):
+        prefetch_page(page=cur_page + 1, **news_args)
 
-    try:
-        improved = summarize_batch(page_slice, token=st.session_state.get("token"))
-        for a in page_slice:
-            s = improved.get(a.get("link"))
-            if s:
-                a["ai_summary"] = s
-    except Exception:
-        pass
-
-    ui.show_summary(summary)
+    job_id = data.get("summary_job")
+    if job_id:
+        _job_summary_panel(job_id, summary)  # quick summary now, the job's once it finishes
+    else:
+        ui.show_summary(summary)
 
     c1, c2, c3 = st.columns([1, 2, 1])
     with c1:
@@ -233,7 +259,7 @@ if query:
 
     summaries = {}
     try:
-        summaries = summarize_batch(
+        summaries = get_summaries(
             page_slice,
             user_id=st.session_state["user_id"],
             token=st.session_state.get("token")
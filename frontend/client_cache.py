@@ -0,0 +1,186 @@
+# frontend/client_cache.py
+"""
+Client-side caching for the Streamlit app. Module state survives reruns, so paging,
+topic clicks and widget changes reuse what the backend already returned:
+
+- news pages keyed by (user_id, query, region, lang, timeframe, sort, page_size, page), NEWS_CACHE_TTL;
+  later pages reuse the server cursor of the first one
+- per-article summaries keyed by link, SUMMARY_CACHE_TTL; finished summary jobs by job id
+- the next page and its summaries are prefetched in the background while the user reads
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional
+
+import settings
+from api_client import get_news as api_get_news, summarize_batch, get_summary
+
+class TTLCache:
+    def __init__(self, ttl: float, max_items: int):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            e = self._data.get(key)
+            if e is None:
+                return None
+            if time.time() - e[0] > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return e[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+_NEWS = TTLCache(settings.NEWS_CACHE_TTL, max_items=256)
+_SEARCH_CURSORS = TTLCache(settings.NEWS_CACHE_TTL, max_items=64)
+_SUMMARIES = TTLCache(settings.SUMMARY_CACHE_TTL, max_items=2000)
+_JOB_SUMMARIES = TTLCache(settings.SUMMARY_CACHE_TTL, max_items=64)
+_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+_INFLIGHT: Dict[str, Future] = {}   # link -> prefetch that will produce its summary
+_PAGES_INFLIGHT: Dict[tuple, Future] = {}   # page key -> prefetch loading it
+_LOCK = threading.Lock()
+STATS = {"news_hits": 0, "news_calls": 0, "summary_hits": 0, "summary_calls": 0, "prefetch_calls": 0}
+
+def _search_key(user_id, query, region, lang, timeframe, sort, page_size) -> tuple:
+    return (user_id, query.strip().lower(), region, lang, timeframe, sort, page_size)
+
+def _load_page(query: str, user_id: int, token: str | None, region, lang, timeframe, sort,
+               page: int, page_size: int) -> dict:
+    search = _search_key(user_id, query, region, lang, timeframe, sort, page_size)
+    data = api_get_news(query=query, user_id=user_id, token=token,
+                        region=region, lang=lang, timeframe=timeframe, sort=sort,
+                        page=page, page_size=page_size, cursor=_SEARCH_CURSORS.get(search))
+    _NEWS.put(search + (page,), data)
+    if data.get("cursor"):
+        _SEARCH_CURSORS.put(search, data["cursor"])
+    return data
+
+def get_news(query: str, user_id: int, token: str | None = None,
+             region: str | None = None, lang: str | None = None,
+             timeframe: str | None = None, sort: str | None = None,
+             page: int = 1, page_size: int = 10) -> dict:
+    """One page of api_client.get_news behind the cache (waits for a prefetch of it if one is running)."""
+    key = _search_key(user_id, query, region, lang, timeframe, sort, page_size) + (page,)
+    data = _NEWS.get(key)
+    if data is None:
+        with _LOCK:
+            fut = _PAGES_INFLIGHT.get(key)
+        if fut is not None:
+            try:
+                fut.result(timeout=settings.REQUEST_TIMEOUT)
+            except Exception:
+                pass
+            data = _NEWS.get(key)
+    if data is not None:
+        STATS["news_hits"] += 1
+        return data
+    STATS["news_calls"] += 1
+    return _load_page(query, user_id, token, region, lang, timeframe, sort, page, page_size)
+
+def _prefetch_page(user_id: int, token: str | None, region, lang, timeframe, sort, query: str,
+                   page: int, page_size: int) -> None:
+    data = _load_page(query, user_id, token, region, lang, timeframe, sort, page, page_size)
+    prefetch_summaries(data.get("articles", []), user_id, token)
+
+def prefetch_page(query: str, user_id: int, token: str | None = None,
+                  region: str | None = None, lang: str | None = None,
+                  timeframe: str | None = None, sort: str | None = None,
+                  page: int = 2, page_size: int = 10) -> Optional[Future]:
+    """Load a page (and then its summaries) in the background; returns immediately."""
+    key = _search_key(user_id, query, region, lang, timeframe, sort, page_size) + (page,)
+    with _LOCK:
+        if key in _PAGES_INFLIGHT or _NEWS.get(key) is not None:
+            return None
+        STATS["prefetch_calls"] += 1
+        fut = _POOL.submit(_prefetch_page, user_id, token, region, lang, timeframe, sort,
+                           query, page, page_size)
+        _PAGES_INFLIGHT[key] = fut
+    fut.add_done_callback(lambda f: _forget([key], f, _PAGES_INFLIGHT))
+    return fut
+
+def job_summary(job_id: str, token: str | None = None, wait: float = 0) -> Optional[dict]:
+    """Finished summary of a /get_news summary job (cached once done), or None if not ready."""
+    s = _JOB_SUMMARIES.get(job_id)
+    if s is not None:
+        return s
+    job = get_summary(job_id, wait=wait, token=token)
+    if job.get("status") == "done" and job.get("summary"):
+        _JOB_SUMMARIES.put(job_id, job["summary"])
+        return job["summary"]
+    return None
+
+def _fetch_summaries(items: List[dict], user_id: int, token: str | None) -> Dict[str, str]:
+    out = summarize_batch(items, user_id=user_id, token=token)
+    for link, s in out.items():
+        if s:
+            _SUMMARIES.put(link, s)
+    return out
+
+def get_summaries(items: List[dict], user_id: int, token: str | None = None) -> Dict[str, str]:
+    """{link: summary}: cached ones first, then in-flight prefetches, then one call for the rest."""
+    out: Dict[str, str] = {}
+    missing: List[dict] = []
+    waiting: List[tuple] = []
+    for a in items:
+        link = a.get("link")
+        if not link:
+            continue
+        s = _SUMMARIES.get(link)
+        if s is not None:
+            out[link] = s
+            STATS["summary_hits"] += 1
+            continue
+        with _LOCK:
+            fut = _INFLIGHT.get(link)
+        if fut is not None:
+            waiting.append((a, fut))
+        else:
+            missing.append(a)
+
+    for a, fut in waiting:
+        try:
+            s = fut.result(timeout=settings.REQUEST_TIMEOUT).get(a["link"])
+        except Exception:
+            s = None
+        if s:
+            out[a["link"]] = s
+        else:
+            missing.append(a)
+
+    if missing:
+        STATS["summary_calls"] += 1
+        out.update(_fetch_summaries(missing, user_id, token))
+    return out
+
+def _forget(keys: List[Hashable], fut: Future, inflight: Dict = _INFLIGHT) -> None:
+    with _LOCK:
+        for k in keys:
+            if inflight.get(k) is fut:
+                del inflight[k]
+
+def prefetch_summaries(items: List[dict], user_id: int, token: str | None = None) -> Optional[Future]:
+    """Start fetching summaries for items not cached or already being fetched; returns immediately."""
+    with _LOCK:
+        todo = [a for a in items
+                if a.get("link") and a["link"] not in _INFLIGHT and _SUMMARIES.get(a["link"]) is None]
+        if not todo:
+            return None
+        STATS["prefetch_calls"] += 1
+        fut = _POOL.submit(_fetch_summaries, todo, user_id, token)
+        links = [a["link"] for a in todo]
+        for link in links:
+            _INFLIGHT[link] = fut
+    fut.add_done_callback(lambda f: _forget(links, f))
+    return fut
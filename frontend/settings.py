@@ -8,3 +8,12 @@ DEFAULT_USER_ID = int(os.getenv("DEMO_USER_ID", "1"))
 
 # Requests timeout (seconds)
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "60"))
+
+# Client-side caches (frontend/client_cache.py), seconds
+NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", "300"))
+SUMMARY_CACHE_TTL = int(os.getenv("SUMMARY_CACHE_TTL", "3600"))
+
+# Background /get_news summary job: short polls across reruns instead of one long block
+SUMMARY_POLL_WAIT = float(os.getenv("SUMMARY_POLL_WAIT", "1"))          # long-poll per check, seconds
+SUMMARY_POLL_INTERVAL = float(os.getenv("SUMMARY_POLL_INTERVAL", "2"))  # between checks
+SUMMARY_POLL_MAX = float(os.getenv("SUMMARY_POLL_MAX", "120"))          # then keep the quick summary
@@ -0,0 +1,52 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# config reads the environment at import: point every store at a scratch dir first, so tests
+# never touch ./database, and keep models/background workers out of the way.
+_TMP = tempfile.mkdtemp(prefix="news-tests-")
+os.environ.update({
+    "APP_DB_URL": f"sqlite:///{_TMP}/app.db",
+    "EMBED_CACHE_PATH": f"{_TMP}/embed_cache.sqlite",
+    "FULLTEXT_CACHE_PATH": f"{_TMP}/fulltext_cache.sqlite",
+    "LLM_CACHE_PATH": f"{_TMP}/llm_cache.sqlite",
+    "VECTOR_DB_DIR": f"{_TMP}/chroma",
+    "SAFETY_ENABLED": "false",
+    "WARMUP_ENABLED": "false",
+})
+
+# the repo is not an installed package: make `import app`, `import config` work from anywhere
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+@pytest.fixture
+def http_server():
+    """
+    Start a local HTTP server: http_server(handle) -> base URL, where handle(handler) serves
+    one request (handler is the BaseHTTPRequestHandler; use its path/send_response/wfile).
+    """
+    servers = []
+
+    def start(handle):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            def do_GET(self):
+                handle(self)
+            do_POST = do_GET
+            def log_message(self, *args):
+                pass
+        srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        srv.daemon_threads = True
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        servers.append(srv)
+        return f"http://127.0.0.1:{srv.server_address[1]}"
+
+    yield start
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
@@ -0,0 +1,31 @@
+# tests/test_background.py
+import threading
+
+from app.background import BackgroundWorker
+
+def test_periodic_worker_survives_failures_and_stops():
+    calls = []
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("bad pass")
+    w = BackgroundWorker("t-periodic", fn, interval=0.01)
+    t = w.start()
+    assert w.start() is t               # idempotent
+    while len(calls) < 3:
+        pass
+    w.stop()
+    assert not t.is_alive() and w.stopped()
+
+def test_run_first_false_waits_one_interval():
+    ran = threading.Event()
+    w = BackgroundWorker("t-delayed", ran.set, interval=60, run_first=False)
+    w.start()
+    w.stop()
+    assert not ran.is_set()
+
+def test_one_shot_worker():
+    ran = threading.Event()
+    w = BackgroundWorker("t-once", ran.set)
+    w.start().join(timeout=5)
+    assert ran.is_set()
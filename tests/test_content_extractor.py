@@ -0,0 +1,62 @@
+# tests/test_content_extractor.py
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("trafilatura")
+
+import config
+from app import content_extractor
+
+PARAGRAPH = "The committee published its findings on Tuesday after a long review of the evidence. " * 8
+
+def _slow_site(http_server, delay_for):
+    """Article pages; sleeps delay_for(path) seconds. Records peak concurrency per Host header."""
+    lock = threading.Lock()
+    inflight, peak = Counter(), Counter()
+
+    def handle(h):
+        host = h.headers.get("Host")
+        with lock:
+            inflight[host] += 1
+            peak[host] = max(peak[host], inflight[host])
+        try:
+            time.sleep(delay_for(h.path))
+            body = (f"<html><head><title>{h.path}</title></head><body><article><h1>{h.path}</h1>"
+                    f"<p>{PARAGRAPH}</p><p>{PARAGRAPH}</p></article></body></html>").encode()
+            h.send_response(200)
+            h.send_header("Content-Type", "text/html; charset=utf-8")
+            h.send_header("Content-Length", str(len(body)))
+            h.end_headers()
+            h.wfile.write(body)
+        finally:
+            with lock:
+                inflight[host] -= 1
+
+    return http_server(handle), peak
+
+@pytest.fixture(autouse=True)
+def _no_cache(monkeypatch):
+    monkeypatch.setattr(config, "FULLTEXT_CACHE_ENABLED", False)
+
+def test_parallel_fetch_respects_per_domain_limit(http_server):
+    base, peak = _slow_site(http_server, lambda path: 0.3)
+    port = base.rsplit(":", 1)[1]
+    urls = [f"http://127.0.0.1:{port}/a{i}" for i in range(6)] + [f"http://localhost:{port}/b{i}" for i in range(6)]
+    t0 = time.perf_counter()
+    out = content_extractor.fetch_fulltext_many(urls, budget=10, per_domain=2)
+    elapsed = time.perf_counter() - t0
+    assert set(out) == set(urls) and all("committee" in t for t in out.values())
+    assert max(peak.values()) == 2                       # never more than 2 per site
+    assert elapsed < 12 * 0.3 / 2                        # 2 sites x 2 slots, vs 3.6 s sequential
+
+def test_slow_pages_miss_the_budget_instead_of_blocking(http_server):
+    base, _ = _slow_site(http_server, lambda path: 3.0 if path.startswith("/slow") else 0.05)
+    urls = [f"{base}/fast{i}" for i in range(3)] + [f"{base}/slow{i}" for i in range(2)]
+    t0 = time.perf_counter()
+    out = content_extractor.fetch_fulltext_many(urls, budget=1.0, per_domain=8)
+    elapsed = time.perf_counter() - t0
+    assert sorted(out) == sorted(urls[:3])               # slow ones left out: callers use snippets
+    assert elapsed < 1.5
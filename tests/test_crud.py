@@ -0,0 +1,94 @@
+# tests/test_crud.py
+import threading
+
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import sessionmaker
+
+from database.db import Base
+from database import crud
+from database.models import FeedArticle, UserArticle
+
+def _sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False,
+                                                                             "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+def test_record_user_links_refreshes_existing_rows(tmp_path):
+    Session = _sessions(tmp_path)
+    db = Session()
+    crud.record_user_links(db, 1, ["a", "b", "a", ""])
+    crud.record_user_links(db, 1, ["b", "c"])
+    crud.record_user_links(db, 2, ["a"])
+    assert sorted(crud.get_user_link_keys(db, 1)) == ["a", "b", "c"]
+    assert crud.get_user_link_keys(db, 1, limit=2)[0] in ("b", "c")   # most recently seen first
+    assert crud.get_user_link_keys(db, 2) == ["a"]
+
+def test_record_user_links_concurrent_overlapping_writers(tmp_path):
+    Session = _sessions(tmp_path)
+    errors = []
+    def worker(offset):
+        db = Session()
+        try:
+            for i in range(20):
+                crud.record_user_links(db, 7, [f"k{(offset + i + j) % 30}" for j in range(5)])
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    db = Session()
+    assert db.execute(select(func.count()).select_from(UserArticle)).scalar() == 30
+
+def test_upsert_article_summary_replaces_same_version(tmp_path):
+    Session = _sessions(tmp_path)
+    db = Session()
+    crud.upsert_article_summary(db, "k", "h1", "first", model="m")
+    crud.upsert_article_summary(db, "k", "h1", "second", model="m")
+    crud.upsert_article_summary(db, "k", "h2", "other body", model="m")
+    got = crud.get_article_summaries(db, ["k"])
+    assert sorted(s for _, s in got["k"]) == ["other body", "second"]
+
+def _feed_articles(keys):
+    return [{"link_key": k, "title": f"title {k}", "link": f"https://ex.com/{k}", "snippet": "s",
+             "source": "Wire", "published_at": None} for k in keys]
+
+def test_upsert_feed_articles_counts_new_rows_and_refreshes(tmp_path):
+    Session = _sessions(tmp_path)
+    db = Session()
+    assert crud.upsert_feed_articles(db, "us", _feed_articles(["a", "b"])) == 2
+    changed = _feed_articles(["b", "c"])
+    changed[0]["title"] = "updated"
+    assert crud.upsert_feed_articles(db, "us", changed) == 1
+    assert crud.upsert_feed_articles(db, "de", _feed_articles(["a"])) == 1      # per region
+    titles = {a["link"]: a["title"] for a in crud.search_feed_articles(db, "us")}
+    assert titles["https://ex.com/b"] == "updated" and len(titles) == 3
+    arts, newest = crud.feed_articles_since(db, "us")
+    assert len(arts) == 3
+    assert crud.feed_articles_since(db, "us", newest) == ([], None)
+
+def test_upsert_feed_articles_concurrent_ingest_passes(tmp_path):
+    Session = _sessions(tmp_path)
+    errors = []
+    def worker(offset):
+        db = Session()
+        try:
+            for i in range(20):
+                crud.upsert_feed_articles(db, "us", _feed_articles([f"k{(offset + i + j) % 30}" for j in range(5)]))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    db = Session()
+    assert db.execute(select(func.count()).select_from(FeedArticle)).scalar() == 30
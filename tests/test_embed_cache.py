@@ -0,0 +1,24 @@
+# tests/test_embed_cache.py
+from app.embed_cache import EmbeddingCache
+
+def _vec(i: int, dim: int = 768):
+    return [float(i)] + [0.5] * (dim - 1)
+
+def test_memory_tier_is_bounded_in_bytes():
+    c = EmbeddingCache(None, mem_bytes=10 * 768 * 4, max_bytes=0)   # room for 10 float32 vectors
+    c.put_many("m", [f"t{i}" for i in range(25)], [_vec(i) for i in range(25)])
+    s = c.stats()
+    assert s["mem_items"] == 10
+    assert s["mem_bytes"] == 10 * 768 * 4
+    hits = c.get_many("m", ["t24", "t0"])
+    assert hits[0] == _vec(24)     # newest kept, returned as list[float]
+    assert hits[1] is None         # oldest evicted
+
+def test_disk_tier_round_trip_and_eviction(tmp_path):
+    c = EmbeddingCache(str(tmp_path / "e.sqlite"), mem_bytes=0, max_bytes=5 * 768 * 4)
+    for i in range(8):   # one put per row: eviction follows last use
+        c.put_many("m", [f"t{i}"], [_vec(i)])
+    assert c.stats()["bytes_used"] <= 5 * 768 * 4
+    assert c.get_many("m", ["t7"])[0] == _vec(7)
+    assert c.get_many("m", ["t0"])[0] is None
+    assert c.get_many("other-model", ["t7"])[0] is None   # model is part of the key
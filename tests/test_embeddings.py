@@ -0,0 +1,63 @@
+# tests/test_embeddings.py
+import json
+import time
+
+import config
+from app import embeddings
+
+def _stub_ollama(http_server, batch_endpoint: bool, latency: float = 0.02):
+    """Stub embedding server: `latency` seconds per request, vector = [len(text), 1.0]."""
+    calls = {"embed": 0, "embeddings": 0}
+
+    def handle(h):
+        body = json.loads(h.rfile.read(int(h.headers.get("Content-Length") or 0)) or b"{}")
+        time.sleep(latency)
+        if h.path == "/api/embed":
+            calls["embed"] += 1
+        if h.path == "/api/embed" and batch_endpoint:
+            out = {"embeddings": [[float(len(t)), 1.0] for t in body["input"]]}
+        elif h.path == "/api/embeddings":
+            calls["embeddings"] += 1
+            out = {"embedding": [float(len(body["prompt"])), 1.0]}
+        else:
+            h.send_response(404)
+            h.send_header("Content-Length", "0")
+            h.end_headers()
+            return
+        data = json.dumps(out).encode()
+        h.send_response(200)
+        h.send_header("Content-Type", "application/json")
+        h.send_header("Content-Length", str(len(data)))
+        h.end_headers()
+        h.wfile.write(data)
+
+    return http_server(handle), calls
+
+def _run(monkeypatch, base, texts):
+    monkeypatch.setattr(config, "OLLAMA_BASE_URL", base)
+    monkeypatch.setattr(embeddings, "_BATCH_SUPPORTED", None)
+    t0 = time.perf_counter()
+    vecs = embeddings.embed_ollama_many(texts)
+    return vecs, time.perf_counter() - t0
+
+def test_batched_embed_cuts_round_trips_and_wall_time(http_server, monkeypatch):
+    monkeypatch.setattr(config, "EMBED_BATCH_SIZE", 32)
+    monkeypatch.setattr(config, "EMBED_CONCURRENCY", 2)
+    texts = [f"article {i} " + "x" * i for i in range(100)]
+
+    old_base, old_calls = _stub_ollama(http_server, batch_endpoint=False)
+    per_text, per_text_s = _run(monkeypatch, old_base, texts)
+    new_base, new_calls = _stub_ollama(http_server, batch_endpoint=True)
+    batched, batched_s = _run(monkeypatch, new_base, texts)
+
+    assert per_text == batched == [[float(len(t)), 1.0] for t in texts]   # same vectors, same order
+    # probed once per in-flight batch at most, then per-text fallback
+    assert old_calls["embed"] <= config.EMBED_CONCURRENCY and old_calls["embeddings"] == 100
+    assert new_calls == {"embed": 4, "embeddings": 0}     # ceil(100 / 32) batches
+    assert batched_s * 5 < per_text_s                     # ~2 waves of 20 ms vs 100 x 20 ms
+
+def test_fallback_is_remembered(http_server, monkeypatch):
+    base, calls = _stub_ollama(http_server, batch_endpoint=False, latency=0)
+    _run(monkeypatch, base, ["a", "b"])
+    embeddings.embed_ollama_many(["c"])        # no second probe of /api/embed
+    assert calls == {"embed": 1, "embeddings": 3}
@@ -0,0 +1,62 @@
+# tests/test_ingest.py
+import time
+
+import config
+from app import ingest, news_fetcher
+from app.search_index import ARTICLE_INDEX
+
+def _feed(tmp_path, name, title, items):
+    body = "".join(
+        f"<item><title>{t}</title><link>{link}</link><description>{d}</description>"
+        f"<pubDate>Mon, 12 Oct 2026 10:00:00 GMT</pubDate></item>"
+        for t, link, d in items
+    )
+    p = tmp_path / name
+    p.write_text(f'<?xml version="1.0"?><rss version="2.0"><channel><title>{title}</title>{body}</channel></rss>')
+    return f"file://{p}"
+
+def test_ingest_stub_feeds_then_serve_from_store(tmp_path):
+    ARTICLE_INDEX.clear()
+    a = _feed(tmp_path, "a.xml", "Wire A", [
+        ("Élections en Grèce", "https://ex.com/greece?utm_source=rss", "Le vote"),
+        ("Climate summit opens", "https://ex.com/climate", "Leaders meet"),
+    ])
+    b = _feed(tmp_path, "b.xml", "Wire B", [
+        ("Élections en Grèce", "https://ex.com/greece", "Duplicate of A, tracking params differ"),
+        ("Market rally", "https://ex.com/markets", "Stocks up"),
+    ])
+    missing = "file:///nonexistent/feed.xml"
+    run = ingest.ingest_once({"us": [a, b, missing]})
+    assert run["added"] == {"us": 3}      # the Greece story is deduped across feeds
+    assert run["missed"] == [missing]
+
+    titles = lambda arts: sorted(x["title"] for x in arts)
+    assert titles(news_fetcher.fetch_from_rss("grèce", "us", mode="store")) == ["Élections en Grèce"]
+    assert titles(news_fetcher.fetch_from_rss("", "us", mode="store")) == [
+        "Climate summit opens", "Market rally", "Élections en Grèce"]
+
+    # after a restart (or with ingestion in another process) the index is rebuilt from the
+    # store, so queries get BM25 matching, not a substring match on the whole query
+    ARTICLE_INDEX.clear()
+    news_fetcher._STORE_SYNCED.clear()
+    assert titles(news_fetcher.fetch_from_rss("climate leaders", "us", mode="store")) == ["Climate summit opens"]
+
+def test_ingest_uses_its_own_deadline_and_pool(monkeypatch):
+    seen = {}
+    def fake_fetch_feeds(urls, **kwargs):
+        seen.update(kwargs)
+        return {}, list(urls)
+    monkeypatch.setattr(news_fetcher, "fetch_feeds", fake_fetch_feeds)
+    run = ingest.ingest_once({"us": ["https://slow.example.com/feed"]})
+    assert run["missed"] == ["https://slow.example.com/feed"]
+    assert seen["deadline"] == config.INGEST_DEADLINE > config.RSS_DEADLINE
+    assert seen["feed_timeout"] == config.INGEST_FEED_TIMEOUT
+    assert seen["pool"] is ingest._INGEST_POOL
+
+def test_store_mode_does_not_touch_the_network(monkeypatch):
+    def boom(*args, **kwargs):
+        raise AssertionError("store mode fetched feeds")
+    monkeypatch.setattr(news_fetcher, "fetch_feeds", boom)
+    t0 = time.perf_counter()
+    news_fetcher.fetch_from_rss("anything", "us", mode="store")
+    assert time.perf_counter() - t0 < 1.0
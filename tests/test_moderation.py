@@ -0,0 +1,50 @@
+# tests/test_moderation.py
+import config
+from app import content_safety, news_fetcher
+
+class _StubDetox:
+    def __init__(self):
+        self.texts = 0
+        self.calls = 0
+    def predict(self, x):
+        xs = [x] if isinstance(x, str) else x
+        self.calls += 1
+        self.texts += len(xs)
+        tox = [0.99 if "toxic" in t else 0.01 for t in xs]
+        return {"toxicity": tox[0]} if isinstance(x, str) else {"toxicity": tox}
+
+def test_moderate_top_only_scores_limit_plus_margin(monkeypatch):
+    stub = _StubDetox()
+    monkeypatch.setattr(content_safety, "_DETOX", stub)
+    monkeypatch.setattr(config, "SAFETY_ENABLED", True)
+    monkeypatch.setattr(config, "ARTICLE_MODERATION_MARGIN", 2)
+    ranked = [{"title": f"story {i}" + (" toxic" if i in (1, 3, 4) else ""), "snippet": ""} for i in range(200)]
+    out = news_fetcher._moderate_top(ranked, 5)
+    # 5 + 2 scored, 3 dropped -> 1 missing, topped up from the next-ranked 1 + 2
+    assert [a["title"] for a in out] == ["story 0", "story 2", "story 5", "story 6", "story 7"]
+    assert stub.texts == 10
+
+def test_moderate_top_without_limit_matches_unmoderated_ranking(monkeypatch):
+    monkeypatch.setattr(content_safety, "_DETOX", _StubDetox())
+    monkeypatch.setattr(config, "SAFETY_ENABLED", True)
+    ranked = [{"title": f"story {i}" + (" toxic" if i == 1 else ""), "snippet": ""} for i in range(30)]
+    for limit in (0, -1):
+        assert len(news_fetcher._moderate_top(ranked, limit)) == 29
+
+def test_moderate_many_batches_and_caches(monkeypatch):
+    stub = _StubDetox()
+    monkeypatch.setattr(content_safety, "_DETOX", stub)
+    monkeypatch.setattr(config, "SAFETY_ENABLED", True)
+    monkeypatch.setattr(config, "SAFETY_BATCH_SIZE", 4)
+    texts = [f"cache test {i}" for i in range(10)] + ["cache test 0"]
+    verdicts = content_safety.moderate_many(texts)
+    assert all(v[0] for v in verdicts)
+    assert (stub.calls, stub.texts) == (3, 10)       # duplicates scored once, 4 per batch
+    content_safety.moderate_many(texts)
+    assert stub.texts == 10                           # second pass: all from the score cache
+
+def test_regex_blocks_without_model(monkeypatch):
+    monkeypatch.setattr(config, "SAFETY_ENABLED", False)
+    safe, _, flags = content_safety.moderate_text("Graphic violence and GORE")
+    assert not safe and flags["violence"] and not flags["adult"]
+    assert content_safety.redact_profanity("Holy SHIT") == "Holy S★★★"
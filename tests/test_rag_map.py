@@ -0,0 +1,48 @@
+# tests/test_rag_map.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+import config
+from app import rag
+
+@pytest.fixture
+def map_pool(monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(rag, "_MAP_POOL", pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+def _groups(n):
+    return [{"title": f"t{i}", "link": f"l{i}", "texts": ["body"]} for i in range(n)]
+
+def test_queue_wait_does_not_count_against_the_timeout(map_pool, monkeypatch):
+    # another digest holds both workers for longer than RAG_MAP_TIMEOUT
+    monkeypatch.setattr(config, "RAG_MAP_TIMEOUT", 0.3)
+    release = threading.Event()
+    busy = [map_pool.submit(release.wait, 5) for _ in range(2)]
+    threading.Timer(0.6, release.set).start()
+    monkeypatch.setattr(rag, "_map_one", lambda v: {"title": v["title"], "link": v["link"], "bullets": "- b"})
+    out = rag._map_articles(_groups(4))
+    assert [m["link"] for m in out] == ["l0", "l1", "l2", "l3"]
+    assert all(f.result() for f in busy)
+
+def test_slow_and_failed_articles_are_dropped(map_pool, monkeypatch):
+    monkeypatch.setattr(config, "RAG_MAP_TIMEOUT", 0.3)
+
+    def map_one(v):
+        if v["link"] == "l1":
+            time.sleep(1.0)
+        if v["link"] == "l2":
+            return None
+        return {"title": v["title"], "link": v["link"], "bullets": "- b"}
+
+    monkeypatch.setattr(rag, "_map_one", map_one)
+    t0 = time.perf_counter()
+    out = rag._map_articles(_groups(4))
+    assert [m["link"] for m in out] == ["l0", "l3"]
+    assert time.perf_counter() - t0 < 0.8
@@ -0,0 +1,43 @@
+# tests/test_search_index.py
+from app.search_index import BM25Index, tokenize
+
+def test_tokenize_keeps_accented_words_whole():
+    assert tokenize("Grèce") == ["grèce"]
+    assert tokenize("Élection présidentielle") == ["élection", "présidentielle"]
+    assert tokenize("Straße") == ["strasse"]
+    # decomposed accents and the combining dot casefold leaves on "İ" stay in the word
+    assert tokenize("Gre\u0300ce") == tokenize("Gr\u00e8ce")
+    assert len(tokenize("İstanbul")) == 1
+
+def test_tokenize_drops_short_tokens():
+    assert tokenize("a to the EU-wide") == ["the", "wide"]
+
+def test_search_matches_non_ascii_queries():
+    idx = BM25Index()
+    idx.add("fr", "Élections en Grèce: le vote", region="fr")
+    idx.add("us", "Stock market update", region="us")
+    assert [d for d, _, _ in idx.search("Grèce")] == ["fr"]
+    assert [d for d, _, _ in idx.search("élections")] == ["fr"]
+    assert idx.search("Grèce", regions=["us"]) == []
+
+def test_search_ranks_by_bm25_and_evicts_old_docs():
+    idx = BM25Index()
+    idx.add("a", "climate climate summit", now=100)
+    idx.add("b", "climate talks", now=200)
+    idx.add("c", "football final", now=200)
+    assert [d for d, _, _ in idx.search("climate summit")] == ["a", "b"]
+    assert idx.evict_older_than(50, now=210) == 1
+    assert [d for d, _, _ in idx.search("climate")] == ["b"]
+
+def test_ranker_reuses_indexed_terms_only_for_the_same_text(monkeypatch):
+    from app import ranker
+    idx = BM25Index()
+    monkeypatch.setattr(ranker, "ARTICLE_INDEX", idx)
+    rss = {"title": "Budget vote delayed", "snippet": "Parliament", "link": "https://ex.com/a?utm_source=rss"}
+    idx.add("https://ex.com/a", ranker.article_text(rss), article=rss)
+    serp = {"title": "Climate summit opens", "snippet": "Leaders meet", "link": "https://ex.com/a"}
+    arts = [rss, serp]
+    texts = [ranker.article_text(a) for a in arts]
+    rss_score, serp_score = ranker._keyword_scores("climate summit", arts, texts)
+    assert rss_score == 0.0
+    assert serp_score == ranker._keyword_overlap("climate summit", texts[1]) > 0
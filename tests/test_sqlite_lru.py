@@ -0,0 +1,56 @@
+# tests/test_sqlite_lru.py
+import random
+import string
+import time
+
+from app.fulltext_cache import FulltextCache
+from app.llm_cache import LLMCache
+
+def test_llm_cache_memory_then_disk(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    c = LLMCache(path, mem_items=2, max_bytes=1 << 20)
+    c.put("a", "alpha", gen_seconds=1.5)
+    c.put("b", "", gen_seconds=0.5)           # empty generations are not cached
+    assert c.get("a") == "alpha"
+    assert c.get("b") is None
+    s = c.stats()
+    assert (s["mem_hits"], s["misses"], s["seconds_saved"], s["seconds_generating"]) == (1, 1, 1.5, 2.0)
+    # a new instance only has the disk tier
+    c2 = LLMCache(path, mem_items=2, max_bytes=1 << 20)
+    assert c2.get("a") == "alpha"
+    assert c2.stats()["disk_hits"] == 1
+
+def test_memory_tier_bounded_by_items():
+    c = LLMCache(None, mem_items=2, max_bytes=0)
+    for k in "abc":
+        c.put(k, k * 3, gen_seconds=0.1)
+    assert c.get("a") is None and c.get("c") == "ccc"
+    assert c.stats()["mem_items"] == 2
+
+def test_disk_evicts_least_recently_used(tmp_path):
+    rng = random.Random(0)
+    c = FulltextCache(str(tmp_path / "ft.sqlite"), mem_items=0, max_bytes=1200)
+    for i in range(6):   # ~130 bytes each after zlib, + ROW_OVERHEAD
+        c.put(f"u{i}", "".join(rng.choice(string.ascii_letters) for _ in range(200)))
+        time.sleep(0.002)
+    assert c.stats()["bytes_used"] <= 1200
+    assert c.stats()["evicted"] > 0
+    assert c.get("u5")["ok"]
+    assert c.get("u0") is None
+
+def test_negative_fulltext_entries(tmp_path):
+    c = FulltextCache(str(tmp_path / "ft.sqlite"), mem_items=4, max_bytes=1 << 20)
+    c.put("dead", "")
+    e = c.get("dead")
+    assert e["ok"] is False and e["text"] == ""
+
+def test_negative_entries_count_toward_the_cap(tmp_path):
+    path = str(tmp_path / "ft.sqlite")
+    c = FulltextCache(path, mem_items=0, max_bytes=100 * FulltextCache.ROW_OVERHEAD)
+    for i in range(1000):
+        c.put(f"dead{i}", "")
+    rows = c._db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+    assert rows <= 100
+    assert c.stats()["bytes_used"] == rows * FulltextCache.ROW_OVERHEAD
+    # a reopened cache counts the same bytes
+    assert FulltextCache(path, mem_items=0, max_bytes=1 << 20).stats()["bytes_used"] == c.stats()["bytes_used"]
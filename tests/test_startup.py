@@ -0,0 +1,84 @@
+# tests/test_startup.py
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import config
+from app import main, warmup
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ("chromadb", "trafilatura", "langdetect", "detoxify", "torch")
+
+IMPORT_BUDGET = 3.0          # seconds for `import app.main` (about 1 s on one core)
+FIRST_RESPONSE_BUDGET = 0.5  # seconds from startup to the first answered request
+
+def test_import_is_light_and_fast():
+    # fresh interpreter: the test session itself may already have imported them
+    code = (
+        "import sys, time; t0 = time.perf_counter(); import app.main; "
+        "print(time.perf_counter() - t0); "
+        f"print([m for m in {HEAVY!r} if m in sys.modules])"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    seconds, loaded = out.stdout.splitlines()[-2:]
+    assert loaded == "[]"
+    assert float(seconds) < IMPORT_BUDGET
+
+@pytest.fixture
+def stub_warmup(monkeypatch):
+    """Two stub components: `fast` loads at once, `slow` blocks until release.set()."""
+    release = threading.Event()
+
+    def slow():
+        release.wait(10)
+        return True
+
+    loaders = {"fast": lambda: True, "slow": slow}
+    monkeypatch.setattr(warmup, "_LOADERS", loaders)
+    monkeypatch.setattr(warmup, "_STATE", {n: {"state": warmup.PENDING, "seconds": None, "error": None}
+                                           for n in loaders})
+    monkeypatch.setattr(config, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(config, "WARMUP_COMPONENTS", ["fast", "slow"])
+    for flag in ("INGEST_ENABLED", "VECTOR_RETENTION_ENABLED", "PRECOMPUTE_ENABLED"):
+        monkeypatch.setattr(config, flag, False)
+    yield release
+    release.set()
+    warmup.stop_warmup()
+
+def _wait_for(pred, timeout=5.0):
+    deadline = time.time() + timeout
+    while not pred():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_ready_is_503_while_loading_then_200(stub_warmup):
+    from fastapi.testclient import TestClient
+
+    t0 = time.perf_counter()
+    with TestClient(main.app) as client:      # runs startup -> starts the warm-up thread
+        # the API answers at once, while a component is still loading
+        assert client.get("/health").status_code == 200
+        assert time.perf_counter() - t0 < FIRST_RESPONSE_BUDGET
+        _wait_for(lambda: warmup._STATE["slow"]["state"] == warmup.LOADING)
+        r = client.get("/ready")
+        assert r.status_code == 503
+        assert r.json()["components"]["fast"]["state"] == warmup.READY
+        assert r.json()["components"]["slow"]["state"] == warmup.LOADING
+
+        stub_warmup.set()
+        _wait_for(lambda: client.get("/ready").status_code == 200)
+        assert {c["state"] for c in client.get("/ready").json()["components"].values()} == {warmup.READY}
+
+def test_failed_component_does_not_block_readiness(stub_warmup, monkeypatch):
+    def broken():
+        raise ImportError("No module named 'nope'")
+
+    monkeypatch.setitem(warmup._LOADERS, "slow", broken)
+    warmup.start_warmup().join(5)
+    result = warmup.readiness()
+    assert result["ready"]
+    assert result["components"]["slow"]["state"] == warmup.UNAVAILABLE
@@ -0,0 +1,117 @@
+# tests/test_streaming.py
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("chromadb")
+httpx = pytest.importorskip("httpx")
+uvicorn = pytest.importorskip("uvicorn")
+
+import config
+from app import llm_cache, main, rag
+
+TOKENS = ['{"summary": "Markets ', 'rallied ', 'after the ', 'rate cut.", ', '"highlights": ["Stocks up"]}']
+
+def _stub_ollama_stream(http_server, delay: float):
+    """Stub Ollama /api/generate with stream: true, one JSON line per token every `delay` s."""
+    calls = []
+
+    def handle(h):
+        calls.append(json.loads(h.rfile.read(int(h.headers.get("Content-Length") or 0))))
+        h.send_response(200)
+        h.send_header("Content-Type", "application/x-ndjson")
+        h.send_header("Transfer-Encoding", "chunked")   # as Ollama does
+        h.end_headers()
+
+        def chunk(msg):
+            line = (json.dumps(msg) + "\n").encode()
+            h.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            h.wfile.flush()
+
+        for tok in TOKENS:
+            time.sleep(delay)
+            chunk({"response": tok, "done": False})
+        chunk({"response": "", "done": True})
+        h.wfile.write(b"0\r\n\r\n")
+
+    return http_server(handle), calls
+
+@pytest.fixture
+def stub_pipeline(http_server, monkeypatch):
+    """RAG stages before REDUCE stubbed out; REDUCE streams from a stub Ollama (0.3 s/token)."""
+    base, calls = _stub_ollama_stream(http_server, delay=0.3)
+    monkeypatch.setattr(config, "OLLAMA_BASE_URL", base)
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(rag, "_index_for_user", lambda articles, user_id: None)
+    monkeypatch.setattr(rag, "_retrieve_groups", lambda user_id, query: [{"title": "t", "link": "l", "chunks": ["c"]}])
+    monkeypatch.setattr(rag, "_map_articles", lambda groups: [{"title": "t", "link": "l", "bullets": "- b"}])
+    monkeypatch.setattr(rag, "_reduce_prompt", lambda mapped, prefs, query: f"reduce {query}")
+    monkeypatch.setattr(rag, "_parse_reduce", lambda raw, mapped: json.loads(raw))
+    return calls
+
+def test_ollama_stream_yields_tokens_as_they_arrive(http_server, monkeypatch):
+    base, calls = _stub_ollama_stream(http_server, delay=0.2)
+    monkeypatch.setattr(config, "OLLAMA_BASE_URL", base)
+    monkeypatch.setattr(llm_cache, "_CACHE", llm_cache.LLMCache(None, mem_items=8, max_bytes=0))
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    t0 = time.perf_counter()
+    stream = rag._ollama_generate_stream("prompt")
+    first = next(stream)
+    first_at = time.perf_counter() - t0
+    rest = list(stream)
+    total = time.perf_counter() - t0
+    assert [first] + rest == TOKENS
+    assert calls[0]["stream"] is True
+    assert first_at < 0.5 < total                 # first token long before the last one
+    # the finished generation is cached: the replay is one fragment, no request
+    assert list(rag._ollama_generate_stream("prompt")) == ["".join(TOKENS)]
+    assert len(calls) == 1
+
+def test_stream_news_response_event_order(stub_pipeline):
+    events = list(rag.stream_news_response([{"title": "t", "link": "l"}], "", "markets", user_id=3))
+    kinds = [e["event"] for e in events]
+    assert kinds == ["progress"] * 4 + ["token"] * len(TOKENS) + ["summary"]
+    assert [e["data"]["stage"] for e in events[:4]] == ["fulltext", "retrieve", "map", "reduce"]
+    assert events[-1]["data"]["summary"] == "Markets rallied after the rate cut."
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def test_sse_first_articles_do_not_wait_for_the_llm(stub_pipeline, monkeypatch):
+    articles = [{"title": "Rate cut", "link": "https://ex.com/a", "snippet": "s", "source": "Wire",
+                 "published_at": ""}]
+
+    async def fake_fetch(query, lang, region, timeframe, sort):
+        return [dict(a) for a in articles]
+
+    monkeypatch.setattr(main, "_fetch_articles", fake_fetch)
+    monkeypatch.setattr(main, "rag_stream", rag.stream_news_response)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            time.sleep(0.01)
+        seen = []
+        t0 = time.perf_counter()
+        with httpx.stream("GET", f"http://127.0.0.1:{port}/get_news/stream",
+                          params={"query": "markets"}, timeout=30) as r:
+            for line in r.iter_lines():
+                if line.startswith("event: "):
+                    seen.append((line[7:], time.perf_counter() - t0))
+        kinds = [k for k, _ in seen]
+        t = dict(seen)
+        assert kinds[:2] == ["progress", "articles"]
+        assert kinds.count("token") == len(TOKENS)
+        assert kinds[-2:] == ["summary", "done"]
+        # time-to-first-article is independent of LLM latency (5 tokens x 0.3 s)
+        assert t["articles"] < 0.5 < 1.2 < t["summary"]
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
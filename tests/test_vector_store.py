@@ -0,0 +1,83 @@
+# tests/test_vector_store.py
+import pytest
+
+pytest.importorskip("chromadb")
+
+import config
+from app import vector_store
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "VECTOR_DB_DIR", str(tmp_path / "chroma"))
+    monkeypatch.setattr(vector_store, "_client", None)
+    vector_store._COLLECTIONS.clear()
+    vector_store._RECOVERED.clear()
+    yield vector_store
+    vector_store._COLLECTIONS.clear()
+    vector_store._RECOVERED.clear()
+
+def _add(col, n):
+    col.add(ids=[f"c{i}" for i in range(n)], embeddings=[[float(i), 1.0, 0.0] for i in range(n)],
+            documents=[f"doc {i}" for i in range(n)])
+
+def test_interrupted_compaction_after_delete_is_renamed_back(store):
+    # crash between delete_collection(name) and modify(name=name): only the copy exists
+    name = store._collection_name()
+    _add(store._get_client().create_collection(f"{name}_compact"), 5)
+    col = store.get_or_create_collection()
+    assert col.name == name and col.count() == 5
+    assert [c.name for c in store._get_client().list_collections()] == [name]
+
+def test_interrupted_compaction_before_delete_drops_partial_copy(store):
+    name = store._collection_name()
+    client = store._get_client()
+    _add(client.create_collection(name), 5)
+    _add(client.create_collection(f"{name}_compact"), 2)
+    assert store.get_or_create_collection().count() == 5
+    assert [c.name for c in client.list_collections()] == [name]
+
+def test_compact_keeps_every_chunk(store):
+    _add(store.get_or_create_collection(), 7)
+    assert store.compact_collection(page=3)["chunks"] == 7
+    assert store.get_or_create_collection().count() == 7
+
+def test_reopen_during_compaction_leaves_the_copy_alone(store, monkeypatch):
+    # a reader whose handle went stale re-fetches the collection while a compaction is
+    # still filling `<name>_compact`: that copy must survive until the swap
+    _add(store.get_or_create_collection(), 7)
+    client = store._get_client()
+    name = store._collection_name()
+    create = client.create_collection
+
+    def create_then_reopen(*args, **kwargs):
+        dst = create(*args, **kwargs)
+        store._COLLECTIONS.clear()
+        store.get_or_create_collection()
+        assert f"{name}_compact" in [c.name for c in client.list_collections()]
+        return dst
+
+    monkeypatch.setattr(client, "create_collection", create_then_reopen)
+    assert store.compact_collection(page=3)["chunks"] == 7
+    assert store.get_or_create_collection().count() == 7
+
+def test_query_retries_only_a_missing_collection(store, monkeypatch):
+    monkeypatch.setattr(store, "_user_link_keys", lambda user_id: ["k"])
+    monkeypatch.setattr(store, "embed_text", lambda text: [1.0, 0.0, 0.0])
+    calls = []
+
+    class Stale:
+        def query(self, **kw):
+            calls.append(kw)
+            raise ValueError("Collection [x] does not exist.")
+
+    store._COLLECTIONS[store._collection_name()] = Stale()
+    assert store.query(1, "q") == []          # re-fetched the real (empty) collection
+    assert len(calls) == 1
+
+    class Broken:
+        def query(self, **kw):
+            raise RuntimeError("disk I/O error")
+
+    store._COLLECTIONS[store._collection_name()] = Broken()
+    with pytest.raises(RuntimeError):
+        store.query(1, "q")